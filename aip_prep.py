@@ -10,22 +10,32 @@ prior to running this script.
 
 The initial copy of the export may be deleted after confirming this script ran correctly
 and creating the access copies.
+To move the files into the AIP folders instead of copying them, set the environment variable
+CONSTITUENT_MAIL_AIP_MODE to move (the export and aips_dir must be on the same volume, or files are copied).
 
 Required argument: input_directory (path to the folder with the export)
+Optional argument: max_gb (maximum size of each AIP in GB, 1,000,000,000 bytes, in addition to 10,000 files)
 
 Script outputs:
 - Folder "aips_dir" in the parent folder of the input_directory
-    - Copy of export split into folders with maximum of 10,000 files per folder
+    - Copy of export split into folders with maximum of 10,000 files (and max_gb, if provided) per folder
     - File "metadata.csv" with the AIP folder, title, and version filled in
+- File "aip_sizes.csv" with the number of files and bytes in each AIP, in the parent folder of the input_directory
 - File "empty_subfolders_log.txt", if any, in the parent folder of the input_directory
+- File "aip_move_manifest.csv", if files are moved, in the parent folder of the input_directory
+- Folder "aip_fixity" in the parent folder of the input_directory
+    - Folder for each AIP with bag-style manifests (manifest-md5.txt and manifest-sha256.txt) of its files
 """
 
+from concurrent.futures import ThreadPoolExecutor
 import csv
 from datetime import datetime
+import hashlib
 import os
 from pathlib import Path
 import shutil
 import sys
+import css_archiving_format as css_arch
 
 
 def empty_log(output_dir, empty_path):
@@ -45,19 +55,84 @@ def empty_log(output_dir, empty_path):
             log.write(f'{empty_path}\n')
 
 
-def metadata_aip(input_dir, aips_dir):
-    """Make the AIP for the metadata, which are the files directly within the input_dir"""
+def fixity_copy(file_path, new_path):
+    """Copy a file and its metadata, the same as shutil.copy2(), and return a tuple with its MD5 and SHA-256,
+    which are calculated while copying so the file is only read once"""
+    md5 = hashlib.md5()
+    sha256 = hashlib.sha256()
+    buffer = bytearray(1024 * 1024)
+    view = memoryview(buffer)
+    with open(file_path, 'rb') as f, open(new_path, 'wb') as new_f:
+        while size := f.readinto(buffer):
+            md5.update(view[:size])
+            sha256.update(view[:size])
+            new_f.write(view[:size])
+    shutil.copystat(file_path, new_path)
+    return md5.hexdigest(), sha256.hexdigest()
+
+
+def fixity_manifests(fixity_dir, aip_folder_path, new_paths, fixity_list):
+    """Make bag-style manifests (manifest-md5.txt and manifest-sha256.txt) for one AIP,
+    in a folder in fixity_dir with the same name as the AIP folder, so the files do not need to be read again
+    to make the AIPs. fixity_list has a tuple with the MD5 and SHA-256 for each file in new_paths.
+    Each line is the checksum and the path relative to the AIP folder, separated by two spaces like bagit."""
+    manifest_dir = os.path.join(fixity_dir, os.path.basename(aip_folder_path))
+    os.makedirs(manifest_dir, exist_ok=True)
+
+    # Paths use / and have %, line feed, and carriage return encoded, as required for bag manifests.
+    relative_paths = []
+    for new_path in new_paths:
+        relative_path = Path(os.path.relpath(new_path, aip_folder_path)).as_posix()
+        relative_paths.append(relative_path.replace('%', '%25').replace('\n', '%0A').replace('\r', '%0D'))
+
+    for i, algorithm in enumerate(['md5', 'sha256']):
+        manifest_path = os.path.join(manifest_dir, f'manifest-{algorithm}.txt')
+        with open(manifest_path, 'w', encoding='utf-8', newline='\n') as manifest:
+            for relative_path, fixity in zip(relative_paths, fixity_list):
+                manifest.write(f'{fixity[i]}  {relative_path}\n')
+
+
+def fixity_read(file_path):
+    """Return a tuple with the MD5 and SHA-256 of a file, reading the file once in pieces
+    so large files are not read into memory"""
+    md5 = hashlib.md5()
+    sha256 = hashlib.sha256()
+    buffer = bytearray(1024 * 1024)
+    view = memoryview(buffer)
+    with open(file_path, 'rb') as f:
+        while size := f.readinto(buffer):
+            md5.update(view[:size])
+            sha256.update(view[:size])
+    return md5.hexdigest(), sha256.hexdigest()
+
+
+def metadata_aip(input_dir, aips_dir, manifest_path=None, fixity_dir=None):
+    """Make the AIP for the metadata, which are the files directly within the input_dir
+    If manifest_path is provided, the files are added to the move manifest and then moved instead of copied.
+    If fixity_dir is provided, the bag-style manifests for the AIP are saved there with fixity_manifests()."""
 
     # Makes a folder for the AIP.
     # There are always few enough files for the metadata to be a single AIP.
     aip_path = os.path.join(aips_dir, 'metadata')
     os.mkdir(aip_path)
 
-    # Copies all files directly within input_dir to the AIP folder.
+    # Copies or moves all files directly within input_dir to the AIP folder.
     # The only other thing in that location is a folder named "documents", which is split by type_aip().
-    for metadata_file in os.listdir(input_dir):
-        if not metadata_file == 'documents':
-            shutil.copy2(os.path.join(input_dir, metadata_file), os.path.join(aip_path, metadata_file))
+    transfer_list = [(os.path.join(input_dir, metadata_file), os.path.join(aip_path, metadata_file))
+                     for metadata_file in os.listdir(input_dir) if not metadata_file == 'documents']
+    # The checksums are calculated while making the move manifest or while copying, if needed.
+    if manifest_path:
+        fixity_list = move_manifest(manifest_path, transfer_list)
+        for file_path, new_path in transfer_list:
+            os.replace(file_path, new_path)
+    elif fixity_dir:
+        fixity_list = [fixity_copy(file_path, new_path) for file_path, new_path in transfer_list]
+    else:
+        for file_path, new_path in transfer_list:
+            shutil.copy2(file_path, new_path)
+
+    if fixity_dir:
+        fixity_manifests(fixity_dir, aip_path, [paths[1] for paths in transfer_list], fixity_list)
 
 
 def metadata_csv(csv_path, row):
@@ -72,68 +147,281 @@ def metadata_csv(csv_path, row):
             md_writer.writerow(row)
 
 
+def move_manifest(csv_path, transfer_list):
+    """Make the aip_move_manifest.csv (if transfer_list is header) or add a row to it for each file that will be moved
+    and return a list with the MD5 and SHA-256 of each file, from fixity_read()
+    transfer_list has a tuple with the current path and the path in the AIP folder for each file.
+    The size and checksums are saved before the files are moved, so the AIPs can be verified and the moves reversed.
+    The number of files read at the same time is set with the environment variable
+    CONSTITUENT_MAIL_COPY_WORKERS (default 8)."""
+    if transfer_list == 'header':
+        with open(csv_path, 'w', newline='') as manifest_csv:
+            manifest_writer = csv.writer(manifest_csv)
+            manifest_writer.writerow(['Source', 'Destination', 'Size_Bytes', 'MD5', 'SHA256'])
+        return
+
+    # Calculates the checksums of the files with multiple threads, since most of the time is waiting for storage.
+    workers = int(os.environ.get('CONSTITUENT_MAIL_COPY_WORKERS', 8))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        fixity_list = list(executor.map(fixity_read, [paths[0] for paths in transfer_list]))
+
+    with open(csv_path, 'a', newline='') as manifest_csv:
+        manifest_writer = csv.writer(manifest_csv)
+        for (file_path, new_path), (md5, sha256) in zip(transfer_list, fixity_list):
+            manifest_writer.writerow([file_path, new_path, os.path.getsize(file_path), md5.upper(), sha256.upper()])
+    return fixity_list
+
+
+def sizes_csv(csv_path, row):
+    """Make the aip_sizes.csv (if row is header) and add a row to the aip_sizes.csv (header or one AIP's size)
+    This is separate from metadata.csv, which must only have the columns used by general_aip.py"""
+    if row == 'header':
+        with open(csv_path, 'w', newline='') as size_csv:
+            size_writer = csv.writer(size_csv)
+            size_writer.writerow(['Folder', 'Files', 'Size_Bytes'])
+    else:
+        with open(csv_path, 'a', newline='') as size_csv:
+            size_writer = csv.writer(size_csv)
+            size_writer.writerow(row)
+
+
 def type_aip(aips_dir, metadata_path, paths_list, type_path):
     """Copies every 10,000 files of a single type, including replicating subfolders, to an AIP folder
     Type is how the export is organized, for example Forms, Indivletters, and Objects.
     """
+    type_aips(aips_dir, metadata_path, [(paths_list, type_path, None)])
+
+
+def type_aip_chunk(aips_dir, included_files, type_path, seq_number, move=False, fixity_dir=None):
+    """Copies the files for one AIP, including replicating subfolders, to an AIP folder
+    and returns the row for the metadata csv.
+    If move is True, the files are moved instead of copied, which must be on the same volume as the aips_dir.
+    If fixity_dir is provided and the files are copied, the checksums are calculated while copying
+    and the bag-style manifests for the AIP are saved there with fixity_manifests().
+    The number of files copied at the same time is set with the environment variable
+    CONSTITUENT_MAIL_COPY_WORKERS (default 8)."""
+
+    # Makes a folder for this AIP, which is named type_#, for example forms_3.
+    aip_folder_name, new_paths = type_aip_paths(aips_dir, included_files, type_path, seq_number)
+    os.mkdir(os.path.join(aips_dir, aip_folder_name))
+
+    # Makes the subfolders for this AIP, once each, from the relative path to the files.
+    for subfolder_path in sorted(set(os.path.dirname(new_path) for new_path in new_paths)):
+        os.makedirs(subfolder_path, exist_ok=True)
+
+    # Copies or moves the files for this AIP to the AIP folder with multiple threads,
+    # since most of the time is waiting for storage.
+    # The results are read so an error copying any file stops the script, the same as copying one at a time.
+    workers = int(os.environ.get('CONSTITUENT_MAIL_COPY_WORKERS', 8))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        if move:
+            list(executor.map(os.replace, included_files, new_paths))
+        elif fixity_dir:
+            fixity_list = list(executor.map(fixity_copy, included_files, new_paths))
+            fixity_manifests(fixity_dir, os.path.join(aips_dir, aip_folder_name), new_paths, fixity_list)
+        else:
+            list(executor.map(shutil.copy2, included_files, new_paths))
+
+    # Returns the row for this AIP in the metadata csv.
+    aip_title = f'Constituent Mail {os.path.basename(type_path)} {seq_number}'
+    return ['', '', aip_folder_name, '', aip_title, '1']
 
-    for i in range(0, len(paths_list), 10000):
-
-        # Makes a folder for this AIP, which is named type_#, for example forms_3.
-        seq_number = i // 10000 + 1
-        aip_folder_name = f'{os.path.basename(type_path).lower()}_{seq_number}'
-        aip_folder_path = os.path.join(aips_dir, aip_folder_name)
-        os.mkdir(aip_folder_path)
-
-        # Copies the files for this AIP to the AIP folder.
-        # The relative path to the file is used to replicate the subfolders.
-        included_files = paths_list[i:i + 10000]
-        for file_path in included_files:
-            relative_path = Path(file_path).relative_to(type_path)
-            subfolder_path = os.path.join(aip_folder_path, os.path.dirname(relative_path))
-            if not os.path.exists(subfolder_path):
-                os.makedirs(subfolder_path)
-            shutil.copy2(file_path, os.path.join(aip_folder_path, relative_path))
-
-        # Adds this AIP to the metadata csv.
-        aip_title = f'Constituent Mail {os.path.basename(type_path)} {seq_number}'
-        metadata_csv(metadata_path, ['', '', aip_folder_name, '', aip_title, '1'])
-
-
-def type_files(output_dir, type_path):
-    """Returns a list with the path to every file in the type folder, including if it is within subfolders"""
-    paths_list = []
-    for root, dirs, files in os.walk(type_path):
-        for file in files:
-            paths_list.append(os.path.join(root, file))
-        # Makes a log of any empty subfolders, since those will not be included in the final AIPs.
-        if not dirs and not files:
-            empty_log(output_dir, root)
+
+def type_aip_paths(aips_dir, included_files, type_path, seq_number):
+    """Returns the name of the AIP folder, which is named type_#, for example forms_3,
+    and a list with the path in the AIP folder of each file, using the relative path to replicate the subfolders"""
+    aip_folder_name = f'{os.path.basename(type_path).lower()}_{seq_number}'
+    aip_folder_path = os.path.join(aips_dir, aip_folder_name)
+    new_paths = [os.path.join(aip_folder_path, Path(file_path).relative_to(type_path)) for file_path in included_files]
+    return aip_folder_name, new_paths
+
+
+def type_aip_split(paths_list, sizes_list, max_bytes=None):
+    """Returns a list with the file paths and total size in bytes of each AIP for a single type,
+    starting a new AIP when the next file would make it more than 10,000 files or, if provided, max_bytes
+    With max_bytes, a subfolder that would fit in a new AIP but not in the rest of the current AIP starts a new AIP,
+    so subfolders are split between AIPs as little as possible. A file larger than max_bytes is an AIP by itself."""
+
+    aips = []
+    aip_paths = []
+    aip_bytes = 0
+
+    # Files in the same subfolder are next to each other in paths_list, so they are handled as a group.
+    start = 0
+    while start < len(paths_list):
+        end = start + 1
+        subfolder = os.path.dirname(paths_list[start])
+        while end < len(paths_list) and os.path.dirname(paths_list[end]) == subfolder:
+            end += 1
+
+        # Starts a new AIP at the subfolder, if the subfolder fits in a new AIP but not the current one.
+        if max_bytes is not None and aip_paths:
+            subfolder_count = end - start
+            subfolder_bytes = sum(sizes_list[start:end])
+            fits_new = subfolder_count <= 10000 and subfolder_bytes <= max_bytes
+            fits_current = len(aip_paths) + subfolder_count <= 10000 and aip_bytes + subfolder_bytes <= max_bytes
+            if fits_new and not fits_current:
+                aips.append((aip_paths, aip_bytes))
+                aip_paths, aip_bytes = [], 0
+
+        # Adds each file, starting a new AIP if it is full.
+        for file_path, file_size in zip(paths_list[start:end], sizes_list[start:end]):
+            if aip_paths and (len(aip_paths) == 10000 or (max_bytes is not None and aip_bytes + file_size > max_bytes)):
+                aips.append((aip_paths, aip_bytes))
+                aip_paths, aip_bytes = [], 0
+            aip_paths.append(file_path)
+            aip_bytes += file_size
+        start = end
+
+    if aip_paths:
+        aips.append((aip_paths, aip_bytes))
+    return aips
+
+
+def type_aips(aips_dir, metadata_path, types_list, max_bytes=None, sizes_path=None, manifest_path=None,
+              fixity_dir=None):
+    """Copies the files of each type to AIP folders with type_aip_chunk() and adds the AIPs to metadata.csv
+    types_list has a tuple for each type with the list of file paths from type_files(), the type path,
+    and the list of file sizes from type_files() or None to read the sizes.
+    Each AIP has a maximum of 10,000 files and, if provided, max_bytes. If sizes_path is provided,
+    the number of files and size of each AIP are added to the aip_sizes.csv at that path.
+    If manifest_path is provided, every file is added to the move manifest and then moved instead of copied.
+    If fixity_dir is provided, the bag-style manifests for each AIP are saved there with fixity_manifests().
+    The number of AIPs made at the same time is set with the environment variable CONSTITUENT_MAIL_AIP_WORKERS
+    (default 4). The AIPs are added to the CSVs in order by type and then AIP number, once all are made."""
+
+    # Makes the list of AIPs, with the files, type path, number of the AIP for that type, and size.
+    chunks = []
+    for paths_list, type_path, sizes_list in types_list:
+        if sizes_list is None:
+            sizes_list = [os.path.getsize(file_path) for file_path in paths_list]
+        for i, (aip_paths, aip_bytes) in enumerate(type_aip_split(paths_list, sizes_list, max_bytes)):
+            chunks.append((aip_paths, type_path, i + 1, aip_bytes))
+
+    # Adds every file to the move manifest before any are moved, if moving,
+    # and uses the checksums from the move manifest for the bag-style manifests.
+    if manifest_path:
+        transfer_list = []
+        for aip_paths, type_path, seq_number, aip_bytes in chunks:
+            new_paths = type_aip_paths(aips_dir, aip_paths, type_path, seq_number)[1]
+            transfer_list.extend(zip(aip_paths, new_paths))
+        fixity_list = move_manifest(manifest_path, transfer_list)
+        if fixity_dir:
+            start = 0
+            for aip_paths, type_path, seq_number, aip_bytes in chunks:
+                aip_folder_name, new_paths = type_aip_paths(aips_dir, aip_paths, type_path, seq_number)
+                fixity_manifests(fixity_dir, os.path.join(aips_dir, aip_folder_name), new_paths,
+                                 fixity_list[start:start + len(aip_paths)])
+                start += len(aip_paths)
+
+    # Makes the AIPs with multiple threads.
+    workers = int(os.environ.get('CONSTITUENT_MAIL_AIP_WORKERS', 4))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        rows = list(executor.map(lambda chunk: type_aip_chunk(aips_dir, *chunk[:3], move=bool(manifest_path),
+                                                              fixity_dir=fixity_dir), chunks))
+
+    # Adds the AIPs to the metadata csv and the sizes csv.
+    for row, chunk in zip(rows, chunks):
+        metadata_csv(metadata_path, row)
+        if sizes_path:
+            sizes_csv(sizes_path, [row[2], len(chunk[0]), chunk[3]])
+
+
+def type_files(output_dir, type_path, inventory=None, empty_list=None, with_sizes=False):
+    """Returns a list with the path to every file in the type folder, including if it is within subfolders
+    Uses the inventory and empty folder list of the documents folder from css_arch.documents_inventory(),
+    if provided, instead of scanning the type folder.
+    If with_sizes is True, also returns a list with the size in bytes of every file, from the inventory
+    or, if the inventory does not have the size (the file could not be read when it was made), from the file."""
+    if inventory is None:
+        inventory, empty_list = css_arch.documents_inventory(type_path)
+
+    # Gets the files in the type folder from the inventory, which may include the other type folders.
+    type_prefix = os.path.join(type_path, '')
+    type_info = [file_info for file_info in inventory.values() if file_info[0].startswith(type_prefix)]
+    paths_list = [file_info[0] for file_info in type_info]
+
+    # Makes a log of any empty subfolders, since those will not be included in the final AIPs.
+    for empty_path in empty_list or []:
+        if empty_path == type_path or empty_path.startswith(type_prefix):
+            empty_log(output_dir, empty_path)
+
+    if with_sizes:
+        sizes_list = [file_info[2] if file_info[2] is not None else os.path.getsize(file_info[0])
+                      for file_info in type_info]
+        return paths_list, sizes_list
     return paths_list
 
 
 if __name__ == '__main__':
 
-    # Gets the path to the export from the script argument.
+    # Gets the path to the export and the maximum size of each AIP in GB, if any, from the script arguments.
+    # If the maximum size is not a number greater than 0, prints the error and exits the script.
     input_directory = sys.argv[1]
+    max_aip_bytes = None
+    if len(sys.argv) > 2:
+        try:
+            max_gb = float(sys.argv[2])
+        except ValueError:
+            max_gb = None
+        if max_gb is None or not 0 < max_gb < float('inf'):
+            print(f"max_gb '{sys.argv[2]}' is not a number greater than 0")
+            print("Script usage: python aip_prep.py input_directory [max_gb]")
+            sys.exit(1)
+        max_aip_bytes = int(max_gb * 1000000000)
 
-    # Makes a folder aips_dir in the parent folder of the input_directory for most script output.
-    # The empty_subfolders_log.txt is saved to the output_directory instead, if made.
+    # The aips_dir, which is made in the parent folder of the input_directory, is for most script output.
+    # The empty_subfolders_log.txt and other logs are saved to the output_directory instead, if made.
     output_directory = os.path.dirname(input_directory)
     aips_directory = os.path.join(output_directory, 'aips_dir')
+
+    # Moves files into the AIP folders instead of copying them, if set with the environment variable
+    # CONSTITUENT_MAIL_AIP_MODE and the export is on the same volume as the output_directory (where aips_dir is).
+    # The aip_move_manifest.csv is started, which has every file that is moved.
+    aip_mode = os.environ.get('CONSTITUENT_MAIL_AIP_MODE', 'copy')
+    if aip_mode not in ('copy', 'move'):
+        raise ValueError(f"CONSTITUENT_MAIL_AIP_MODE '{aip_mode}' is not copy or move")
+    manifest_csv_path = None
+    if aip_mode == 'move':
+        if os.stat(input_directory).st_dev == os.stat(output_directory).st_dev:
+            manifest_csv_path = os.path.join(output_directory, 'aip_move_manifest.csv')
+            move_manifest(manifest_csv_path, 'header')
+        else:
+            print("The export is not on the same volume as aips_dir, so files will be copied instead of moved.")
+
+    # Makes the aips_dir.
     os.mkdir(aips_directory)
     
     # Starts the metadata.csv.
     metadata_csv_path = os.path.join(aips_directory, 'metadata.csv')
     metadata_csv(metadata_csv_path, 'header')
     
-    # Copies metadata files to an AIP folder and adds it to the metadata.csv.
-    metadata_aip(input_directory, aips_directory)
+    # Starts the aip_sizes.csv, which is saved to the output_directory so it is not included with the AIPs.
+    sizes_csv_path = os.path.join(output_directory, 'aip_sizes.csv')
+    sizes_csv(sizes_csv_path, 'header')
+
+    # Makes the folder for the bag-style manifests of each AIP, which is in the output_directory
+    # so the manifests are not included in the AIPs.
+    fixity_directory = os.path.join(output_directory, 'aip_fixity')
+    os.mkdir(fixity_directory)
+
+    # Copies metadata files to an AIP folder and adds it to the metadata.csv and aip_sizes.csv.
+    metadata_aip(input_directory, aips_directory, manifest_csv_path, fixity_directory)
     metadata_csv(metadata_csv_path, ['', '', 'metadata', '', 'Constituent Mail Metadata', '1'])
+    metadata_files = [os.path.join(aips_directory, 'metadata', name)
+                      for name in os.listdir(os.path.join(aips_directory, 'metadata'))]
+    sizes_csv(sizes_csv_path, ['metadata', len(metadata_files), sum(os.path.getsize(path) for path in metadata_files)])
 
-    # For each type folder, copies files into AIP folders (maximum 10,000 files) while maintaining folder hierarchy,
-    # and adds every AIP to metadata.csv.
+    # For each type folder, copies files into AIP folders (maximum 10,000 files and max_gb, if provided)
+    # while maintaining folder hierarchy, and adds every AIP to metadata.csv and aip_sizes.csv.
+    # The documents folder is scanned once for the files and empty folders of every type.
+    # The AIPs for every type are made at the same time.
+    documents_inventory, documents_empty_list = css_arch.documents_inventory(os.path.join(input_directory, 'documents'))
+    types = []
     for type_folder in os.listdir(os.path.join(input_directory, 'documents')):
         type_folder_path = os.path.join(input_directory, 'documents', type_folder)
-        file_paths_list = type_files(output_directory, type_folder_path)
-        type_aip(aips_directory, metadata_csv_path, file_paths_list, type_folder_path)
+        file_paths_list, file_sizes_list = type_files(output_directory, type_folder_path, documents_inventory,
+                                                      documents_empty_list, with_sizes=True)
+        types.append((file_paths_list, type_folder_path, file_sizes_list))
+    type_aips(aips_directory, metadata_csv_path, types, max_aip_bytes, sizes_csv_path, manifest_csv_path,
+              fixity_directory)
@@ -3,11 +3,12 @@ Draft script to prepare preservation and access copies from an export in the Arc
 Required arguments: input_directory (path to the folder with the css export) and script_mode (access or preservation).
 """
 from datetime import date
+from itertools import islice
 import numpy as np
 import os
 import pandas as pd
 import sys
-from css_archiving_format import file_deletion_log
+from css_archiving_format import delete_letters, remove_rows, split_year_save
 
 
 def check_arguments(arg_list):
@@ -140,28 +141,38 @@ def find_casework_rows(df, output_dir):
 def read_metadata(path):
     """Read the metadata file into a dataframe"""
 
-    # Makes a list from the file contents with one list per row and one item per column,
+    # Makes a list of arrays for each column from the file contents,
     # splitting the data into columns based on the character position and removing extra spaces.
-    rows_list = []
+    # Lines are read 50,000 at a time into an array of characters with one row per line (padded to the same length),
+    # so each column is split from every line at once instead of one line at a time.
     positions = [(0, 39), (39, 69), (69, 99), (99, 129), (129, 159), (159, 189), (189, 191), (191, 201), (201, 251),
                  (251, 301), (301, 351), (351, 357), (357, 361), (361, 371), (371, 471)]
-    with open(path) as open_file:
-        for line in open_file:
-            row_list = [line[slice(*pos)].strip() for pos in positions]
-            rows_list.append(row_list)
-
-    # Save as a dataframe, with column names.
     # TODO: verify these column names.
     # TODO: add error handling for if the data is not the expected number of columns?
     columns_list = ['name', 'title', 'organization', 'address_line_1', 'address_line_2', 'city', 'state_code',
                     'zip_code', 'correspondence_type', 'correspondence_topic', 'correspondence_subtopic',
                     'letter_date', 'staffer_initials', 'document_number', 'comments']
-    df = pd.DataFrame(rows_list, columns=columns_list, dtype=str)
+    # Also makes a list of arrays with whether each line is blank, which is an empty string in every column.
+    columns = {column: [np.array([], dtype=object)] for column in columns_list}
+    blank = [np.array([], dtype=bool)]
+    with open(path) as open_file:
+        while True:
+            lines = list(islice(open_file, 50000))
+            if not lines:
+                break
+            chars = np.array(lines, dtype=f'U{positions[-1][1]}').view('U1').reshape(len(lines), -1)
+            blank_chunk = np.ones(len(lines), dtype=bool)
+            for column, (start, end) in zip(columns_list, positions):
+                values = np.char.strip(np.ascontiguousarray(chars[:, start:end]).view(f'U{end - start}').ravel())
+                blank_chunk &= np.char.str_len(values) == 0
+                columns[column].append(values.astype(object))
+            blank.append(blank_chunk)
+
+    # Save as a dataframe, with column names.
+    df = pd.DataFrame({column: np.concatenate(columns[column]) for column in columns_list}, dtype=str)
 
     # Removes blank rows, which are present in some of the data exports.
-    # Blank rows have an empty string in every column.
-    # Source: Microsoft Copilot
-    df = df[~(df == '').all(axis=1)]
+    df = df[~np.concatenate(blank)]
 
     return df
 
@@ -170,8 +181,7 @@ def remove_casework_rows(df, df_case):
     """Remove metadata rows with topics or text that indicate they are casework and return the updated df"""
 
     # Makes an updated dataframe with just rows in df that are not in df_case.
-    df_merge = df.merge(df_case, how='left', indicator=True)
-    df_update = df_merge[df_merge['_merge'] == 'left_only'].drop(columns=['_merge'])
+    df_update = remove_rows(df, df_case)
 
     return df_update
 
@@ -194,20 +204,25 @@ def remove_casework_letters(input_dir):
     q_list = q_df['comments'].tolist()
     if len(q_list) > 0:
 
-        # Creates a file deletion log, with a header row.
-        log_path = os.path.join(os.path.dirname(input_dir),
-                                f"file_deletion_log_{date.today().strftime('%Y-%m-%d')}.csv")
-        file_deletion_log(log_path, None, 'header')
-
+        # Makes a list of the letters to delete and the note for the log.
+        # A letter in the list more than once is only deleted the first time, and is not found after that.
+        delete_list = []
+        listed = set()
         for q_number in q_list:
             # Change "text" to match the folder name in the export which contains the letters, if different.
             q_number = q_number.split(' ')[0]
             file_path = os.path.join(input_dir, 'text', f"{q_number.replace('Q', '')}.txt")
-            try:
-                file_deletion_log(log_path, file_path, 'Casework')
-                os.remove(file_path)
-            except FileNotFoundError:
-                file_deletion_log(log_path, file_path, note='Cannot delete: FileNotFoundError')
+            if file_path in listed:
+                delete_list.append((file_path, 'Cannot delete: FileNotFoundError'))
+            else:
+                delete_list.append((file_path, 'Casework'))
+                listed.add(file_path)
+
+        # Deletes the letters and makes the file deletion log.
+        # Letters that are not in the export are logged as not found.
+        log_path = os.path.join(os.path.dirname(input_dir),
+                                f"file_deletion_log_{date.today().strftime('%Y-%m-%d')}.csv")
+        delete_letters(log_path, delete_list)
 
 
 def remove_pii(df):
@@ -227,32 +242,25 @@ def remove_pii(df):
 def split_congress_year(df, output_dir):
     """Make one CSV per Congress Year"""
 
-    # Saves rows without a year (date is a not a number, could be blank or text) to a CSV, if any.
-    df_undated = df[pd.to_numeric(df['letter_date'], errors='coerce').isnull()]
-    if len(df_undated.index) > 0:
-        df_undated.to_csv(os.path.join(output_dir, 'undated.csv'), index=False)
-
-    # Removes rows without a year from the dataframe, so the rest can be split by Congress Year.
-    df = df[pd.to_numeric(df['letter_date'], errors='coerce').notnull()].copy()
+    # Rows without a year (date is a not a number, could be blank or text) are saved to undated.csv, if any.
+    dated = pd.to_numeric(df['letter_date'], errors='coerce').notna().to_numpy()
 
-    # Adds a column with the year received, which will be used to calculate the Congress Year.
+    # Calculates the year received, which will be used to calculate the Congress Year.
     # Column letter_date is formatted YYMMDD.
     # First the two digit year is extracted, and then it is made a four-digit year by adding 1900 or 2000.
-    df.loc[:, 'year'] = df['letter_date'].astype(str).str[:2].astype(int)
-    df.loc[df['year'] >= 60, 'year'] = df['year'] + 1900
-    df.loc[df['year'] < 60, 'year'] = df['year'] + 2000
+    year = np.zeros(len(df.index), dtype=int)
+    year[dated] = df['letter_date'][dated].astype(str).str[:2].astype(int)
+    year = np.where(year >= 60, year + 1900, year + 2000)
 
-    # Adds a column with the Congress Year received, which is a two-year range starting with an odd year.
-    # First, if the year received is even, the Congress Year is year-1 to year.
-    # Second, if the year received is odd, the Congress Year is year to year+1.
-    df.loc[df['year'] % 2 == 0, 'congress_year'] = (df['year'] - 1).astype(str) + '-' + df['year'].astype(str)
-    df.loc[df['year'] % 2 == 1, 'congress_year'] = df['year'].astype(str) + '-' + (df['year'] + 1).astype(str)
+    # Calculates the Congress Year received, which is a two-year range starting with an odd year.
+    # If the year received is even, the Congress Year is year-1 to year, and if it is odd, year to year+1.
+    start = pd.Series(np.where(year % 2 == 0, year - 1, year)).astype(str)
+    end = pd.Series(np.where(year % 2 == 0, year, year + 1)).astype(str)
+    congress_years = np.where(dated, (start + '-' + end).to_numpy(dtype=object), 'undated')
 
     # Splits the data by Congress Year received and saves each to a separate CSV.
-    # The year and congress_year columns are first removed, so the CSV only has the original columns.
-    for congress_year, cy_df in df.groupby('congress_year'):
-        cy_df = cy_df.drop(['year', 'congress_year'], axis=1)
-        cy_df.to_csv(os.path.join(output_dir, f'{congress_year}.csv'), index=False)
+    # The Congress Year is not added to df, so the CSV only has the original columns.
+    split_year_save(df, congress_years, output_dir)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,105 @@
+"""
+Benchmark for deleting letters and making the file deletion log in appraisal mode.
+Compares deleting one letter at a time and adding each row to the log by opening it again
+(the previous approach in delete_appraisal_letters()) to delete_letters() with one thread and with multiple threads,
+where each row is saved to storage by the log's writer thread before its letter is deleted.
+
+Optional arguments: letter counts to test, separated by commas (default 2000,10000),
+the folder to make the letters in (default is a temporary folder),
+and milliseconds of storage latency to add to reading each letter and saving the log (default 0).
+Use a folder on the storage the exports are on, like a network drive, since that is where the threads help the most,
+or add latency to estimate it on local storage.
+"""
+import csv
+from datetime import date
+import os
+import shutil
+import sys
+import tempfile
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import css_archiving_format as css_arch
+
+
+def add_latency(milliseconds):
+    """Add a wait to reading each letter for its MD5 and to saving the log to storage, like a network drive"""
+    md5 = css_arch.file_deletion_log_md5
+    fsync = os.fsync
+
+    def md5_latency(file_path):
+        time.sleep(milliseconds / 1000)
+        return md5(file_path)
+
+    def fsync_latency(fd):
+        time.sleep(milliseconds / 1000)
+        fsync(fd)
+
+    css_arch.file_deletion_log_md5 = md5_latency
+    os.fsync = fsync_latency
+
+
+def make_letters(folder, count):
+    """Make count letters of 20 KB in folder and return the list of paths and notes for delete_letters()"""
+    os.makedirs(folder)
+    delete_list = []
+    for i in range(count):
+        letter_path = os.path.join(folder, f'{i}.txt')
+        with open(letter_path, 'wb') as letter:
+            letter.write(os.urandom(20000))
+        delete_list.append((letter_path, 'Casework'))
+    return delete_list
+
+
+def old_delete_letters(log_path, delete_list):
+    """The previous approach, with one letter at a time and the log opened again for each row"""
+    css_arch.file_deletion_log(log_path, None, 'header')
+    for file_path, note in delete_list:
+        try:
+            css_arch.file_deletion_log(log_path, file_path, note)
+            os.remove(file_path)
+        except FileNotFoundError:
+            css_arch.file_deletion_log(log_path, file_path, 'Cannot delete: FileNotFoundError')
+
+
+def time_deletion(folder, count, workers):
+    """Return the seconds to delete count letters, with the previous approach if workers is None
+    or otherwise delete_letters() with that many threads"""
+    letters_dir = os.path.join(folder, 'letters')
+    log_path = os.path.join(folder, 'file_deletion_log.csv')
+    delete_list = make_letters(letters_dir, count)
+
+    start = time.perf_counter()
+    if workers is None:
+        old_delete_letters(log_path, delete_list)
+    else:
+        os.environ['CONSTITUENT_MAIL_DELETE_WORKERS'] = str(workers)
+        css_arch.delete_letters(log_path, delete_list)
+    seconds = time.perf_counter() - start
+
+    # Confirms every letter was deleted and logged before reporting the time.
+    with open(log_path, newline='') as log_file:
+        rows = list(csv.reader(log_file))[1:]
+    if os.listdir(letters_dir) or len(rows) != count or any(row[3] != date.today().strftime('%Y-%m-%d')
+                                                             for row in rows):
+        raise ValueError('Not every letter was deleted and logged')
+    shutil.rmtree(letters_dir)
+    os.remove(log_path)
+    return seconds
+
+
+if __name__ == '__main__':
+
+    letter_counts = [2000, 10000]
+    if len(sys.argv) > 1:
+        letter_counts = [int(count) for count in sys.argv[1].split(',')]
+
+    if len(sys.argv) > 3:
+        add_latency(float(sys.argv[3]))
+
+    with tempfile.TemporaryDirectory(dir=sys.argv[2] if len(sys.argv) > 2 else None) as temp_dir:
+        print('Letters,One_At_A_Time_Seconds,Delete_Letters_1_Thread_Seconds,Delete_Letters_8_Threads_Seconds,Speedup')
+        for letter_count in letter_counts:
+            old = time_deletion(temp_dir, letter_count, None)
+            one = time_deletion(temp_dir, letter_count, 1)
+            eight = time_deletion(temp_dir, letter_count, 8)
+            print(f'{letter_count},{old:.2f},{one:.2f},{eight:.2f},{old / eight:.1f}x')
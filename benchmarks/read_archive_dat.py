@@ -0,0 +1,82 @@
+"""
+Benchmark for reading archive.dat, the fixed-width metadata file of the Archival Office Correspondence Data format.
+Compares slicing each line with Python (the previous approach in read_metadata())
+to read_metadata(), which splits the columns from a block of lines at once with NumPy.
+
+Optional argument: row counts to test, separated by commas (default 100000,1000000,3000000)
+The synthetic archive.dat is saved in a temporary folder which is deleted at the end.
+"""
+import numpy as np
+import os
+import pandas as pd
+import sys
+import tempfile
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import archival_office_correspondence_data as aocd
+
+# Start and end character of each column in archive.dat.
+POSITIONS = [(0, 39), (39, 69), (69, 99), (99, 129), (129, 159), (159, 189), (189, 191), (191, 201), (201, 251),
+             (251, 301), (301, 351), (351, 357), (357, 361), (361, 371), (371, 471)]
+
+
+def make_archive(path, rows):
+    """Make archive.dat with synthetic values padded to the column widths, with some blank rows and short lines"""
+    values = np.array(['', 'GA', '30000-1234', 'LAST A, FIRST A, MR.', 'TR-HWY', '971002', '1001 1ST STREET',
+                       'NEWSPAPER GAZETTE'], dtype=object)
+    generator = np.random.default_rng(0)
+    columns = [values[generator.integers(0, len(values), rows)] for pos in POSITIONS]
+    with open(path, 'w') as archive:
+        for row in zip(*columns):
+            line = ''.join(value[:end - start].ljust(end - start) for value, (start, end) in zip(row, POSITIONS))
+            archive.write(line.rstrip() + '\n')
+
+
+def old_read_metadata(path):
+    """The previous approach, with a slice and strip for every column of every line"""
+    rows_list = []
+    with open(path) as open_file:
+        for line in open_file:
+            rows_list.append([line[slice(*pos)].strip() for pos in POSITIONS])
+    columns_list = ['name', 'title', 'organization', 'address_line_1', 'address_line_2', 'city', 'state_code',
+                    'zip_code', 'correspondence_type', 'correspondence_topic', 'correspondence_subtopic',
+                    'letter_date', 'staffer_initials', 'document_number', 'comments']
+    df = pd.DataFrame(rows_list, columns=columns_list, dtype=str)
+    df = df[~(df == '').all(axis=1)]
+    return df
+
+
+def time_readers(path):
+    """Return the seconds to read path with the previous approach and with read_metadata()"""
+    # Only the row hashes (which include the index) of the first dataframe are kept, so both are not in memory at once.
+    start = time.perf_counter()
+    old_df = old_read_metadata(path)
+    old_seconds = time.perf_counter() - start
+    old_columns = old_df.columns.tolist()
+    old_hashes = pd.util.hash_pandas_object(old_df).to_numpy()
+    del old_df
+
+    start = time.perf_counter()
+    new_df = aocd.read_metadata(path)
+    new_seconds = time.perf_counter() - start
+
+    # Confirms the dataframes are the same before reporting the time.
+    new_hashes = pd.util.hash_pandas_object(new_df).to_numpy()
+    if old_columns != new_df.columns.tolist() or not np.array_equal(old_hashes, new_hashes):
+        raise ValueError('read_metadata() dataframe does not match the previous approach')
+    return old_seconds, new_seconds
+
+
+if __name__ == '__main__':
+
+    row_counts = [100000, 1000000, 3000000]
+    if len(sys.argv) > 1:
+        row_counts = [int(count) for count in sys.argv[1].split(',')]
+
+    print('Rows,Line_Slice_Seconds,Read_Metadata_Seconds,Speedup')
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for row_count in row_counts:
+            archive_path = os.path.join(temp_dir, 'archive.dat')
+            make_archive(archive_path, row_count)
+            old, new = time_readers(archive_path)
+            print(f'{row_count},{old:.2f},{new:.2f},{old / new:.1f}x')
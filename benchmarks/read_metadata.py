@@ -0,0 +1,113 @@
+"""
+Benchmark for reading the metadata with each parser that can be set with the environment variable
+CONSTITUENT_MAIL_ENGINE: c (default) and pyarrow.
+Makes synthetic exports in the CSS Archiving Format, CSS Data Interchange Format, and CMS Data Interchange Format,
+and reads each with read_metadata() in a separate process, to measure the parse time and peak resident memory.
+
+Optional argument: row counts to test, separated by commas (default 100000,1000000)
+Synthetic exports are saved in a temporary folder which is deleted at the end.
+"""
+import numpy as np
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+# Number of columns in each table, with the ID columns used for merging in the first columns after record_type.
+CMS_TABLES = {'1B': 22, '2A': 15, '2B': 5, '2C': 7, '2D': 6, '8A': 5}
+DIF_TABLES = {'1B': 26, '2A': 21, '2C': 8, '2D': 8}
+
+# Columns in the CSS Archiving Format metadata file, which has a header.
+CSS_COLUMNS = ['prefix', 'first', 'middle', 'last', 'suffix', 'appellation', 'title', 'org', 'addr1', 'addr2',
+               'addr3', 'addr4', 'city', 'state', 'zip', 'country', 'in_id', 'in_type', 'in_method', 'in_date',
+               'in_topic', 'in_text', 'in_document_name', 'in_fillin', 'out_id', 'out_type', 'out_method',
+               'out_date', 'out_topic', 'out_text', 'out_document_name', 'out_fillin']
+
+
+def cell_values(rows, generator):
+    """Return an array of synthetic text for one column, with some blanks and leading zeros"""
+    values = np.array(['', 'General', 'Case file', '01234', 'Thank you for your letter about the job fair',
+                       r'..\documents\BlobExport\objects\1.txt', '20240101'], dtype=object)
+    return values[generator.integers(0, len(values), rows)]
+
+
+def make_css(folder, rows):
+    """Make archiving_correspondence.dat with a header"""
+    generator = np.random.default_rng(0)
+    columns = [cell_values(rows, generator) for column in CSS_COLUMNS]
+    path = os.path.join(folder, 'archiving_correspondence.dat')
+    with open(path, 'w') as md_file:
+        md_file.write('\t'.join(CSS_COLUMNS) + '\n')
+        for row in zip(*columns):
+            md_file.write('\t'.join(row) + '\n')
+    return path
+
+
+def make_tables(folder, rows, tables, prefix):
+    """Make one table file per table id without headers, where the first two columns after record_type are IDs,
+    and return a dictionary of table id and path"""
+    generator = np.random.default_rng(0)
+    ids = np.arange(rows).astype(str)
+    paths = {}
+    for table_id, column_count in tables.items():
+        # The code table (8A) has the codes used in table 2B.
+        table_rows = 100 if table_id == '8A' else rows
+        columns = [np.full(table_rows, table_id, dtype=object), ids[:table_rows], ids[:table_rows]]
+        columns.extend(cell_values(table_rows, generator) for i in range(column_count - 3))
+        if table_id == '2B':
+            columns[3] = (np.arange(rows) % 100).astype(str)
+        paths[table_id] = os.path.join(folder, f'{prefix}_{table_id}.dat')
+        with open(paths[table_id], 'w') as table_file:
+            for row in zip(*columns):
+                table_file.write('\t'.join(row) + '\n')
+    return paths
+
+
+def run_reader(format_name, folder):
+    """Read the synthetic export for one format with read_metadata() and print the seconds and peak memory in MB"""
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+    start = time.perf_counter()
+    if format_name == 'css':
+        import css_archiving_format
+        df = css_archiving_format.read_metadata(os.path.join(folder, 'archiving_correspondence.dat'))
+    elif format_name == 'dif':
+        import css_data_interchange_format
+        df = css_data_interchange_format.read_metadata({table_id: os.path.join(folder, f'out_{table_id}.dat')
+                                                        for table_id in DIF_TABLES})
+    else:
+        import cms_data_interchange_format
+        df = cms_data_interchange_format.read_metadata({table_id: os.path.join(folder, f'cms_{table_id}.dat')
+                                                        for table_id in CMS_TABLES})
+    seconds = time.perf_counter() - start
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f'{seconds:.2f},{peak_mb:.0f},{len(df.index)}')
+
+
+if __name__ == '__main__':
+
+    # When run by the benchmark (below) with the arguments run, format, and folder, reads one export.
+    if len(sys.argv) > 1 and sys.argv[1] == 'run':
+        run_reader(sys.argv[2], sys.argv[3])
+        sys.exit(0)
+
+    row_counts = [100000, 1000000]
+    if len(sys.argv) > 1:
+        row_counts = [int(count) for count in sys.argv[1].split(',')]
+
+    print('Format,Rows,Engine,Seconds,Peak_Memory_MB,Rows_Read')
+    for row_count in row_counts:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            make_css(temp_dir, row_count)
+            make_tables(temp_dir, row_count, DIF_TABLES, 'out')
+            make_tables(temp_dir, row_count, CMS_TABLES, 'cms')
+            for format_name in ('css', 'dif', 'cms'):
+                for engine in ('c', 'pyarrow'):
+                    result = subprocess.run([sys.executable, __file__, 'run', format_name, temp_dir],
+                                            env=dict(os.environ, CONSTITUENT_MAIL_ENGINE=engine),
+                                            capture_output=True, text=True)
+                    if result.returncode != 0:
+                        print(result.stderr)
+                        sys.exit(1)
+                    print(f'{format_name},{row_count},{engine},{result.stdout.strip()}')
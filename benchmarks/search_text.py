@@ -0,0 +1,59 @@
+"""
+Benchmark for building the text searched for appraisal keywords.
+Compares joining the values of each row (the previous approach in df_search())
+to search_text(), which joins whole columns at once, for the columns searched in each export format.
+
+Optional argument: row counts to test, separated by commas (default 100000,1000000,5000000)
+The 5,000,000 row test needs several GB of memory.
+"""
+import numpy as np
+import pandas as pd
+import sys
+import time
+import css_archiving_format as css_arch
+
+
+def make_df(columns_list, rows):
+    """Make a df of synthetic metadata with the columns searched, with some blanks and keywords"""
+    values = np.array(['Case file', 'Academy nomination', 'Infrastructure', r'..\documents\BlobExport\objects\1.txt',
+                       'Thank you for your letter about the job fair.', 'intern rec', np.nan], dtype=object)
+    generator = np.random.default_rng(0)
+    df = pd.DataFrame({column: values[generator.integers(0, len(values), rows)] for column in columns_list})
+    return df
+
+
+def time_builds(df, columns_list):
+    """Return the seconds to build the text with the previous approach and with search_text()"""
+    start = time.perf_counter()
+    old_text = df[columns_list].astype(str).agg('|'.join, axis=1)
+    old_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    new_text = css_arch.search_text(df, columns_list)
+    new_seconds = time.perf_counter() - start
+
+    # Confirms the results are the same before reporting the time.
+    if not old_text.equals(new_text):
+        raise ValueError('search_text() result does not match the previous approach')
+    return old_seconds, new_seconds
+
+
+if __name__ == '__main__':
+
+    # Columns searched by df_search() in each export format.
+    formats = {'CSS Archiving Format': ['in_topic', 'in_document_name', 'in_fillin', 'in_text',
+                                        'out_topic', 'out_document_name', 'out_fillin', 'out_text'],
+               'CSS Data Interchange Format': ['communication_document_name', 'file_name', 'group_name', 'text'],
+               'CMS Data Interchange Format': ['correspondence_document_name', 'correspondence_text',
+                                               'code_description']}
+
+    row_counts = [100000, 1000000, 5000000]
+    if len(sys.argv) > 1:
+        row_counts = [int(count) for count in sys.argv[1].split(',')]
+
+    print('Format,Rows,Row_Join_Seconds,Search_Text_Seconds,Speedup')
+    for format_name, columns in formats.items():
+        for row_count in row_counts:
+            md_df = make_df(columns, row_count)
+            old, new = time_builds(md_df, columns)
+            print(f'{format_name},{row_count},{old:.2f},{new:.2f},{old / new:.1f}x')
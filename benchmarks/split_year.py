@@ -0,0 +1,87 @@
+"""
+Benchmark for saving the metadata split by year in access mode.
+Compares adding helper columns and saving each groupby() group (the previous approach in split_year())
+to split_year_key() and split_year_save(), using the four date columns of the data interchange formats.
+
+Optional argument: row counts to test, separated by commas (default 100000,1000000,3000000)
+The 3,000,000 row test needs several GB of memory and disk space.
+"""
+import filecmp
+import numpy as np
+import os
+import pandas as pd
+import shutil
+import sys
+import tempfile
+import time
+import css_archiving_format as css_arch
+
+
+def make_df(rows):
+    """Make a df of synthetic metadata with four date columns, with some blanks and dates that are not numbers"""
+    dates = np.array(['20200105', '19991231', '20110704', '2001-12-31', np.nan], dtype=object)
+    text = np.array(['Infrastructure', r'..\documents\BlobExport\objects\1.txt', np.nan], dtype=object)
+    generator = np.random.default_rng(0)
+    df = pd.DataFrame({column: dates[generator.integers(0, len(dates), rows)]
+                       for column in ['date_in', 'date_out', 'update_date', 'reminder_date']})
+    for column in ['group_name', 'communication_document_name', 'file_name']:
+        df[column] = text[generator.integers(0, len(text), rows)]
+    return df
+
+
+def old_split_year(df, year_dir):
+    """The previous approach, with helper columns that are added to df and then removed"""
+    df['use_in'] = pd.to_numeric(df['date_in'], errors='coerce').notna()
+    df['use_out'] = (df['use_in'] == False) & (pd.to_numeric(df['date_out'], errors='coerce').notna())
+    df['use_update'] = ((df['use_in'] == False) & (df['use_out'] == False) &
+                        (pd.to_numeric(df['update_date'], errors='coerce').notna()))
+    df['use_reminder'] = ((df['use_in'] == False) & (df['use_out'] == False) & (df['use_update'] == False) &
+                          (pd.to_numeric(df['reminder_date'], errors='coerce').notna()))
+    df['year'] = 'undated'
+    df.loc[df['use_in'] == True, 'year'] = df['date_in'].astype(str).str[:4]
+    df.loc[df['use_out'] == True, 'year'] = df['date_out'].astype(str).str[:4]
+    df.loc[df['use_update'] == True, 'year'] = df['update_date'].astype(str).str[:4]
+    df.loc[df['use_reminder'] == True, 'year'] = df['reminder_date'].astype(str).str[:4]
+    for year, year_df in df.groupby('year'):
+        year_df = year_df.drop(['use_in', 'use_out', 'use_update', 'use_reminder', 'year'], axis=1)
+        year_df.to_csv(os.path.join(year_dir, f'{year}.csv'), index=False)
+    df.drop(['use_in', 'use_out', 'use_update', 'use_reminder', 'year'], axis=1, inplace=True)
+
+
+def time_splits(df, temp_dir):
+    """Return the seconds to split df by year with the previous approach and with the new functions"""
+    old_dir = os.path.join(temp_dir, 'old')
+    new_dir = os.path.join(temp_dir, 'new')
+    os.mkdir(old_dir)
+    os.mkdir(new_dir)
+
+    start = time.perf_counter()
+    old_split_year(df, old_dir)
+    old_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    years = css_arch.split_year_key(df, ['date_in', 'date_out', 'update_date', 'reminder_date'])
+    css_arch.split_year_save(df, years, new_dir)
+    new_seconds = time.perf_counter() - start
+
+    # Confirms the CSVs are the same before reporting the time.
+    match, mismatch, errors = filecmp.cmpfiles(old_dir, new_dir, os.listdir(old_dir), shallow=False)
+    if mismatch or errors or sorted(os.listdir(old_dir)) != sorted(os.listdir(new_dir)):
+        raise ValueError('split_year_save() CSVs do not match the previous approach')
+    shutil.rmtree(old_dir)
+    shutil.rmtree(new_dir)
+    return old_seconds, new_seconds
+
+
+if __name__ == '__main__':
+
+    row_counts = [100000, 1000000, 3000000]
+    if len(sys.argv) > 1:
+        row_counts = [int(count) for count in sys.argv[1].split(',')]
+
+    print('Rows,Groupby_Seconds,Split_Year_Save_Seconds,Speedup')
+    with tempfile.TemporaryDirectory() as temporary_dir:
+        for row_count in row_counts:
+            md_df = make_df(row_count)
+            old, new = time_splits(md_df, temporary_dir)
+            print(f'{row_count},{old:.2f},{new:.2f},{old / new:.1f}x')
@@ -13,6 +13,9 @@ For appraisal and access, appraisal_delete_log.csv (made by accession mode) must
 For access mode, review_restrictions.csv (made by appraisal mode) must be in the output directory.
 This allows the archivist to review and edit these documents without needing to update the script.
 """
+import codecs
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from contextlib import contextmanager
 import csv
 from datetime import date, datetime
 import hashlib
@@ -20,10 +23,202 @@ import numpy as np
 import os
 import pandas as pd
 from pathlib import Path
+import queue
 import re
 import shutil
 import sys
+import tempfile
+import threading
 import time
+import warnings
+
+
+def accession_chunks(md_path, input_dir, output_dir, chunk_size):
+    """Make the accession mode reports by reading the metadata file in chunks of chunk_size rows
+    and return the df of rows that indicate appraisal
+    Memory use depends on the chunk size and the number of rows for appraisal, not the size of the export."""
+
+    # Deletes formatting error logs from an earlier run, since each chunk adds its rows to these logs.
+    for column in ('state', 'zip', 'in_date', 'out_date', 'in_document_name_split', 'out_document_name_split'):
+        log_path = os.path.join(output_dir, f'metadata_formatting_errors_{column}.csv')
+        if os.path.exists(log_path):
+            os.remove(log_path)
+
+    # Information from each chunk that is combined for the reports.
+    appraisal_rows = []
+    appraisal_tiers = []
+    column_names = None
+    total_rows = 0
+    blank_count = None
+    formatting = None
+    metadata_paths = set()
+    blank_path_total = 0
+    df_topics = None
+
+    for df in read_metadata_chunks(md_path, chunk_size):
+
+        # Keeps the rows that match any appraisal category, and their tiers, to make the appraisal logs.
+        df_tiers = find_appraisal_tiers(df)
+        matched = (df_tiers != '').any(axis=1).to_numpy()
+        appraisal_rows.append(df[matched])
+        appraisal_tiers.append(df_tiers[matched])
+
+        # Adds the number of rows, blank cells, and formatting errors to the totals from earlier chunks.
+        # Formatting is text instead of a number if the column is missing or blank, which is replaced by a number
+        # if the column has data in a later chunk.
+        chunk_blank, chunk_formatting = check_metadata_usability_counts(df, output_dir, append=True)
+        total_rows += len(df.index)
+        if column_names is None:
+            column_names = df.columns.tolist()
+            blank_count = chunk_blank
+            formatting = chunk_formatting
+        else:
+            blank_count = blank_count + chunk_blank
+            for column, count in chunk_formatting.items():
+                if isinstance(count, int) and isinstance(formatting[column], int):
+                    formatting[column] = formatting[column] + count
+                elif isinstance(count, int):
+                    formatting[column] = count
+
+        # Adds the letter paths and number of rows without a path to those from earlier chunks.
+        # Only unique paths are kept, since the report compares the paths as sets.
+        chunk_paths, chunk_blank_paths = check_letter_matching_metadata(df, input_dir)
+        metadata_paths.update(chunk_paths)
+        blank_path_total += chunk_blank_paths
+
+        # Adds the topic counts to the counts from earlier chunks.
+        # This is last because it replaces blank topics in the chunk with BLANK.
+        chunk_topics = topics_report_counts(df)
+        if df_topics is None:
+            df_topics = chunk_topics
+        else:
+            df_topics = pd.concat([df_topics, chunk_topics]).groupby('Topic', as_index=False).sum()
+
+    # Makes the appraisal logs and the reports with the information combined from all the chunks.
+    df_appraisal = appraisal_logs(pd.concat(appraisal_rows, ignore_index=True),
+                                  pd.concat(appraisal_tiers, ignore_index=True), output_dir)
+    check_metadata_usability_report(column_names, total_rows, blank_count, formatting, output_dir)
+    check_letter_matching_report(list(metadata_paths), blank_path_total, output_dir, input_dir)
+    topics_report_save(df_topics, output_dir)
+
+    return df_appraisal
+
+
+def appraisal_keywords():
+    """Return the keywords for each appraisal category, used by find_appraisal_rows() and the find_*_rows() functions
+    exact: whole cell matches, keywords: partial matches with more certainty, check: partial matches with less"""
+    return {'Academy_Application': {'exact': [],
+                                    'keywords': ['academy'],
+                                    'check': ['acad']},
+            'Casework': {'exact': ['CASE', 'Case', 'case', 'CASE!', 'Case!', 'case!'],
+                         'keywords': ['added to case', 'already open', 'case closed', 'case file', 'case for',
+                                      'case has', 'case issue', 'case open', 'case work', 'casework', 'closed case',
+                                      'forwarded to me', 'initialssacase', 'open case', 'open sixth district cases',
+                                      'prison case', 'started case'],
+                         'check': ['case', 'issue']},
+            'Job_Application': {'exact': [],
+                                'keywords': ['intern ', 'internship', 'interview', 'job app', 'job request',
+                                             'job.doc', 'jobapp', 'resume'],
+                                'check': ['application', 'hire', 'intern', 'job']},
+            'Recommendation': {'exact': [],
+                               'keywords': ['intern rec', 'page rec', 'rec for', 'recommendation'],
+                               'check': ['rec']}}
+
+
+def appraisal_logs(df, df_tiers, output_dir):
+    """Make the appraisal check log and appraisal delete log from the tiers calculated by appraisal_search()
+    and return the df of rows that indicate appraisal"""
+
+    # Makes a log with rows to check to refine appraisal decisions. These were not marked for appraisal
+    # but have a simple keyword (e.g., case) that could be new indicators for appraisal.
+    # Rows that fit more than one appraisal category are repeated.
+    check_list = [df[(df_tiers[category] == 'check').to_numpy()].assign(Appraisal_Category=category)
+                  for category in df_tiers.columns]
+    df_check = pd.concat(check_list, axis=0, ignore_index=True)
+    df_check.to_csv(os.path.join(output_dir, 'appraisal_check_log.csv'), index=False)
+
+    # Makes a single dataframe with all rows that indicate appraisal
+    # and also saves to a log for review for any that are not correct identifications.
+    # Rows that fit more than one appraisal category are combined.
+    df_appraisal = appraisal_logs_combine(df, df_tiers)
+    df_appraisal.to_csv(os.path.join(output_dir, 'appraisal_delete_log.csv'), index=False)
+    return df_appraisal
+
+
+def appraisal_logs_combine(df, df_tiers):
+    """Return a df with one row for each distinct row that indicates appraisal (as strings), in sorted order,
+    with every appraisal category for that row in Appraisal_Category separated by |.
+    The categories are combined by a row id, instead of grouping by every column of the row."""
+
+    # Positions in df of the rows for each category, in the order of the categories and then the rows.
+    positions_list = [np.flatnonzero((df_tiers[category] == 'sure').to_numpy()) for category in df_tiers.columns]
+    positions = np.concatenate(positions_list).astype(int)
+    categories = np.repeat(df_tiers.columns.to_numpy(dtype=object), [len(p) for p in positions_list])
+
+    # Gives every row that indicates appraisal an id, where rows with the same text have the same id.
+    # Row text is compared as codes for each column, sorted so the ids are in the same order as the text of the rows.
+    rows = np.unique(positions)
+    df_rows = df.iloc[rows].astype(str)
+    if len(rows) > 0:
+        codes = np.column_stack([pd.factorize(df_rows[column].to_numpy(dtype=object), sort=True)[0]
+                                 for column in df_rows.columns])
+        first, row_id = np.unique(codes, axis=0, return_index=True, return_inverse=True)[1:]
+        row_id = row_id.reshape(-1)
+    else:
+        first, row_id = np.array([], dtype=int), np.array([], dtype=int)
+
+    # Combines the categories of each row id, in the order the categories were found.
+    ids = row_id[np.searchsorted(rows, positions)]
+    combined = pd.Series(categories, dtype=object).groupby(ids, sort=True).agg('|'.join)
+    df_appraisal = df_rows.iloc[first].reset_index(drop=True)
+    df_appraisal['Appraisal_Category'] = combined.to_numpy(dtype=object)
+    return df_appraisal
+
+
+def appraisal_search(df, columns_list, exact_columns_list):
+    """Return a df with the appraisal tier of each row for every appraisal category:
+    sure (same as df_search() with the keywords or df_search_exact()), check (only the check keywords), or blank.
+    The text of each row is built and searched once for the keywords of all categories."""
+
+    categories = appraisal_keywords()
+
+    # Combines the columns searched into one string per row, the same as df_search().
+    text = search_text(df, columns_list)
+    text = pd.Series(text.to_numpy(), dtype=object)
+
+    # Finds every keyword of every category anywhere in the text with a single case-insensitive scan.
+    # The lookahead allows overlapping matches, and keywords are tried longest first, so the text captured at a
+    # position also starts with every shorter keyword that matches there (e.g., "intern rec" includes "intern").
+    keywords = set()
+    for lists in categories.values():
+        keywords.update(lists['keywords'] + lists['check'])
+    pattern = '(?=(' + '|'.join(sorted(keywords, key=len, reverse=True)) + '))'
+    found = text.str.findall(pattern, flags=re.IGNORECASE).explode().dropna()
+
+    # Each distinct text captured is checked against the keywords for each category and tier,
+    # and then rows are marked as matching if any of their captured text matches.
+    found_unique = found.unique()
+    matches = {}
+    for category, lists in categories.items():
+        for tier in ('keywords', 'check'):
+            regex = re.compile('|'.join(lists[tier]), flags=re.IGNORECASE)
+            found_match = found.map({found_text: regex.match(found_text) is not None for found_text in found_unique})
+            rows = np.zeros(len(df.index), dtype=bool)
+            rows[found.index[found_match.to_numpy(dtype=bool)]] = True
+            matches[(category, tier)] = rows
+
+    # Assigns the tier for each category. Rows with more certainty are never also included in check,
+    # the same as searching only the unmatched rows for the check keywords in the find_*_rows() functions.
+    tiers = {}
+    for category, lists in categories.items():
+        sure = matches[(category, 'keywords')]
+        if lists['exact']:
+            sure = sure | df[exact_columns_list].isin(lists['exact']).any(axis=1).to_numpy()
+        check = ~sure & matches[(category, 'check')]
+        tiers[category] = np.select([sure, check], ['sure', 'check'], default='')
+    df_tiers = pd.DataFrame(tiers, index=df.index)
+
+    return df_tiers
 
 
 def check_arguments(arg_list):
@@ -72,30 +267,33 @@ def check_arguments(arg_list):
     return input_dir, md_path, mode, errors
 
 
-def check_letter_matching(df, output_dir, input_dir):
+def check_letter_matching(df, output_dir, input_dir, inventory=None):
     """Compare the files in the metadata to the files in the export,
     reformatting the metadata paths and making all characters lowercase, so they can match"""
 
-    # Makes a list of paths for the letters in the documents folder within the input directory.
-    # This way, the metadata file is not counted as missing.
-    input_dir_paths = []
-    for root, dirs, files in os.walk(os.path.join(input_dir, 'documents')):
-        for file in files:
-            file_path = os.path.join(root, file)
-            file_path = file_path.lower()
-            input_dir_paths.append(file_path)
+    # Makes a list of paths for letters in the metadata and the number of metadata rows without a file path,
+    # and then compares them to the export and saves the results.
+    metadata_paths, blank_total = check_letter_matching_metadata(df, input_dir)
+    check_letter_matching_report(metadata_paths, blank_total, output_dir, input_dir, inventory)
+
+
+def check_letter_matching_metadata(df, input_dir):
+    """Return a list of paths for letters in the metadata, reformatted to match the export,
+    and the number of metadata rows without a file path"""
 
     # Makes a list of paths for letters from constituents in the metadata,
     # updating the path to match how the directory is structured in the export.
     in_doc_df = df.dropna(subset=['in_document_name_split']).copy()
-    in_doc_df['in_document_name_split'] = in_doc_df['in_document_name_split'].apply(update_path, input_dir=input_dir)
+    path_map = update_path_map(in_doc_df['in_document_name_split'], input_dir)
+    in_doc_df['in_document_name_split'] = in_doc_df['in_document_name_split'].map(path_map)
     in_doc_df['in_document_name_split'] = in_doc_df['in_document_name_split'].str.lower()
     in_doc_list = in_doc_df['in_document_name_split'].tolist()
 
     # Makes a list of paths for letters to constituents in the metadata,
     # updating the path to match how the directory is structured in the export.
     out_doc_df = df.dropna(subset=['out_document_name_split']).copy()
-    out_doc_df['out_document_name_split'] = out_doc_df['out_document_name_split'].apply(update_path, input_dir=input_dir)
+    path_map = update_path_map(out_doc_df['out_document_name_split'], input_dir)
+    out_doc_df['out_document_name_split'] = out_doc_df['out_document_name_split'].map(path_map)
     out_doc_df['out_document_name_split'] = out_doc_df['out_document_name_split'].str.lower()
     out_doc_list = out_doc_df['out_document_name_split'].tolist()
 
@@ -104,8 +302,20 @@ def check_letter_matching(df, output_dir, input_dir):
     blank_out_doc = df['out_document_name_split'].isna().sum()
     blank_total = blank_in_doc + blank_out_doc
 
+    return in_doc_list + out_doc_list, blank_total
+
+
+def check_letter_matching_report(metadata_paths, blank_total, output_dir, input_dir, inventory=None):
+    """Compare the paths for letters in the metadata to the files in the export and save the results
+    Uses the inventory of the documents folder from documents_inventory(), if provided, instead of scanning it"""
+
+    # Makes a list of lowercase paths for the letters in the documents folder within the input directory.
+    # This way, the metadata file is not counted as missing.
+    if inventory is None:
+        inventory, empty_list = documents_inventory(os.path.join(input_dir, 'documents'))
+    input_dir_paths = [file_info[1] for file_info in inventory.values()]
+
     # Compares the combined list of file paths in the metadata to the export directory.
-    metadata_paths = in_doc_list + out_doc_list
     metadata_only = list(set(metadata_paths) - set(input_dir_paths))
     directory_only = list(set(input_dir_paths) - set(metadata_paths))
     match = list(set(metadata_paths) & set(input_dir_paths))
@@ -130,7 +340,7 @@ def check_letter_matching(df, output_dir, input_dir):
             log_writer.writerow(['Directory Only', path])
 
 
-def check_metadata_formatting(column, df, output_dir):
+def check_metadata_formatting(column, df, output_dir, append=False):
     """Return the number of rows that don't meet the expected formatting
     and save the rows to a csv"""
 
@@ -138,7 +348,7 @@ def check_metadata_formatting(column, df, output_dir):
     patterns = {'in_date': r'^\d{8}$',
                 'out_date': r'^\d{8}$',
                 'state': r'^[A-Z]\.?[A-Z]\.?$',
-                'zip': r'^\d{5}(-\d{4})?(-X{4})?$'}
+                'zip': r'^\d{5}(?:-\d{4})?(?:-X{4})?$'}
 
     # Makes a dataframe with all rows that do not match the expected formatting, excluding blanks.
     # If the column is missing from the dataframe or blank, it returns default text instead of a row count.
@@ -151,15 +361,20 @@ def check_metadata_formatting(column, df, output_dir):
     df_no_match = df[~match & df[column].notna()]
 
     # Saves the dataframe to a csv if there were any that did not match the expected formatting.
+    # If append is True (the metadata is read in chunks), the rows are added to the csv from earlier chunks, if any.
     no_match_count = len(df_no_match.index)
     if no_match_count > 0:
-        df_no_match.to_csv(os.path.join(output_dir, f'metadata_formatting_errors_{column}.csv'), index=False)
+        csv_path = os.path.join(output_dir, f'metadata_formatting_errors_{column}.csv')
+        if append and os.path.exists(csv_path):
+            df_no_match.to_csv(csv_path, mode='a', header=False, index=False)
+        else:
+            df_no_match.to_csv(csv_path, index=False)
 
     # Returns the number of rows that do not match the expected formatting, excluding blanks.
     return no_match_count
 
 
-def check_metadata_formatting_multi(column, df, output_dir):
+def check_metadata_formatting_multi(column, df, output_dir, append=False):
     """Return the number of rows that don't meet the expected formatting when more than one format is permitted
     and save the rows to a csv"""
 
@@ -176,9 +391,14 @@ def check_metadata_formatting_multi(column, df, output_dir):
     df_no_match = df[~(match_blob | match_dos | match_e) & df[column].notna()]
 
     # Saves the dataframe to a csv if there were any that did not match the expected formatting.
+    # If append is True (the metadata is read in chunks), the rows are added to the csv from earlier chunks, if any.
     no_match_count = len(df_no_match.index)
     if no_match_count > 0:
-        df_no_match.to_csv(os.path.join(output_dir, f'metadata_formatting_errors_{column}.csv'), index=False)
+        csv_path = os.path.join(output_dir, f'metadata_formatting_errors_{column}.csv')
+        if append and os.path.exists(csv_path):
+            df_no_match.to_csv(csv_path, mode='a', header=False, index=False)
+        else:
+            df_no_match.to_csv(csv_path, index=False)
 
     # Returns the number of rows that do not match the expected formatting, excluding blanks.
     return no_match_count
@@ -187,40 +407,33 @@ def check_metadata_formatting_multi(column, df, output_dir):
 def check_metadata_usability(df, output_dir):
     """Test the usability of the metadata: columns present, number of blanks, and formatting errors"""
 
-    # Tests if all expected columns are present and if there are any unexpected columns.
-    column_names = df.columns.tolist()
+    # Calculates the number of blank cells and formatting errors in each column and saves the report.
+    blank_count, formatting = check_metadata_usability_counts(df, output_dir)
+    check_metadata_usability_report(df.columns.tolist(), len(df.index), blank_count, formatting, output_dir)
+
+
+def check_metadata_usability_counts(df, output_dir, append=False):
+    """Return the number of blank cells in each column and the number of formatting errors in each expected column,
+    and save the rows with formatting errors to csvs (adding to csvs from earlier chunks if append is True)"""
+
+    # Expected columns, in the order used for the usability report.
     expected = ['prefix', 'first', 'middle', 'last', 'suffix', 'appellation', 'title', 'org', 'addr1', 'addr2',
                 'addr3', 'addr4', 'city', 'state', 'zip', 'country', 'in_id', 'in_type', 'in_method', 'in_date',
                 'in_topic', 'in_text', 'in_document_name', 'in_fillin', 'out_id', 'out_type', 'out_method',
                 'out_date', 'out_topic', 'out_text', 'out_document_name', 'out_fillin',
                 'in_document_name_split', 'out_document_name_split']
-    columns_dict = dict.fromkeys(expected)
-    match = list(set(expected).intersection(column_names))
-    for column in match:
-        columns_dict[column] = True
-    missing = list(set(expected) - set(column_names))
-    for column in missing:
-        columns_dict[column] = False
-    extra = list(set(column_names) - set(expected))
-    for column in extra:
-        columns_dict[column] = 'Error: unexpected column'
-    columns_present = pd.Series(data=columns_dict, index=list(columns_dict.keys()))
 
     # Calculates the number of blank cells in each column.
     blank_count = df.isna().sum()
 
-    # Calculates the percentage of blank cells in each column.
-    total_rows = len(df.index)
-    blank_percent = round((blank_count / total_rows) * 100, 2)
-
     # Calculates the number of cells with formatting errors in each column with predictable formatting
     # and also saves those rows to a csv.
-    state_mismatch = check_metadata_formatting('state', df, output_dir)
-    zip_mismatch = check_metadata_formatting('zip', df, output_dir)
-    in_date_mismatch = check_metadata_formatting('in_date', df, output_dir)
-    in_doc_mismatch = check_metadata_formatting_multi('in_document_name_split', df, output_dir)
-    out_date_mismatch = check_metadata_formatting('out_date', df, output_dir)
-    out_doc_mismatch = check_metadata_formatting_multi('out_document_name_split', df, output_dir)
+    state_mismatch = check_metadata_formatting('state', df, output_dir, append)
+    zip_mismatch = check_metadata_formatting('zip', df, output_dir, append)
+    in_date_mismatch = check_metadata_formatting('in_date', df, output_dir, append)
+    in_doc_mismatch = check_metadata_formatting_multi('in_document_name_split', df, output_dir, append)
+    out_date_mismatch = check_metadata_formatting('out_date', df, output_dir, append)
+    out_doc_mismatch = check_metadata_formatting_multi('out_document_name_split', df, output_dir, append)
 
     # Combines the number of formatting errors for the checked columns into a series, for adding to the report.
     # Other columns have "uncheckable", even if the column is missing from the export.
@@ -233,50 +446,253 @@ def check_metadata_usability(df, output_dir):
                                  'uncheckable', 'see out_document_name_split', 'uncheckable',
                                  in_doc_mismatch, out_doc_mismatch], index=expected)
 
+    return blank_count, formatting
+
+
+def check_metadata_usability_report(column_names, total_rows, blank_count, formatting, output_dir):
+    """Save the usability report from the column names, number of rows,
+    and counts calculated by check_metadata_usability_counts()"""
+
+    # Tests if all expected columns are present and if there are any unexpected columns.
+    # The expected columns are the index of the formatting series.
+    expected = formatting.index.tolist()
+    columns_dict = dict.fromkeys(expected)
+    match = list(set(expected).intersection(column_names))
+    for column in match:
+        columns_dict[column] = True
+    missing = list(set(expected) - set(column_names))
+    for column in missing:
+        columns_dict[column] = False
+    extra = list(set(column_names) - set(expected))
+    for column in extra:
+        columns_dict[column] = 'Error: unexpected column'
+    columns_present = pd.Series(data=columns_dict, index=list(columns_dict.keys()))
+
+    # Calculates the percentage of blank cells in each column.
+    blank_percent = round((blank_count / total_rows) * 100, 2)
+
     # Combines the data about each column into a dataframe and saves as a CSV.
     columns_df = pd.concat([columns_present, blank_count, blank_percent, formatting], axis=1)
     columns_df.columns = ['Present', 'Blank_Count', 'Blank_Percent', 'Formatting_Errors']
     columns_df.to_csv(os.path.join(output_dir, 'usability_report_metadata.csv'), index=True, index_label='Column_Name')
 
 
-def delete_appraisal_letters(input_dir, output_dir, df_appraisal):
+def delete_appraisal_letters(input_dir, output_dir, df_appraisal, inventory=None):
     """Deletes letters received from constituents and individual letters sent back by the office
-    because they are one of the types of letters not retained for appraisal reasons"""
+    because they are one of the types of letters not retained for appraisal reasons
+    Uses the inventory of the documents folder from documents_inventory(), if provided, instead of scanning it
+    Uses the plan made by delete_appraisal_plan() in accession mode, if there is one,
+    so letters that have not changed since the plan was made are not hashed again"""
+
+    # Makes a list of the letters to delete and the note for the log.
+    delete_list = delete_appraisal_list(input_dir, df_appraisal, inventory)
 
-    # Creates a file deletion log, with a header row.
+    # Deletes the letters and makes the file deletion log.
     log_path = os.path.join(output_dir, f"file_deletion_log_{date.today().strftime('%Y-%m-%d')}.csv")
-    file_deletion_log(log_path, None, 'header')
+    plan = delete_letters_plan_read(os.path.join(output_dir, 'appraisal_delete_plan.csv'))
+    delete_letters(log_path, delete_list, plan)
+
 
-    # Deletes letters in df_appraisal if they are in the export.
-    # The letter path has to be reformatted to match the actual export, and an error is logged if it is a new pattern.
+def delete_appraisal_list(input_dir, df_appraisal, inventory=None, empty_list=None):
+    """Return a list with the path and the note for the file deletion log for each letter to delete for appraisal,
+    in the order for the log, including letters that cannot be deleted
+    Uses the inventory and list of empty folders from documents_inventory(), if provided, instead of scanning.
+    Letters in the list are removed from the inventory."""
+
+    # Gets the files and folders in the export, to check if each letter exists
+    # without another request to the file system.
+    if inventory is None:
+        inventory, empty_list = documents_inventory(os.path.join(input_dir, 'documents'))
+    folders = documents_inventory_folders(inventory, empty_list)
+
+    # The letter path has to be reformatted to match the actual export.
+    # The paths are reformatted all at once, so each unique path is only reformatted once.
     df_appraisal = df_appraisal.astype(str)
+    path_map = update_path_map(pd.concat([df_appraisal['in_document_name_split'],
+                                          df_appraisal['out_document_name_split']]), input_dir)
+
+    # Makes a list of the letters in df_appraisal to delete if they are in the export and the note for the log,
+    # in the order they will be in the log. An error is logged if the letter path is a new pattern.
+    # The letters are not deleted until the list is done, so listed has the letters already in the list.
+    delete_list = []
+    listed = set()
     for row in df_appraisal.itertuples():
-        # Deletes all letters received from constituents.
+        # Includes all letters received from constituents.
         name = row.in_document_name_split
         if name != '' and name != 'nan':
-            file_path = update_path(name, input_dir)
+            file_path = path_map[name]
             if file_path == 'error_new':
-                file_deletion_log(log_path, name, 'Cannot determine file path: new path pattern in metadata')
+                delete_list.append((name, 'Cannot determine file path: new path pattern in metadata'))
+            elif inventory.pop(documents_inventory_key(file_path), None):
+                delete_list.append((file_path, row.Appraisal_Category))
+                listed.add(documents_inventory_key(file_path))
             else:
-                try:
-                    file_deletion_log(log_path, file_path, row.Appraisal_Category)
-                    os.remove(file_path)
-                except FileNotFoundError:
-                    file_deletion_log(log_path, file_path, 'Cannot delete: FileNotFoundError')
+                delete_list.append((file_path, 'Cannot delete: FileNotFoundError'))
 
-        # Deletes individual letters, not form letters, sent to constituents.
+        # Includes individual letters, not form letters, sent to constituents.
         name = row.out_document_name_split
         if name != '' and name != 'nan' and 'form' not in name:
-            file_path = update_path(name, input_dir)
+            file_path = path_map[name]
             if file_path == 'error_new':
-                file_deletion_log(log_path, name, 'Cannot determine file path: new path pattern in metadata')
+                delete_list.append((name, 'Cannot determine file path: new path pattern in metadata'))
             # Only delete if it is a file. Sometimes, out_document_name_split has the path to a folder instead.
+            # Files are removed from the inventory once listed, so a second row with the file logs it is not found.
             else:
-                if os.path.isfile(file_path):
-                    file_deletion_log(log_path, file_path, row.Appraisal_Category)
-                    os.remove(file_path)
-                elif not os.path.exists(file_path):
-                    file_deletion_log(log_path, file_path, 'Cannot delete: FileNotFoundError')
+                key = documents_inventory_key(file_path)
+                if inventory.pop(key, None):
+                    delete_list.append((file_path, row.Appraisal_Category))
+                    listed.add(key)
+                elif key in listed or key not in folders:
+                    delete_list.append((file_path, 'Cannot delete: FileNotFoundError'))
+
+    return delete_list
+
+
+def delete_appraisal_plan(input_dir, output_dir, df_appraisal, inventory=None, empty_list=None):
+    """Make a plan for deleting letters in appraisal mode (appraisal_delete_plan.csv) with the size,
+    modification time, and MD5 of each letter to delete from df_appraisal, without deleting anything,
+    so appraisal mode only has to check the letters have not changed before deleting them
+    Uses the inventory and list of empty folders from documents_inventory(), if provided, instead of scanning.
+    Letters in the plan are removed from the inventory."""
+    delete_list = delete_appraisal_list(input_dir, df_appraisal, inventory, empty_list)
+    delete_letters_plan(os.path.join(output_dir, 'appraisal_delete_plan.csv'), delete_list)
+
+
+def delete_letters(log_path, delete_list, plan=None):
+    """Delete letters with multiple threads and make the file deletion log
+    delete_list has a tuple with the path and the note for the log for each letter, in the order for the log.
+    Letters with a note that starts with Cannot are logged but not deleted.
+    If plan (from delete_letters_plan_read) is provided, the MD5 in the plan is used for letters with the same size
+    and modification time as when the plan was made, instead of hashing them again.
+    The number of threads is set with the environment variable CONSTITUENT_MAIL_DELETE_WORKERS (default 8).
+    This is used by the scripts for other export types as well"""
+
+    # Makes the log rows and deletes the letters with multiple threads, since most of the time is waiting for storage.
+    # Each thread waits for the log's writer thread to save the row for a letter before deleting it,
+    # so every deleted letter is in the log even if the script stops.
+    # The number of letters waiting for a thread is limited, so the list of threads does not use too much memory.
+    # The position of each row in delete_list is saved to put the log in that order at the end.
+    workers = int(os.environ.get('CONSTITUENT_MAIL_DELETE_WORKERS', 8))
+    log_rows = []
+    with file_deletion_log_open(log_path) as log:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {}
+            for position, (file_path, note) in enumerate(delete_list):
+                if note.startswith('Cannot'):
+                    log_rows.append((position, file_deletion_log_row(file_path, note)))
+                    file_deletion_log_write(log, log_rows[-1][1])
+                    continue
+                planned = plan.get(file_path) if plan else None
+                futures[executor.submit(delete_letters_file, file_path, note, planned, log)] = position
+                if len(futures) >= workers * 4:
+                    done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        log_rows.append((futures.pop(future), future.result()))
+            for future in as_completed(futures):
+                log_rows.append((futures[future], future.result()))
+
+    # Replaces the log with the rows in the same order as delete_list, so the log is the same every time.
+    # The sorted log is saved to another file first, so the log is not lost if the script stops while saving.
+    log_rows.sort(key=lambda log_row: log_row[0])
+    with open(f'{log_path}.tmp', 'w', newline='') as log_file:
+        log_writer = csv.writer(log_file)
+        log_writer.writerow(['File', 'SizeKB', 'DateCreated', 'DateDeleted', 'MD5', 'Notes'])
+        log_writer.writerows([row for position, row in log_rows])
+        log_file.flush()
+        os.fsync(log_file.fileno())
+    os.replace(f'{log_path}.tmp', log_path)
+
+
+def delete_letters_file(file_path, note, planned=None, log=None):
+    """Make the file deletion log row for a letter, save it to the log, and then delete it, for delete_letters()
+    planned is the size, modification time, and MD5 of the letter from the plan, if any.
+    log is the open log from file_deletion_log_open(), if any. The letter is only deleted after the row is saved.
+    If the letter is not found or cannot be deleted, returns the row for a letter that cannot be deleted instead,
+    which is also added to the log after the first row if the first row was already saved"""
+    try:
+        # Uses the MD5 from the plan if the letter has not changed since the plan was made.
+        md5 = None
+        if planned:
+            stat = os.stat(file_path)
+            if (stat.st_size, stat.st_mtime_ns) == planned[:2]:
+                md5 = planned[2]
+        row = file_deletion_log_row(file_path, note, md5)
+    except FileNotFoundError:
+        row = file_deletion_log_row(file_path, 'Cannot delete: FileNotFoundError')
+        if log:
+            file_deletion_log_write(log, row)
+        return row
+
+    # The letter may be removed or locked by another program after the row is made.
+    if log:
+        file_deletion_log_write(log, row, wait=True)
+    try:
+        os.remove(file_path)
+    except (FileNotFoundError, PermissionError) as error:
+        row = file_deletion_log_row(file_path, f'Cannot delete: {type(error).__name__}')
+        if log:
+            file_deletion_log_write(log, row)
+    return row
+
+
+def delete_letters_plan(plan_path, delete_list):
+    """Make a plan for delete_letters() with the size, modification time, and MD5 of each letter in delete_list
+    that will be deleted, so they do not need to be calculated when the letters are deleted
+    If the plan already exists, letters with the same size and modification time are not hashed again.
+    Uses the same number of threads as delete_letters(), set with CONSTITUENT_MAIL_DELETE_WORKERS (default 8)."""
+
+    # Gets the letters to delete, skipping duplicates and letters that are logged but not deleted (note is Cannot...).
+    old_plan = delete_letters_plan_read(plan_path)
+    file_list = list(dict.fromkeys([file_path for file_path, note in delete_list if not note.startswith('Cannot')]))
+
+    # Gets the information for each letter with multiple threads, since most of the time is waiting for storage.
+    workers = int(os.environ.get('CONSTITUENT_MAIL_DELETE_WORKERS', 8))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        planned_list = list(executor.map(delete_letters_plan_file, file_list,
+                                         [old_plan.get(file_path) for file_path in file_list]))
+
+    # Saves the plan, skipping letters that were not found.
+    # The plan is saved to another file first, so an existing plan is not lost if the script stops while saving.
+    with open(f'{plan_path}.tmp', 'w', newline='') as plan_file:
+        plan_writer = csv.writer(plan_file)
+        plan_writer.writerow(['File', 'SizeBytes', 'ModifiedNs', 'MD5'])
+        plan_writer.writerows([[file_path, *planned] for file_path, planned in zip(file_list, planned_list) if planned])
+    os.replace(f'{plan_path}.tmp', plan_path)
+
+
+def delete_letters_plan_file(file_path, planned=None):
+    """Return the size, modification time, and MD5 of a letter for delete_letters_plan(), or None if it is not found
+    planned is the information for the letter from an existing plan, which is used if the letter has not changed"""
+    try:
+        # Gets the size and modification time before reading the letter,
+        # so the letter is hashed again in appraisal mode if it changes while it is being read.
+        stat = os.stat(file_path)
+        if planned and (stat.st_size, stat.st_mtime_ns) == planned[:2]:
+            return planned
+        return stat.st_size, stat.st_mtime_ns, file_deletion_log_md5(file_path)
+    except FileNotFoundError:
+        return None
+
+
+def delete_letters_plan_read(plan_path):
+    """Return a dict with the path of each letter in a plan made by delete_letters_plan()
+    and a tuple of its size, modification time, and MD5, or an empty dict if there is no plan"""
+    plan = {}
+    if os.path.exists(plan_path):
+        with open(plan_path, newline='') as plan_file:
+            plan_reader = csv.reader(plan_file)
+            next(plan_reader)
+            for file_path, size, modified, md5 in plan_reader:
+                plan[file_path] = (int(size), int(modified), md5)
+    return plan
+
+
+def delete_metadata_cache(output_dir):
+    """Delete the metadata cache saved by save_metadata_cache() for the export with this output_dir, if any,
+    since it has the metadata before PII is removed. This is done in access mode, which is the last mode run."""
+    cache_dir = metadata_cache_dir(output_dir)
+    if os.path.exists(cache_dir):
+        shutil.rmtree(cache_dir)
 
 
 def df_search(df, keywords_list, category):
@@ -289,7 +705,7 @@ def df_search(df, keywords_list, category):
     # Makes a dataframe with any row containing one of the keywords in at least one of the columns searched.
     # Keyword matches are case-insensitive and will not match blanks.
     keywords = '|'.join(keywords_list)
-    match = df[columns_list].astype(str).agg('|'.join, axis=1).str.contains(keywords, case=False, na=False)
+    match = search_text(df, columns_list).str.contains(keywords, case=False, na=False)
     df_match = df[match].copy()
 
     # Adds a column with the appraisal category.
@@ -324,35 +740,239 @@ def df_search_exact(df, keywords_list, category):
     return df_match, df_no_match
 
 
-def file_deletion_log(log_path, file_path, note):
+def documents_inventory(folder_path):
+    """Return an inventory of every file in the folder (usually the export's documents folder) made with one scan,
+    and a list of empty folders, so each step of the script can look up files instead of checking the folder again
+    The inventory is a dict with the key from documents_inventory_key() for each file
+    and a tuple of the path, lowercase path, size, and modification time, in the same order as os.walk()
+    The number of threads is set with the environment variable CONSTITUENT_MAIL_SCAN_WORKERS (default 8)."""
+
+    # Scans the folders with multiple threads, since most of the time is waiting for storage (like network drives).
+    # Each subfolder is scanned as soon as its parent is scanned, and progress is printed every 10,000 files.
+    workers = int(os.environ.get('CONSTITUENT_MAIL_SCAN_WORKERS', 8))
+    scans = {}
+    file_count = 0
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(documents_inventory_folder, folder_path): folder_path}
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                folder = futures.pop(future)
+                scans[folder] = future.result()
+                for subfolder in scans[folder][1]:
+                    futures[executor.submit(documents_inventory_folder, subfolder)] = subfolder
+                new_count = file_count + len(scans[folder][0])
+                if new_count // 10000 > file_count // 10000:
+                    print(f"Found {new_count:,} files in {folder_path} so far")
+                file_count = new_count
+
+    # Combines the scans in the same order as os.walk(): files in a folder are listed before its subfolders.
+    inventory = {}
+    empty_list = []
+    folder_stack = [folder_path]
+    while folder_stack:
+        folder = folder_stack.pop()
+        file_list, subfolder_list, is_empty = scans.pop(folder)
+        if is_empty:
+            empty_list.append(folder)
+        inventory.update(file_list)
+        folder_stack.extend(reversed(subfolder_list))
+
+    return inventory, empty_list
+
+
+def documents_inventory_folder(folder):
+    """Scan one folder for documents_inventory() and return a list of the inventory key and tuple for each file,
+    a list of subfolders to scan, and if the folder is empty
+    Uses os.scandir(), which gets the file type (and on Windows, the size and date) with the folder contents
+    instead of needing another request per file. Folders that cannot be read are skipped, like os.walk()."""
+    try:
+        with os.scandir(folder) as entries:
+            entry_list = list(entries)
+    except OSError:
+        return [], [], False
+
+    file_list = []
+    subfolder_list = []
+    for entry in entry_list:
+        if entry.is_dir():
+            if not entry.is_symlink():
+                subfolder_list.append(entry.path)
+        else:
+            try:
+                stat = entry.stat()
+                file_list.append((documents_inventory_key(entry.path),
+                                  (entry.path, entry.path.lower(), stat.st_size, stat.st_mtime)))
+            except OSError:
+                file_list.append((documents_inventory_key(entry.path), (entry.path, entry.path.lower(), None, None)))
+    return file_list, subfolder_list, not entry_list
+
+
+def documents_inventory_folders(inventory, empty_list=None):
+    """Return a set with the inventory key of every folder in the inventory from documents_inventory(),
+    which is each folder with a file or in the list of empty folders and every folder that contains them,
+    so a path can be checked for a folder without another request to the file system"""
+    start_folders = {os.path.dirname(file_info[0]) for file_info in inventory.values()}
+    start_folders.update(empty_list or [])
+
+    # Adds each folder and its parent folders, stopping at a folder already added since its parents are also added.
+    folders = set()
+    for folder in start_folders:
+        key = documents_inventory_key(folder)
+        while key not in folders:
+            folders.add(key)
+            if os.path.dirname(key) == key:
+                break
+            key = os.path.dirname(key)
+
+    return folders
+
+
+def documents_inventory_key(path):
+    """Return the key for a path in the inventory from documents_inventory(),
+    which is normalized so it matches the way the operating system compares paths (case-insensitive on Windows)"""
+    return os.path.normcase(os.path.normpath(path))
+
+
+def file_deletion_log(log_path, file_path, note, log=None):
     """Make or update the file deletion log, so data is saved as soon as a file is deleted
     Data included follows https://github.com/uga-libraries/accessioning-scripts/blob/main/technical-appraisal-logs.py
-    This is used by the scripts for other export types as well"""
+    This is used by the scripts for other export types as well
+    If log (from file_deletion_log_open) is provided, rows are added to that log, which stays open,
+    instead of opening the log again for every row"""
 
     # Makes a new log with a header row.
     # If a file already exists with this name, it will be overwritten.
     if note == 'header':
-        with open(log_path, 'w', newline='') as log:
-            log_writer = csv.writer(log)
+        with open(log_path, 'w', newline='') as log_file:
+            log_writer = csv.writer(log_file)
             log_writer.writerow(['File', 'SizeKB', 'DateCreated', 'DateDeleted', 'MD5', 'Notes'])
+        return
 
-    # Adds a row for a file with errors (cannot calculate file path or file is not found) to an existing log.
-    elif note.startswith('Cannot'):
-        with open(log_path, 'a', newline='') as log:
-            log_writer = csv.writer(log)
-            log_writer.writerow([file_path, None, None, None, None, note])
+    # Adds a row for a file with errors (cannot calculate file path or file is not found)
+    # or a file that can be deleted to the open log, or otherwise to an existing log.
+    row = file_deletion_log_row(file_path, note)
+    if log:
+        file_deletion_log_write(log, row, wait=True)
+    else:
+        with open(log_path, 'a', newline='') as log_file:
+            log_writer = csv.writer(log_file)
+            log_writer.writerow(row)
+
+
+def file_deletion_log_md5(file_path):
+    """Return the MD5 of a file, in uppercase, reading the file in pieces so large files are not read into memory"""
+
+    # hashlib.file_digest() is only in Python 3.11 and higher.
+    # For earlier versions, reads the file 1 MB at a time into the same buffer.
+    with open(file_path, 'rb') as f:
+        if hasattr(hashlib, 'file_digest'):
+            md5 = hashlib.file_digest(f, 'md5')
+        else:
+            md5 = hashlib.md5()
+            buffer = bytearray(1024 * 1024)
+            view = memoryview(buffer)
+            while size := f.readinto(buffer):
+                md5.update(view[:size])
 
-    # Adds a row for a file that can be deleted to an existing log.
+    return md5.hexdigest().upper()
+
+
+@contextmanager
+def file_deletion_log_open(log_path):
+    """Make the file deletion log with a header row and keep it open to add rows with file_deletion_log_write(),
+    for use in a with statement. Rows are written by one thread, file_deletion_log_writer(), so other threads
+    do not wait for the log. The log is saved to the file when the with statement ends, even if there is an error"""
+    file_deletion_log(log_path, None, 'header')
+    with open(log_path, 'a', newline='') as log_file:
+        log = {'queue': queue.Queue(), 'error': None}
+        writer_thread = threading.Thread(target=file_deletion_log_writer, args=(log_file, log))
+        writer_thread.start()
+        try:
+            yield log
+        finally:
+            log['queue'].put(None)
+            writer_thread.join()
+    if log['error']:
+        raise log['error']
+
+
+def file_deletion_log_row(file_path, note, md5=None):
+    """Return the row for the file deletion log for a file with errors (note starts with Cannot),
+    or for a file that can be deleted, which must be made before the file is deleted
+    If the MD5 is provided (from a plan made by delete_letters_plan), the file is not hashed again"""
+    if note.startswith('Cannot'):
+        row = [file_path, None, None, None, None, note]
     else:
         size_kb = round(int(os.path.getsize(file_path))/1000, 1)
         date_c = datetime.strptime(time.ctime(os.path.getctime(file_path)), '%a %b %d %H:%M:%S %Y').strftime('%Y-%m-%d')
-        with open(file_path, 'rb') as f:
-            file_data = f.read()
-        md5 = hashlib.md5(file_data).hexdigest().upper()
+        if md5 is None:
+            md5 = file_deletion_log_md5(file_path)
         date_d = date.today().strftime('%Y-%m-%d')
-        with open(log_path, 'a', newline='') as log:
-            log_writer = csv.writer(log)
-            log_writer.writerow([file_path, size_kb, date_c, date_d, md5, note])
+        row = [file_path, size_kb, date_c, date_d, md5, note]
+    return row
+
+
+def file_deletion_log_write(log, row, wait=False):
+    """Add a row to the open file deletion log from file_deletion_log_open()
+    If wait is True, returns after the row is saved to the file (flushed and synced to storage),
+    which is used before deleting the letter so it is in the log even if the script stops"""
+    if log['error']:
+        raise log['error']
+    saved = threading.Event() if wait else None
+    log['queue'].put((row, saved))
+    if wait:
+        saved.wait()
+        if log['error']:
+            raise log['error']
+
+
+def file_deletion_log_writer(log_file, log):
+    """Write the rows added with file_deletion_log_write() to the log, for the thread made by file_deletion_log_open()
+    Rows are saved to the file (flushed and synced to storage) in batches, every 100 rows or once a second,
+    or sooner if a row is waiting to be saved before its letter is deleted and there are no more rows to add,
+    so one save can include rows from all the threads deleting letters"""
+    log_writer = csv.writer(log_file)
+    waiting = []
+    unsaved = 0
+    save_time = time.monotonic()
+    while True:
+        try:
+            item = log['queue'].get(timeout=1)
+        except queue.Empty:
+            item = ()
+        if item:
+            row, saved = item
+            if saved:
+                waiting.append(saved)
+            if not log['error']:
+                try:
+                    log_writer.writerow(row)
+                    unsaved += 1
+                except OSError as error:
+                    log['error'] = error
+
+        # Saves the rows, and lets the threads waiting for their rows to be saved continue.
+        # After an error, the rows are not saved and the threads continue so they can stop.
+        if (unsaved >= 100 or time.monotonic() - save_time >= 1 or item is None
+                or (waiting and log['queue'].empty())):
+            if unsaved and not log['error']:
+                try:
+                    log_file.flush()
+                    os.fsync(log_file.fileno())
+                except OSError as error:
+                    log['error'] = error
+            unsaved = 0
+            save_time = time.monotonic()
+            for saved in waiting:
+                saved.set()
+            waiting = []
+        if log['error']:
+            for saved in waiting:
+                saved.set()
+            waiting = []
+        if item is None:
+            return
 
 
 def find_academy_rows(df):
@@ -360,11 +980,11 @@ def find_academy_rows(df):
     and return as two dfs, one with more certainty (df_academy) and one with less (df_academy_check)"""
 
     # Makes df with more certainty.
-    keywords_list = ['academy']
+    keywords_list = appraisal_keywords()['Academy_Application']['keywords']
     df_academy, df_unmatched = df_search(df, keywords_list, 'Academy_Application')
 
     # Makes df with less certainty, only searching rows that are not in df_academy, to look for new keywords.
-    check_list = ['acad']
+    check_list = appraisal_keywords()['Academy_Application']['check']
     df_academy_check, df_unmatched = df_search(df_unmatched, check_list, 'Academy_Application')
 
     return df_academy, df_academy_check
@@ -374,46 +994,39 @@ def find_appraisal_rows(df, output_dir):
     """Find metadata rows with topics or text that indicate they are different categories for appraisal,
      return as a df and log results"""
 
-    # Call the functions for each appraisal category.
-    df_academy, df_academy_check = find_academy_rows(df)
-    df_casework, df_casework_check = find_casework_rows(df)
-    df_job, df_job_check = find_job_rows(df)
-    df_recommendation, df_recommendation_check = find_recommendation_rows(df)
+    # Searches every row once for all the appraisal categories.
+    df_tiers = find_appraisal_tiers(df)
 
-    # Makes a log with rows to check to refine appraisal decisions. These were not marked for appraisal
-    # but have a simple keyword (e.g., case) that could be new indicators for appraisal.
-    # Rows that fit more than one appraisal category are repeated.
-    df_check = pd.concat([df_academy_check, df_casework_check, df_job_check, df_recommendation_check],
-                         axis=0, ignore_index=True)
-    df_check.to_csv(os.path.join(output_dir, 'appraisal_check_log.csv'), index=False)
-
-    # Makes a single dataframe with all rows that indicate appraisal
-    # and also saves to a log for review for any that are not correct identifications.
-    # Rows that fit more than one appraisal category are combined.
-    df_appraisal = pd.concat([df_academy, df_casework, df_job, df_recommendation], axis=0, ignore_index=True)
-    df_appraisal = df_appraisal.astype(str)
-    df_appraisal = df_appraisal.groupby([col for col in df_appraisal.columns if col != 'Appraisal_Category'])['Appraisal_Category'].apply(lambda x: '|'.join(map(str, x))).reset_index()
-    df_appraisal.to_csv(os.path.join(output_dir, 'appraisal_delete_log.csv'), index=False)
+    # Makes the logs of rows to check and rows that indicate appraisal, and returns the rows that indicate appraisal.
+    df_appraisal = appraisal_logs(df, df_tiers, output_dir)
     return df_appraisal
 
 
+def find_appraisal_tiers(df):
+    """Return a df with the appraisal tier of each row for every appraisal category from appraisal_search(),
+    using the same columns as df_search() for keywords and df_search_exact() for exact matches"""
+    df_tiers = appraisal_search(df, ['in_topic', 'in_document_name', 'in_fillin', 'in_text',
+                                     'out_topic', 'out_document_name', 'out_fillin', 'out_text'],
+                                ['in_type', 'in_topic', 'in_document_name', 'in_fillin', 'in_text',
+                                 'out_type', 'out_topic', 'out_document_name', 'out_fillin', 'out_text'])
+    return df_tiers
+
+
 def find_casework_rows(df):
     """Find metadata rows with keywords that indicate they might be casework
     and return as a two dfs, one with more certain (df_casework) and one with less (df_casework_check)"""
 
     # Makes df with more certainty, combining exact column matches and partial matches.
-    exact_list = ['CASE', 'Case', 'case', 'CASE!', 'Case!', 'case!']
+    exact_list = appraisal_keywords()['Casework']['exact']
     df_casework_exact, df_unmatched = df_search_exact(df, exact_list, 'Casework')
 
-    keywords_list = ['added to case', 'already open', 'case closed', 'case file', 'case for', 'case has', 'case issue',
-                     'case open', 'case work', 'casework', 'closed case', 'forwarded to me', 'initialssacase',
-                     'open case', 'open sixth district cases', 'prison case', 'started case']
+    keywords_list = appraisal_keywords()['Casework']['keywords']
     df_casework_partial, df_unmatched = df_search(df_unmatched, keywords_list, 'Casework')
 
     df_casework = pd.concat([df_casework_exact, df_casework_partial], ignore_index=True)
 
     # Makes df with less certainty, only searching rows that are not in df_casework, to look for new keywords.
-    check_list = ['case', 'issue']
+    check_list = appraisal_keywords()['Casework']['check']
     df_casework_check, df_unmatched = df_search(df_unmatched, check_list, 'Casework')
 
     return df_casework, df_casework_check
@@ -424,11 +1037,11 @@ def find_job_rows(df):
     and return as a two dfs, one with more certain (df_job) and one with less (df_job_check)"""
 
     # Makes df with more certainty.
-    keywords_list = ['intern ', 'internship', 'interview', 'job app', 'job request', 'job.doc', 'jobapp', 'resume']
+    keywords_list = appraisal_keywords()['Job_Application']['keywords']
     df_job, df_unmatched = df_search(df, keywords_list, 'Job_Application')
 
     # Makes df with less certainty, only searching rows that are not in df_job, to look for new keywords.
-    check_list = ['application', 'hire', 'intern', 'job']
+    check_list = appraisal_keywords()['Job_Application']['check']
     df_job_check, df_unmatched = df_search(df_unmatched, check_list, 'Job_Application')
 
     return df_job, df_job_check
@@ -439,45 +1052,219 @@ def find_recommendation_rows(df):
     and return as two dfs, one with more certainty (df_recommendation) and one with less (df_recommendation_check)"""
 
     # Makes df with more certainty.
-    keywords_list = ['intern rec', 'page rec', 'rec for', 'recommendation']
+    keywords_list = appraisal_keywords()['Recommendation']['keywords']
     df_recommendation, df_unmatched = df_search(df, keywords_list, 'Recommendation')
 
     # Makes df with less certainty, only searching rows that are not in df_recommendation, to look for new keywords.
-    check_list = ['rec']
+    check_list = appraisal_keywords()['Recommendation']['check']
     df_recommendation_check, df_unmatched = df_search(df_unmatched, check_list, 'Recommendation')
 
     return df_recommendation, df_recommendation_check
 
 
+def metadata_cache_dir(output_dir):
+    """Return the folder for the metadata cache for the export with this output_dir,
+    which is in the temporary folder of the operating system instead of the output_dir, since it has PII
+    The folder name is the MD5 of the output_dir path, so each export has its own cache."""
+    folder_name = hashlib.md5(os.path.abspath(output_dir).encode()).hexdigest()
+    return os.path.join(tempfile.gettempdir(), 'constituent_mail_cache', folder_name)
+
+
+def metadata_cache_key(paths_list):
+    """Return the key for the metadata cache, which combines the size, modification time, and MD5 of each metadata file,
+    or None if the cache is not used (the environment variable CONSTITUENT_MAIL_CACHE is not 1)"""
+    if os.environ.get('CONSTITUENT_MAIL_CACHE') != '1':
+        return None
+
+    # Reads the files in blocks, so the MD5 can be calculated for files larger than the available memory.
+    file_info = []
+    for path in sorted(paths_list):
+        md5 = hashlib.md5()
+        with open(path, 'rb') as md_file:
+            for block in iter(lambda: md_file.read(1048576), b''):
+                md5.update(block)
+        file_info.append(f'{os.path.basename(path)}|{os.path.getsize(path)}|{os.path.getmtime(path)}|{md5.hexdigest()}')
+    key = hashlib.md5('\n'.join(file_info).encode()).hexdigest()
+
+    return key
+
+
 def read_csv(path):
     """Read a CSV produced by a previous mode of this script into a dataframe"""
     try:
-        df = pd.read_csv(path, dtype=str, on_bad_lines='warn')
+        df = read_delimited(path)
         return df
     except FileNotFoundError:
         raise FileNotFoundError
 
 
+def read_delimited(path, delimiter=',', names=None, encoding_errors='strict', usecols=None):
+    """Read a delimited text file into a dataframe with every column as text, skipping rows with too many columns,
+    with the parser set by the environment variable CONSTITUENT_MAIL_ENGINE: c (default) or pyarrow
+    If usecols (list of column names) is provided, the other columns are not kept in memory."""
+
+    # The pyarrow parser cannot ignore encoding errors, so the default parser is always used for that.
+    engine = os.environ.get('CONSTITUENT_MAIL_ENGINE', 'c')
+    if engine == 'c' or encoding_errors != 'strict':
+        df = read_delimited_c(path, delimiter, names, encoding_errors, usecols)
+    elif engine == 'pyarrow':
+        df = read_delimited_pyarrow(path, delimiter, names, usecols)
+    else:
+        raise ValueError(f"CONSTITUENT_MAIL_ENGINE '{engine}' is not one of the expected parsers, c or pyarrow")
+
+    return df
+
+
+def read_delimited_c(path, delimiter, names, encoding_errors, usecols):
+    """Read a delimited text file into a dataframe with the default pandas parser
+    If usecols is provided, names is required."""
+
+    if usecols is None:
+        df = pd.read_csv(path, delimiter=delimiter, dtype=str, encoding_errors=encoding_errors, on_bad_lines='warn',
+                         names=names)
+        return df
+
+    # The parser does not check for rows with too many columns when usecols is used,
+    # so the file is read in chunks with every column and only the columns in usecols are kept from each chunk.
+    # The other columns are only in memory for one chunk at a time.
+    usecols = [name for name in names if name in usecols]
+    chunks = []
+    with pd.read_csv(path, delimiter=delimiter, dtype=str, encoding_errors=encoding_errors, on_bad_lines='warn',
+                     names=names, chunksize=100000) as reader:
+        for chunk in reader:
+            chunks.append(chunk[usecols])
+    df = pd.concat(chunks)
+
+    return df
+
+
+def read_delimited_pyarrow(path, delimiter, names, usecols):
+    """Read a delimited text file into a dataframe with pyarrow, which parses with multiple threads,
+    with the same column types, blanks, and warnings as the default parser"""
+
+    # Imported here so pyarrow is only required if this parser is used.
+    import pyarrow
+    from pyarrow import csv as pyarrow_csv
+
+    # Column names are needed before reading the file, so every column can be read as text.
+    # Otherwise, columns that look like numbers are converted and lose leading zeros, like in zip codes.
+    # If names are not provided, the column names are the first row of the file.
+    skip_rows = 0
+    if names is None:
+        with open(path, newline='', encoding='utf-8') as file:
+            names = next(csv.reader(file, delimiter=delimiter))
+        skip_rows = 1
+
+    # Skips rows with too many columns with a warning, like on_bad_lines='warn'.
+    # The default parser fills rows with too few columns with blanks, which pyarrow cannot do,
+    # so the file is read with the default parser instead if there are any.
+    skipped = []
+    short = []
+
+    def invalid_row(row):
+        if row.actual_columns > row.expected_columns:
+            skipped.append(row)
+        else:
+            short.append(row)
+        return 'skip'
+
+    # Text that the default parser reads as blank.
+    na_values = ['', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN', '<NA>',
+                 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null']
+
+    # Invalid UTF-8 is raised as a UnicodeDecodeError, so scripts can read the file again ignoring encoding errors.
+    try:
+        table = pyarrow_csv.read_csv(path,
+                                     read_options=pyarrow_csv.ReadOptions(column_names=names, skip_rows=skip_rows),
+                                     parse_options=pyarrow_csv.ParseOptions(delimiter=delimiter,
+                                                                            invalid_row_handler=invalid_row),
+                                     convert_options=pyarrow_csv.ConvertOptions(
+                                         column_types={name: pyarrow.string() for name in names},
+                                         include_columns=[name for name in names if name in (usecols or [])],
+                                         null_values=na_values,
+                                         strings_can_be_null=True))
+    except pyarrow.ArrowInvalid as error:
+        if 'UTF8' in str(error):
+            raise UnicodeDecodeError('utf-8', b'', 0, 1, str(error))
+        raise
+
+    if short:
+        return read_delimited_c(path, delimiter, None if skip_rows else names, 'strict', usecols)
+    for row in skipped:
+        warnings.warn(f'Skipping line: expected {row.expected_columns} fields, saw {row.actual_columns}: {row.text}',
+                      pd.errors.ParserWarning)
+
+    # Makes text columns with NaN for blanks, the same as the default parser, instead of None.
+    df = table.to_pandas(self_destruct=True)
+    del table
+    df = df.where(df.notna(), np.nan)
+
+    return df
+
+
 def read_metadata(path):
     """Read the metadata file into a dataframe"""
     try:
-        df = pd.read_csv(path, delimiter='\t', dtype=str, on_bad_lines='warn')
+        df = read_delimited(path, '\t')
     except UnicodeDecodeError:
         print("\nUnicodeDecodeError when trying to read the metadata file.")
         print("The file will be read by ignoring encoding errors, skipping characters that cause an error.\n")
-        df = pd.read_csv(path, delimiter='\t', dtype=str, encoding_errors='ignore', on_bad_lines='warn')
+        df = read_delimited(path, '\t', encoding_errors='ignore')
 
-    # Removes blank rows, which are present in some of the data exports.
-    df.dropna(how='all', inplace=True)
+    # Removes blank rows and splits rows with multiple documents.
+    df = split_documents(df)
+
+    return df
 
-    # Splits rows with multiple documents (in and/or out) so they can be matched to the files in the export.
-    # The rest of the row is repeated for each in/out document combination.
-    # The split columns are only temporary, for use by the script to match paths to the export,
-    # and only the original columns with the delimiter are in access outputs to show the relationships between docs.
-    df['in_document_name_split'] = df['in_document_name'].str.split(r'^')
-    df = df.explode('in_document_name_split')
-    df['out_document_name_split'] = df['out_document_name'].str.split(r'^')
-    df = df.explode('out_document_name_split')
+
+def read_metadata_chunks(path, chunk_size):
+    """Read the metadata file in chunks of chunk_size rows and yield each chunk as a dataframe,
+    so the memory used depends on the chunk size and not the size of the export
+    Chunks are always read with the default pandas parser, since the pyarrow parser cannot read a set number of rows,
+    so there is a warning if the environment variable CONSTITUENT_MAIL_ENGINE is pyarrow"""
+
+    # Checks the parser the same as read_delimited(), so a parser that is not supported is not ignored.
+    engine = os.environ.get('CONSTITUENT_MAIL_ENGINE', 'c')
+    if engine == 'pyarrow':
+        warnings.warn("CONSTITUENT_MAIL_ENGINE 'pyarrow' is not used when reading the metadata in chunks "
+                      "(CONSTITUENT_MAIL_CHUNK_ROWS), so it is read with the c parser")
+    elif engine != 'c':
+        raise ValueError(f"CONSTITUENT_MAIL_ENGINE '{engine}' is not one of the expected parsers, c or pyarrow")
+
+    # Checks the encoding before reading any chunks, since chunks are used as soon as they are read
+    # and the file cannot be read again from the start if there is an error partway through.
+    encoding_errors = 'strict'
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    with open(path, 'rb') as md_file:
+        try:
+            for block in iter(lambda: md_file.read(1048576), b''):
+                decoder.decode(block)
+            decoder.decode(b'', final=True)
+        except UnicodeDecodeError:
+            print("\nUnicodeDecodeError when trying to read the metadata file.")
+            print("The file will be read by ignoring encoding errors, skipping characters that cause an error.\n")
+            encoding_errors = 'ignore'
+
+    # Removes blank rows and splits rows with multiple documents in each chunk.
+    # The rows for a split row are always in the same chunk.
+    with pd.read_csv(path, delimiter='\t', dtype=str, encoding_errors=encoding_errors, on_bad_lines='warn',
+                     chunksize=chunk_size) as reader:
+        for df in reader:
+            yield split_documents(df)
+
+
+def read_metadata_cache(key, output_dir):
+    """Return the metadata df saved by save_metadata_cache() with this key,
+    or None if the cache is not used or there is no df saved with this key (the metadata files changed)"""
+    if key is None:
+        return None
+    cache_path = os.path.join(metadata_cache_dir(output_dir), f'{key}.parquet')
+    if not os.path.exists(cache_path):
+        return None
+
+    # Blanks are read from parquet as None, which are changed back to NaN to match read_metadata().
+    df = pd.read_parquet(cache_path)
+    df = df.where(df.notna(), np.nan)
 
     return df
 
@@ -486,8 +1273,7 @@ def remove_appraisal_rows(df, df_appraisal):
     """Remove metadata rows for letters deleted during appraisal and return the updated df"""
 
     # Makes an updated dataframe with just rows in df that are not in df_appraisal.
-    df_merge = df.merge(df_appraisal, how='left', indicator=True)
-    df_update = df_merge[df_merge['_merge'] == 'left_only'].drop(columns=['_merge', 'Appraisal_Category'])
+    df_update = remove_rows(df, df_appraisal)
 
     return df_update
 
@@ -515,9 +1301,25 @@ def remove_restricted_rows(df, df_restrict):
     df_restrict = df_restrict.drop_duplicates()
 
     # Makes an updated dataframe with just rows in df that are not in df_restrict.
-    df_merge = df.merge(df_restrict, how='left', indicator=True)
-    df_update = df_merge[df_merge['_merge'] == 'left_only'].drop(columns=['_merge'])
+    df_update = remove_rows(df, df_restrict)
+
+    return df_update
 
+
+def remove_rows(df, df_remove):
+    """Remove rows in df that match a row in df_remove (a log made from df) and return the updated df,
+    comparing the columns in both dataframes with the fingerprint of each row instead of merging the dataframes"""
+    columns = [column for column in df.columns if column in df_remove.columns]
+    df_fingerprint = row_fingerprint(df, columns)
+    remove_fingerprint = row_fingerprint(df_remove, columns)
+    remove = np.isin(df_fingerprint, remove_fingerprint)
+
+    # Confirms the text of each row with a matching fingerprint also matches,
+    # so a row is never removed because two different rows have the same fingerprint.
+    remove_text = set(row_text(df_remove[np.isin(remove_fingerprint, df_fingerprint[remove])], columns))
+    remove[remove] = [text in remove_text for text in row_text(df[remove], columns)]
+
+    df_update = df.reset_index(drop=True)[~remove]
     return df_update
 
 
@@ -549,6 +1351,41 @@ def restriction_report(df, output_dir):
         report_df.to_csv(os.path.join(output_dir, 'restriction_review.csv'), index=False)
 
 
+def row_fingerprint(df, columns):
+    """Return an array with a 64-bit hash of the text of each row in the columns,
+    where blanks and the text nan are the same, since the appraisal log saves blanks as nan"""
+    null, blank = pd.util.hash_array(np.array([None, 'nan'], dtype=object), categorize=False)
+    fingerprint = np.zeros(len(df.index), dtype=np.uint64)
+    for column in columns:
+        column_hash = pd.util.hash_array(df[column].to_numpy(dtype=object), categorize=False)
+        column_hash[column_hash == null] = blank
+        fingerprint = fingerprint * np.uint64(1000003) ^ column_hash
+    return fingerprint
+
+
+def row_text(df, columns):
+    """Return a list with a tuple of the text of each row in the columns,
+    where blanks are the text nan, to match how row_fingerprint() compares rows"""
+    df_text = df[columns].astype(object)
+    df_text = df_text.where(df_text.notna(), 'nan').astype(str)
+    return list(df_text.itertuples(index=False, name=None))
+
+
+def save_metadata_cache(df, key, output_dir):
+    """Save the metadata df to the cache with the key from metadata_cache_key(), if the cache is used,
+    so later runs of the script can read it instead of the metadata files (requires pyarrow)
+    The cache is saved to the folder from metadata_cache_dir(), not the output_dir, since it has PII."""
+    if key is None:
+        return
+
+    # Deletes the df saved for an earlier version of the metadata files, if any, since it can no longer be used.
+    delete_metadata_cache(output_dir)
+    cache_dir = metadata_cache_dir(output_dir)
+    os.makedirs(cache_dir)
+
+    df.to_parquet(os.path.join(cache_dir, f'{key}.parquet'))
+
+
 def save_redacted_metadata(df, output_dir):
     """Save the entire df of redacted metadata to a csv, after cleanup"""
 
@@ -565,6 +1402,37 @@ def save_redacted_metadata(df, output_dir):
     return df
 
 
+def search_text(df, columns_list):
+    """Return a series with the text of the columns combined into one string per row, separated by |,
+    which is searched for appraisal keywords"""
+
+    # Blanks become the text "nan", and the columns are joined with vectorized string operations
+    # instead of joining the values of each row separately.
+    text = df[columns_list[0]].astype(str)
+    if len(columns_list) > 1:
+        text = text.str.cat([df[column].astype(str) for column in columns_list[1:]], sep='|')
+
+    return text
+
+
+def split_documents(df):
+    """Remove blank rows and split rows with multiple documents in the metadata and return the updated df"""
+
+    # Removes blank rows, which are present in some of the data exports.
+    df = df.dropna(how='all')
+
+    # Splits rows with multiple documents (in and/or out) so they can be matched to the files in the export.
+    # The rest of the row is repeated for each in/out document combination.
+    # The split columns are only temporary, for use by the script to match paths to the export,
+    # and only the original columns with the delimiter are in access outputs to show the relationships between docs.
+    df = df.assign(in_document_name_split=df['in_document_name'].str.split(r'^'))
+    df = df.explode('in_document_name_split')
+    df['out_document_name_split'] = df['out_document_name'].str.split(r'^')
+    df = df.explode('out_document_name_split')
+
+    return df
+
+
 def split_year(df, output_dir):
     """Make one metadata CSV per calendar year for smaller amount of data to review"""
 
@@ -572,26 +1440,41 @@ def split_year(df, output_dir):
     year_dir = os.path.join(output_dir, 'correspondence_metadata_by_year')
     os.mkdir(year_dir)
 
-    # Makes a column with the year, which uses in_date if any, then out_date if any, and then "undated".
-    # If a column has date information, it is formatted YYYYMMDD.
-    df['use_in_date'] = pd.to_numeric(df['in_date'], errors='coerce').notna()
-    df['use_out_date'] = (df['use_in_date'] == False) & (pd.to_numeric(df['out_date'], errors='coerce').notna())
-    df['year'] = 'undated'
-    df.loc[df['use_in_date'] == True, 'year'] = df['in_date'].astype(str).str[:4]
-    df.loc[df['use_out_date'] == True, 'year'] = df['out_date'].astype(str).str[:4]
+    # Calculates the year of each row, which uses in_date if any, then out_date if any, and then "undated".
+    # The year is not added to df, so the metadata CSVs only have the original columns.
+    years = split_year_key(df, ['in_date', 'out_date'])
 
     # Saves the rows for each year to a separate CSV.
-    # The columns used to calculate year are first removed, so the metadata CSVs only have the original columns.
-    for year, year_df in df.groupby('year'):
-        year_df = year_df.drop(['use_in_date', 'use_out_date', 'year'], axis=1)
-        year_df.to_csv(os.path.join(year_dir, f'{year}.csv'), index=False)
+    split_year_save(df, years, year_dir)
+
+
+def split_year_key(df, date_columns):
+    """Return an array with the year of each row from the first of the date_columns (in order of priority)
+    with date information (formatted YYYYMMDD), or "undated" if none have date information"""
+    conditions = [pd.to_numeric(df[column], errors='coerce').notna().to_numpy() for column in date_columns]
+    choices = [df[column].astype(str).str[:4].to_numpy(dtype=object) for column in date_columns]
+    years = np.select(conditions, choices, default='undated')
+    return years
+
 
-    # Removes the year rows from the primary df, so it isn't present for the last step (sort by topic).
-    df.drop(['use_in_date', 'use_out_date', 'year'], axis=1, inplace=True)
+def split_year_save(df, years, year_dir):
+    """Save the rows of df for each year (array from split_year_key()) to a separate CSV named with the year,
+    writing at most 100,000 rows at a time so rows for one year are never all copied at once"""
+    for year, positions in pd.Series(years, dtype=object).groupby(years).indices.items():
+        csv_path = os.path.join(year_dir, f'{year}.csv')
+        for start in range(0, len(positions), 100000):
+            df_rows = df.iloc[positions[start:start + 100000]]
+            df_rows.to_csv(csv_path, index=False, mode='w' if start == 0 else 'a', header=start == 0)
 
 
 def topics_report(df, output_dir):
     """Make a report with the frequency of each topic"""
+    df_counts = topics_report_counts(df)
+    topics_report_save(df_counts, output_dir)
+
+
+def topics_report_counts(df):
+    """Return a df with the number of times each topic is in the in_topic and out_topic columns"""
 
     # Replace blanks with BLANK so that it is counted as a topic.
     df['in_topic'] = df['in_topic'].fillna('BLANK')
@@ -609,6 +1492,12 @@ def topics_report(df, output_dir):
     df_counts['In_Topic_Count'] = df_counts['In_Topic_Count'].astype(int)
     df_counts['Out_Topic_Count'] = df_counts['Out_Topic_Count'].astype(int)
 
+    return df_counts
+
+
+def topics_report_save(df_counts, output_dir):
+    """Add a total to the topic counts from topics_report_counts() and save the report"""
+
     # Adds a totals column to the dataframe.
     df_counts['Total'] = df_counts['In_Topic_Count'] + df_counts['Out_Topic_Count']
 
@@ -616,45 +1505,73 @@ def topics_report(df, output_dir):
     df_counts.to_csv(os.path.join(output_dir, 'topics_report.csv'), index=False)
 
 
-def topics_sort(df, input_dir, output_dir):
+def topics_sort(df, input_dir, output_dir, inventory=None):
     """Sort copy of incoming and outgoing correspondence into folders by topic
     Letters to and from constituents with the same topic are in the same topic folder, but different subfolders.
-    Letters with multiple topics are in multiple topic folders."""
+    Letters with multiple topics are in multiple topic folders.
+    Uses the inventory of the documents folder from documents_inventory(), if provided, instead of scanning it"""
 
     # New version of df with multi-topic cells split up.
     df_topics = topics_sort_df(df)
 
-    # Sorts a copy of all correspondence by topic.
-    os.mkdir(os.path.join(output_dir, 'correspondence_by_topic'))
-    topic_list = np.unique(df_topics[['in_topic_split', 'out_topic_split']].values).tolist()
+    # Makes the folder for all topics, or prepares to resume a sort that was interrupted.
+    journal_path = topics_sort_folder(output_dir)
+
+    # Gets the positions of the rows for each topic in either topic column, sorted alphabetically by topic.
+    topic_rows = topics_sort_index(df_topics, ['in_topic_split', 'out_topic_split'])
+    topic_list = sorted(topic_rows)
+
+    # Updates the path of every unique document once, to use for every topic.
+    path_map = update_path_map(pd.concat([df_topics['in_document_name_split'], df_topics['out_document_name_split']]),
+                               input_dir)
+
+    # Makes the folders for each topic and plans where every document will be copied for every topic,
+    # so all the copies can be made at once with multiple threads.
+    copy_list = []
     for topic in topic_list:
 
         # Skip blanks, which are a string because of topics_sort_df converting the column type to split on delimiters.
         if topic == 'nan':
             continue
 
-        # Makes folder and metadata df for this topic.
-        # The metadata is updated with if the documents are found and eventually saved to the topic folder.
         # The topic has to be normalized to be used for a folder and file name.
         topic_norm = topics_sort_normalize(topic)
         topic_path = os.path.join(output_dir, 'correspondence_by_topic', topic_norm)
         if not os.path.exists(topic_path):
             os.mkdir(topic_path)
-        df_topic = df_topics[(df_topics['in_topic_split'] == topic) | (df_topics['out_topic_split'] == topic)].copy()
+        df_topic = df_topics.iloc[topic_rows[topic]]
+
+        # Plans correspondence from constituents ("in" letters) and to constituents ("out" letters).
+        for column, folder in (('in_document_name_split', 'from_constituents'),
+                               ('out_document_name_split', 'to_constituents')):
+            folder_path = os.path.join(topic_path, folder)
+            if not os.path.exists(folder_path):
+                os.mkdir(folder_path)
+            doc_plan = topics_sort_plan(df_topic, column, input_dir, folder_path, path_map)
+            copy_list.extend([(doc_path, doc_new_path) for doc, doc_path, doc_new_path in doc_plan])
+
+    # Copies all the documents, using the inventory to skip documents that are not in the export.
+    if inventory is None:
+        inventory, empty_list = documents_inventory(os.path.join(input_dir, 'documents'))
+    copy_results = topics_sort_copy(copy_list, journal_path, inventory)
 
-        # Sorts correspondence from constituents ("in" letters).
-        # Updates df_topic with a column for if the letter was in the export and makes a log of missing letters.
-        from_path = os.path.join(topic_path, 'from_constituents')
-        if not os.path.exists(from_path):
-            os.mkdir(from_path)
-        df_topic = topics_sort_files(df_topic, 'in_document_name_split', input_dir, output_dir, from_path)
+    for topic in topic_list:
+        if topic == 'nan':
+            continue
 
-        # Sorts correspondence to constituents ("out" letters).
-        # Updates df_topic with a column for if the letter was in the export and makes a log of missing letters.
+        # Makes metadata df for this topic.
+        # The metadata is updated with if the documents are found and eventually saved to the topic folder.
+        topic_norm = topics_sort_normalize(topic)
+        topic_path = os.path.join(output_dir, 'correspondence_by_topic', topic_norm)
+        df_topic = df_topics.iloc[topic_rows[topic]].copy()
+
+        # Updates df_topic with columns for if the letters were in the export and makes a log of missing letters.
+        from_path = os.path.join(topic_path, 'from_constituents')
+        df_topic = topics_sort_files(df_topic, 'in_document_name_split', input_dir, output_dir, from_path,
+                                     copy_results, path_map)
         to_path = os.path.join(topic_path, 'to_constituents')
-        if not os.path.exists(to_path):
-            os.mkdir(to_path)
-        df_topic = topics_sort_files(df_topic, 'out_document_name_split', input_dir, output_dir, to_path)
+        df_topic = topics_sort_files(df_topic, 'out_document_name_split', input_dir, output_dir, to_path,
+                                     copy_results, path_map)
 
         # Deletes empty folders, which happens if all documents (in and/or out) for a topic are only in the metadata.
         topics_sort_delete_empty(topic_path)
@@ -663,6 +1580,86 @@ def topics_sort(df, input_dir, output_dir):
         if os.path.exists(topic_path):
             topics_sort_save_metadata(df_topic, topic_path, topic_norm)
 
+    # Deletes the journal, since the sort is complete and will not need to be resumed.
+    os.remove(journal_path)
+
+
+def topics_sort_copy(copy_list, journal_path=None, inventory=None):
+    """Copy documents with multiple threads and return a dict with each new path and if the document was found
+    copy_list has a tuple with the current path and new path for each copy.
+    If the inventory of the documents folder from documents_inventory() is provided,
+    it is used to find each document instead of checking the folder again.
+    If a journal is used, copies already made by an interrupted run (listed in the journal) are not made again,
+    and each new copy is added to the journal.
+    The number of threads is set with the environment variable CONSTITUENT_MAIL_COPY_WORKERS (default 8),
+    and if documents are copied or linked is set with CONSTITUENT_MAIL_LINK_MODE (default copy)."""
+
+    # Validates the link mode before making any copies.
+    link_mode = os.environ.get('CONSTITUENT_MAIL_LINK_MODE', 'copy')
+    if link_mode not in ('copy', 'hardlink', 'reflink', 'symlink'):
+        raise ValueError(f"CONSTITUENT_MAIL_LINK_MODE '{link_mode}' is not copy, hardlink, reflink, or symlink")
+
+    # Reads the new paths of the copies already made, if any.
+    journal_done = set()
+    if journal_path and os.path.exists(journal_path):
+        with open(journal_path, encoding='utf-8') as journal:
+            journal_done = set(journal.read().splitlines())
+
+    # Removes duplicate copies (topics that normalize to the same folder) and copies already made.
+    copy_results = {}
+    to_copy = []
+    for doc_path, doc_new_path in dict.fromkeys(copy_list):
+        if doc_new_path in journal_done and os.path.exists(doc_new_path):
+            copy_results[doc_new_path] = True
+        else:
+            to_copy.append((doc_path, doc_new_path))
+
+    # Makes the copies with multiple threads, since most of the time is waiting for storage.
+    # Only this thread writes to the journal, after each copy is complete.
+    workers = int(os.environ.get('CONSTITUENT_MAIL_COPY_WORKERS', 8))
+    journal = open(journal_path, 'a', encoding='utf-8') if journal_path else None
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(topics_sort_copy_file, doc_path, doc_new_path, link_mode, inventory):
+                       doc_new_path for doc_path, doc_new_path in to_copy}
+            for future in as_completed(futures):
+                doc_new_path = futures[future]
+                copy_results[doc_new_path] = future.result()
+                if journal and copy_results[doc_new_path]:
+                    journal.write(doc_new_path + '\n')
+                    journal.flush()
+    finally:
+        if journal:
+            journal.close()
+
+    return copy_results
+
+
+def topics_sort_copy_file(doc_path, doc_new_path, link_mode='copy', inventory=None):
+    """Copy or link a document, making its folder if needed,
+    and return True if it was copied or False if it was not found
+    If the inventory of the documents folder from documents_inventory() is provided,
+    it is used to find the document instead of checking the folder again."""
+
+    # It is common to have docs in the metadata but not in the input directory.
+    # The folder is only made if the document is found, so there are no empty folders for missing documents.
+    if inventory is not None:
+        if documents_inventory_key(doc_path) not in inventory:
+            return False
+    elif not os.path.exists(doc_path):
+        return False
+    os.makedirs(os.path.dirname(doc_new_path), exist_ok=True)
+
+    # Deletes a partial copy or link from an interrupted run, which cannot be linked over
+    # and would change the document in the export if it is a symlink that is copied over.
+    if os.path.lexists(doc_new_path):
+        os.remove(doc_new_path)
+
+    # Links the document if that mode is used and possible, and otherwise copies it.
+    if link_mode == 'copy' or not topics_sort_link(doc_path, doc_new_path, link_mode):
+        shutil.copy2(doc_path, doc_new_path)
+    return True
+
 
 def topics_sort_delete_empty(topic_path):
     """Delete the from_constituents, to_constituents, and/or topic folder if empty"""
@@ -706,52 +1703,92 @@ def topics_sort_df(df):
     return df
 
 
-def topics_sort_files(df, column, input_dir, output_dir, folder_path):
-    """Copy all documents to a topic folder, update df for if each document was found and log if missing"""
+def topics_sort_files(df, column, input_dir, output_dir, folder_path, copy_results=None, path_map=None):
+    """Copy all documents to a topic folder, update df for if each document was found and log if missing
+    If copy_results (from topics_sort_copy) is provided, the documents were already copied by topics_sort()
+    If path_map (from update_path_map) is provided, it is used instead of updating the document paths again"""
 
-    # Gets a list of unique documents from the specified document column (in or out), excluding blanks, to copy.
-    doc_list = df[column].dropna().unique().tolist()
-    for doc in doc_list:
+    # Gets the current path and the path in the topic folder for each unique document in the column (in or out).
+    doc_plan = topics_sort_plan(df, column, input_dir, folder_path, path_map)
 
-        # Gets the path for the current doc location by updating the path from the metadata.
-        doc_path = update_path(doc, input_dir)
+    # Copies the docs to the to_constituents or from_constituents folder, if not already copied.
+    if copy_results is None:
+        copy_results = topics_sort_copy([(doc_path, doc_new_path) for doc, doc_path, doc_new_path in doc_plan])
 
-        # Skip any path that doesn't match a known pattern (error_new) or if the doc is a directory rather than a file.
-        # error_new happens when there is data in the document column that cannot be mapped to a path in the export.
-        # Cannot use os.path.isdir() to test for directory because the folder may not exist.
-        if doc_path == 'error_new' or '.' not in doc_path:
-            continue
+    # Updates the df with if each doc was found, for all rows at once.
+    # Rows with a blank or skipped doc are not in doc_found and keep the default value (TBD).
+    doc_found = {doc: copy_results[doc_new_path] for doc, doc_path, doc_new_path in doc_plan}
+    found = df[column].map(doc_found)
+    df[column.replace('_split', '_present')] = found.where(found.notna(), df[column.replace('_split', '_present')])
 
-        # Gets the path for the subfolder for where the doc will be saved,
-        # which replicates all original subfolders within the to_constituents or from_constituents folder,
-        # and makes the folder if it doesn't exist.
-        doc_relative_path = Path(doc_path).relative_to(os.path.join(input_dir, 'documents'))
-        subfolder_path = os.path.join(folder_path, os.path.dirname(doc_relative_path))
-        subfolder_new = False
-        if not os.path.exists(subfolder_path):
-            subfolder_new = True
-            os.makedirs(subfolder_path)
-
-        # Copies the doc to the to_constituents or from_constituents folder and updates the df with if it was found.
-        # If the doc is not in the expected location, logs it instead.
-        # It is common to have docs in the metadata but not in the input directory.
-        doc_name = doc.split('\\')[-1]
-        doc_new_path = os.path.join(subfolder_path, doc_name)
-        try:
-            shutil.copy2(doc_path, doc_new_path)
-            df.loc[df[column] == doc, column.replace('_split', '_present')] = True
-        except FileNotFoundError:
-            df.loc[df[column] == doc, column.replace('_split', '_present')] = False
-            with open(os.path.join(output_dir, 'topics_sort_file_not_found.csv'), 'a', newline='') as log:
-                log_writer = csv.writer(log)
-                topic = folder_path.split('\\')[-2]
-                log_writer.writerow([topic, doc])
-            if subfolder_new:
-                os.rmdir(subfolder_path)
+    # If the doc is not in the expected location, logs it.
+    missing_list = [doc for doc, is_found in doc_found.items() if not is_found]
+    if missing_list:
+        with open(os.path.join(output_dir, 'topics_sort_file_not_found.csv'), 'a', newline='') as log:
+            log_writer = csv.writer(log)
+            topic = folder_path.split('\\')[-2]
+            log_writer.writerows([[topic, doc] for doc in missing_list])
 
     return df
 
 
+def topics_sort_folder(output_dir):
+    """Make the folder for sorting by topic and the journal of copies made, and return the journal path
+    If the journal already exists, a sort was interrupted and is resumed, so the folder is kept,
+    but the log and topic metadata CSVs are deleted since they are added to and would have duplicates."""
+    by_topic_path = os.path.join(output_dir, 'correspondence_by_topic')
+    journal_path = os.path.join(output_dir, 'topics_sort_journal.txt')
+    if os.path.exists(journal_path):
+        log_path = os.path.join(output_dir, 'topics_sort_file_not_found.csv')
+        if os.path.exists(log_path):
+            os.remove(log_path)
+        for topic_norm in os.listdir(by_topic_path):
+            metadata_path = os.path.join(by_topic_path, topic_norm, f'{topic_norm}_metadata.csv')
+            if os.path.exists(metadata_path):
+                os.remove(metadata_path)
+    else:
+        os.mkdir(by_topic_path)
+        open(journal_path, 'w').close()
+    return journal_path
+
+
+def topics_sort_index(df, columns):
+    """Return a dict with each topic in the columns and the positions of the rows with that topic in any column,
+    so the rows for each topic can be selected without comparing every row to every topic"""
+    topic_rows = {}
+    for column in columns:
+        for topic, positions in df.groupby(column, sort=False).indices.items():
+            if topic in topic_rows:
+                topic_rows[topic] = np.union1d(topic_rows[topic], positions)
+            else:
+                topic_rows[topic] = positions
+    return topic_rows
+
+
+def topics_sort_link(doc_path, doc_new_path, link_mode):
+    """Make a hardlink, reflink (copy-on-write clone), or symlink to the document and return if it was made
+    It is not made if the document and new path are on different volumes or the file system does not support it"""
+    try:
+        if os.stat(doc_path).st_dev != os.stat(os.path.dirname(doc_new_path)).st_dev:
+            return False
+        if link_mode == 'hardlink':
+            os.link(doc_path, doc_new_path)
+        elif link_mode == 'symlink':
+            os.symlink(os.path.abspath(doc_path), doc_new_path)
+        else:
+            # Reflinks are made with the Linux FICLONE ioctl, which Btrfs, XFS, and some other file systems support.
+            # The modification time and other metadata are copied afterwards, to match shutil.copy2().
+            import fcntl
+            with open(doc_path, 'rb') as doc, open(doc_new_path, 'wb') as doc_new:
+                fcntl.ioctl(doc_new.fileno(), 0x40049409, doc.fileno())
+            shutil.copystat(doc_path, doc_new_path)
+    except (ImportError, OSError):
+        if link_mode == 'reflink' and os.path.exists(doc_new_path):
+            os.remove(doc_new_path)
+        return False
+    return True
+
+
 def topics_sort_normalize(topic):
     """Make a version of the topic that can be used for folder and file naming"""
 
@@ -765,6 +1802,36 @@ def topics_sort_normalize(topic):
     return topic
 
 
+def topics_sort_plan(df, column, input_dir, folder_path, path_map=None):
+    """Return a list with each unique document in the column, its current path, and its path in the topic folder
+    If path_map (from update_path_map) is provided, it is used instead of updating the document paths again"""
+
+    # Gets a list of unique documents from the specified document column (in or out), excluding blanks, to copy.
+    doc_plan = []
+    doc_list = df[column].dropna().unique().tolist()
+    if path_map is None:
+        path_map = update_path_map(doc_list, input_dir)
+    for doc in doc_list:
+
+        # Gets the path for the current doc location by updating the path from the metadata.
+        doc_path = path_map[doc]
+
+        # Skip any path that doesn't match a known pattern (error_new) or if the doc is a directory rather than a file.
+        # error_new happens when there is data in the document column that cannot be mapped to a path in the export.
+        # Cannot use os.path.isdir() to test for directory because the folder may not exist.
+        if doc_path == 'error_new' or '.' not in doc_path:
+            continue
+
+        # Gets the path for where the doc will be saved,
+        # which replicates all original subfolders within the to_constituents or from_constituents folder.
+        doc_relative_path = Path(doc_path).relative_to(os.path.join(input_dir, 'documents'))
+        doc_name = doc.split('\\')[-1]
+        doc_new_path = os.path.join(folder_path, os.path.dirname(doc_relative_path), doc_name)
+        doc_plan.append((doc, doc_path, doc_new_path))
+
+    return doc_plan
+
+
 def topics_sort_save_metadata(df, topic_path, topic_norm):
     """Remove rows with no file found, temporary columns, update temporary column values, and save to a CSV"""
 
@@ -820,6 +1887,25 @@ def update_path(md_path, input_dir):
     return updated_path
 
 
+def update_path_map(md_paths, input_dir):
+    """Return a dict with each unique path found in the metadata and the path from update_path(),
+    updating all the paths at once with pandas string methods instead of one path at a time"""
+
+    # Each unique path is only updated once, even if it is in the metadata many times.
+    md_paths = pd.Series(pd.Series(md_paths, dtype=object).dropna().unique(), dtype=object)
+
+    # Same patterns as update_path(), which are checked in the same order.
+    conditions = [md_paths.str.startswith('..', na=False),
+                  md_paths.str.contains('\\dos\\public\\', regex=False, na=False),
+                  md_paths.str.startswith('e:\\emailobj\\', na=False)]
+    updated_paths = [md_paths.str.replace('..', input_dir, regex=False).str.replace('\\BlobExport', '', regex=False),
+                     input_dir + md_paths.str.replace('\\\\[a-z]+-[a-z]+\\\\dos\\\\public', 'documents', regex=True),
+                     md_paths.str.replace('e:', os.path.join(input_dir, 'documents'), regex=False)]
+    updated_paths = np.select(conditions, updated_paths, default='error_new')
+
+    return dict(zip(md_paths, updated_paths))
+
+
 if __name__ == '__main__':
 
     # Validates the script argument values and calculates the path to the metadata file.
@@ -833,18 +1919,40 @@ if __name__ == '__main__':
     # Calculates parent folder of the input_directory, which is where script outputs are saved.
     output_directory = os.path.dirname(input_directory)
 
-    # Reads the metadata file into a pandas dataframe.
-    md_df = read_metadata(csv_path)
+    # Optional environment variable to read the metadata file in chunks with this many rows in accession mode,
+    # for exports too large to read into memory at once.
+    chunk_rows = os.environ.get('CONSTITUENT_MAIL_CHUNK_ROWS')
+    if chunk_rows is not None and not (chunk_rows.isdigit() and int(chunk_rows) > 0):
+        print(f"CONSTITUENT_MAIL_CHUNK_ROWS '{chunk_rows}' is not a positive whole number")
+        sys.exit(1)
 
-    # For accession, generates reports about the usability of the export and what might be deleted for appraisal.
+    # Reads the metadata file into a pandas dataframe, unless it will be read in chunks.
+    # If the optional metadata cache is used, reads the df saved by an earlier run instead if the file is unchanged.
+    if not (script_mode == 'accession' and chunk_rows):
+        cache_key = metadata_cache_key([csv_path])
+        md_df = read_metadata_cache(cache_key, output_directory)
+        if md_df is None:
+            md_df = read_metadata(csv_path)
+            save_metadata_cache(md_df, cache_key, output_directory)
+
+    # For accession, generates reports about the usability of the export and what might be deleted for appraisal,
+    # and plans the deletion for appraisal mode if the environment variable CONSTITUENT_MAIL_DELETE_PLAN is 1.
     # The export is not changed in this mode.
     if script_mode == 'accession':
         print("\nThe script is running in accession mode.")
         print("It will produce usability and appraisal reports and not change the export.")
-        appraisal_df = find_appraisal_rows(md_df, output_directory)
-        check_metadata_usability(md_df, output_directory)
-        check_letter_matching(md_df, output_directory, input_directory)
-        topics_report(md_df, output_directory)
+        if chunk_rows:
+            appraisal_df = accession_chunks(csv_path, input_directory, output_directory, int(chunk_rows))
+            if os.environ.get('CONSTITUENT_MAIL_DELETE_PLAN') == '1':
+                delete_appraisal_plan(input_directory, output_directory, appraisal_df)
+        else:
+            appraisal_df = find_appraisal_rows(md_df, output_directory)
+            check_metadata_usability(md_df, output_directory)
+            documents, empty_list = documents_inventory(os.path.join(input_directory, 'documents'))
+            check_letter_matching(md_df, output_directory, input_directory, documents)
+            topics_report(md_df, output_directory)
+            if os.environ.get('CONSTITUENT_MAIL_DELETE_PLAN') == '1':
+                delete_appraisal_plan(input_directory, output_directory, appraisal_df, documents, empty_list)
 
     # For appraisal, deletes letters due to appraisal and makes a report of letters that might be restricted.
     # Restricted letters would not be included in the access copy.
@@ -863,11 +1971,13 @@ if __name__ == '__main__':
 
     # For access, removes rows for appraisal and restriction and columns with PII from the metadata,
     # makes a copy of the data split by calendar year, and makes a copy of the letters organized by topic.
+    # The metadata cache (if any) is deleted, since it has PII and access is the last mode run.
     elif script_mode == 'access':
         print("\nThe script is running in access mode.")
         print("It will remove rows for deleted or restricted letters and columns with PII, "
               "make copies of the metadata split by calendar year, "
               "and make a copy of the letters to and from constituents organized by topic")
+        delete_metadata_cache(output_directory)
         try:
             appraisal_df = read_csv(os.path.join(output_directory, 'appraisal_delete_log.csv'))
         except FileNotFoundError:
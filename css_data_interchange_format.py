@@ -13,13 +13,13 @@ For appraisal and access, appraisal_delete_log.csv (made by accession mode) must
 For access mode, review_restrictions.csv (made by appraisal mode) must be in the output directory.
 This allows the archivist to review and edit these documents without needing to update the script.
 """
+from concurrent.futures import ThreadPoolExecutor
 import csv
 from datetime import date
 from functools import reduce
 import os
 from pathlib import Path
 import pandas as pd
-import shutil
 import sys
 import css_archiving_format as css_arch
 
@@ -71,22 +71,21 @@ def check_arguments(arg_list):
     return input_dir, md_paths, mode, errors
 
 
-def check_letter_matching(df, output_dir, input_dir):
+def check_letter_matching(df, output_dir, input_dir, inventory=None):
     """Compare the files in the metadata to the files in the export,
-    reformatting the metadata paths and making all characters lowercase, so they can match"""
+    reformatting the metadata paths and making all characters lowercase, so they can match
+    Uses the inventory of the documents folder from css_arch.documents_inventory(), if provided, instead of scanning"""
 
-    # Makes a list of paths for the letters in the documents folder within the input directory.
+    # Makes a list of lowercase paths for the letters in the documents folder within the input directory.
     # This way, the metadata files are not counted as missing.
-    input_dir_paths = []
-    for root, dirs, files in os.walk(os.path.join(input_dir, 'documents')):
-        for file in files:
-            file_path = os.path.join(root, file)
-            file_path = file_path.lower()
-            input_dir_paths.append(file_path)
+    if inventory is None:
+        inventory, empty_list = css_arch.documents_inventory(os.path.join(input_dir, 'documents'))
+    input_dir_paths = [file_info[1] for file_info in inventory.values()]
 
     # Makes a list of paths in the metadata, updating the path to match how the directory is structured in the export.
     doc_df = df.dropna(subset=['communication_document_name']).copy()
-    doc_df['communication_document_name'] = doc_df['communication_document_name'].apply(update_path, input_dir=input_dir)
+    path_map = update_path_map(doc_df['communication_document_name'], input_dir)
+    doc_df['communication_document_name'] = doc_df['communication_document_name'].map(path_map)
     doc_df['communication_document_name'] = doc_df['communication_document_name'].str.lower()
     metadata_paths = doc_df['communication_document_name'].tolist()
 
@@ -200,30 +199,63 @@ def check_metadata_usability(df, output_dir):
     columns_df.to_csv(os.path.join(output_dir, 'usability_report_metadata.csv'), index=True, index_label='Column_Name')
 
 
-def delete_appraisal_letters(input_dir, output_dir, df_appraisal):
+def delete_appraisal_letters(input_dir, output_dir, df_appraisal, inventory=None):
     """Deletes letters received from constituents and individual letters sent back by the office
-    because they are one of the types of letters not retained for appraisal reasons"""
+    because they are one of the types of letters not retained for appraisal reasons
+    Uses the inventory of the documents folder from css_arch.documents_inventory(), if provided, instead of scanning
+    Uses the plan made by delete_appraisal_plan() in accession mode, if there is one,
+    so letters that have not changed since the plan was made are not hashed again"""
 
-    # Creates a file deletion log, with a header row.
+    # Makes a list of the letters to delete and the note for the log.
+    delete_list = delete_appraisal_list(input_dir, df_appraisal, inventory)
+
+    # Deletes the letters and makes the file deletion log.
     log_path = os.path.join(output_dir, f"file_deletion_log_{date.today().strftime('%Y-%m-%d')}.csv")
-    css_arch.file_deletion_log(log_path, None, 'header')
+    plan = css_arch.delete_letters_plan_read(os.path.join(output_dir, 'appraisal_delete_plan.csv'))
+    css_arch.delete_letters(log_path, delete_list, plan)
+
+
+def delete_appraisal_list(input_dir, df_appraisal, inventory=None):
+    """Return a list with the path and the note for the file deletion log for each letter to delete for appraisal,
+    in the order for the log, including letters that cannot be deleted
+    Uses the inventory of the documents folder from css_arch.documents_inventory(), if provided, instead of scanning.
+    Letters in the list are removed from the inventory."""
 
-    # For every row in df_appraisal, deletes any letter in the communication_document_name column except form letters.
-    # The letter path has to be reformatted to match the actual export, and an error is logged if it is a new pattern.
-    # Form letters are retained.
+    # Gets the files in the export, to check if each letter exists without another request to the file system.
+    if inventory is None:
+        inventory, empty_list = css_arch.documents_inventory(os.path.join(input_dir, 'documents'))
+
+    # The letter path has to be reformatted to match the actual export.
+    # The paths are reformatted all at once, so each unique path is only reformatted once.
     df_appraisal = df_appraisal.astype(str)
+    path_map = update_path_map(df_appraisal['communication_document_name'], input_dir)
+
+    # Makes a list of the letters in df_appraisal to delete if they are in the export and the note for the log,
+    # in the order they will be in the log. This is any letter in the communication_document_name column
+    # except form letters, which are retained. An error is logged if the letter path is a new pattern.
+    delete_list = []
     for row in df_appraisal.itertuples():
         name = row.communication_document_name
         if name != '' and name != 'nan' and 'formletters' not in name:
-            file_path = update_path(name, input_dir)
+            file_path = path_map[name]
             if file_path == 'error_new':
-                css_arch.file_deletion_log(log_path, name, 'Cannot determine file path: new path pattern in metadata')
+                delete_list.append((name, 'Cannot determine file path: new path pattern in metadata'))
+            elif inventory.pop(css_arch.documents_inventory_key(file_path), None):
+                delete_list.append((file_path, row.Appraisal_Category))
             else:
-                try:
-                    css_arch.file_deletion_log(log_path, file_path, row.Appraisal_Category)
-                    os.remove(file_path)
-                except FileNotFoundError:
-                    css_arch.file_deletion_log(log_path, file_path, 'Cannot delete: FileNotFoundError')
+                delete_list.append((file_path, 'Cannot delete: FileNotFoundError'))
+
+    return delete_list
+
+
+def delete_appraisal_plan(input_dir, output_dir, df_appraisal, inventory=None):
+    """Make a plan for deleting letters in appraisal mode (appraisal_delete_plan.csv) with the size,
+    modification time, and MD5 of each letter to delete from df_appraisal, without deleting anything,
+    so appraisal mode only has to check the letters have not changed before deleting them
+    Uses the inventory of the documents folder from css_arch.documents_inventory(), if provided, instead of scanning.
+    Letters in the plan are removed from the inventory."""
+    delete_list = delete_appraisal_list(input_dir, df_appraisal, inventory)
+    css_arch.delete_letters_plan(os.path.join(output_dir, 'appraisal_delete_plan.csv'), delete_list)
 
 
 def df_search(df, keywords_list, category):
@@ -235,7 +267,7 @@ def df_search(df, keywords_list, category):
     # Makes a dataframe with any row containing one of the keywords in at lease one of the columns searched.
     # Keyword matches are case-insensitive and will not match blanks.
     keywords = '|'.join(keywords_list)
-    match = df[columns_list].astype(str).agg('|'.join, axis=1).str.contains(keywords, case=False, na=False)
+    match = css_arch.search_text(df, columns_list).str.contains(keywords, case=False, na=False)
     df_match = df[match].copy()
 
     # Adds a column with the appraisal category.
@@ -274,11 +306,11 @@ def find_academy_rows(df):
     and return as two dfs, one with more certainty (df_academy) and one with less (df_academy_check)"""
 
     # Makes df with more certainty.
-    keywords_list = ['academy']
+    keywords_list = css_arch.appraisal_keywords()['Academy_Application']['keywords']
     df_academy, df_unmatched = df_search(df, keywords_list, 'Academy_Application')
 
     # Makes df with less certainty, only searching rows that are not in df_academy, to find for new patterns.
-    check_list = ['acad']
+    check_list = css_arch.appraisal_keywords()['Academy_Application']['check']
     df_academy_check, df_unmatched = df_search(df_unmatched, check_list, 'Academy_Application')
 
     return df_academy, df_academy_check
@@ -288,26 +320,17 @@ def find_appraisal_rows(df, output_dir):
     """Find metadata rows with topics or text that indicate they are different categories for appraisal,
      return as a df and log results"""
 
-    # Call the functions for each appraisal category.
-    df_academy, df_academy_check = find_academy_rows(df)
-    df_casework, df_casework_check = find_casework_rows(df)
-    df_job, df_job_check = find_job_rows(df)
-    df_recommendation, df_recommendation_check = find_recommendation_rows(df)
-
-    # Makes a log with rows to check to refine appraisal decisions. These were not marked for appraisal
-    # but have a simple keyword (e.g., case) that could be new indicators for appraisal.
-    # Rows that fit more than one appraisal category are repeated.
-    df_check = pd.concat([df_academy_check, df_casework_check, df_job_check, df_recommendation_check],
-                         axis=0, ignore_index=True)
-    df_check.to_csv(os.path.join(output_dir, 'appraisal_check_log.csv'), index=False)
-
-    # Makes a single dataframe with all rows that indicate appraisal
-    # and also saves to a log for review for any that are not correct identifications.
-    # Rows that fit more than one appraisal category are combined.
-    df_appraisal = pd.concat([df_academy, df_casework, df_job, df_recommendation], axis=0, ignore_index=True)
-    df_appraisal = df_appraisal.astype(str)
-    df_appraisal = df_appraisal.groupby([col for col in df_appraisal.columns if col != 'Appraisal_Category'])['Appraisal_Category'].apply(lambda x: '|'.join(map(str, x))).reset_index()
-    df_appraisal.to_csv(os.path.join(output_dir, 'appraisal_delete_log.csv'), index=False)
+    # Searches every row once for all the appraisal categories,
+    # using the same columns as df_search() and df_search_exact().
+    columns_list = ['communication_document_name', 'file_name', 'group_name', 'text']
+    df_tiers = css_arch.appraisal_search(df, columns_list, columns_list)
+
+    # Group names that start with "case" are also casework with more certainty.
+    group = df['group_name'].str.lower().str.startswith('case', na=False).to_numpy()
+    df_tiers.loc[group, 'Casework'] = 'sure'
+
+    # Makes the logs of rows to check and rows that indicate appraisal.
+    df_appraisal = css_arch.appraisal_logs(df, df_tiers, output_dir)
 
     # Removes the column 'text', which is the only column currently likely to contain PII
     # that is needed for more comprehensive appraisal.
@@ -325,18 +348,16 @@ def find_casework_rows(df):
     df_group_startswith['Appraisal_Category'] = 'Casework'
     df_unmatched = df[~group]
 
-    exact_list = ['CASE', 'Case', 'case', 'CASE!', 'Case!', 'case!']
+    exact_list = css_arch.appraisal_keywords()['Casework']['exact']
     df_casework_exact, df_unmatched = df_search_exact(df_unmatched, exact_list, 'Casework')
 
-    keywords_list = ['added to case', 'already open', 'case closed', 'case file', 'case for', 'case has', 'case issue',
-                    'case open', 'case work', 'casework', 'closed case', 'forwarded to me', 'initialssacase',
-                    'open case', 'open sixth district cases', 'prison case', 'started case']
+    keywords_list = css_arch.appraisal_keywords()['Casework']['keywords']
     df_casework_partial, df_unmatched = df_search(df_unmatched, keywords_list, 'Casework')
 
     df_casework = pd.concat([df_group_startswith, df_casework_exact, df_casework_partial], ignore_index=True)
 
     # Makes df with less certainty, only searching rows that are not in df_casework, to look for new keywords.
-    check_list = ['case', 'issue']
+    check_list = css_arch.appraisal_keywords()['Casework']['check']
     df_casework_check, df_unmatched = df_search(df_unmatched, check_list, 'Casework')
 
     return df_casework, df_casework_check
@@ -347,11 +368,11 @@ def find_job_rows(df):
     and return as a two dfs, one with more certain (df_job) and one with less (df_job_check)"""
 
     # Makes df with more certainty.
-    keywords_list = ['intern ', 'internship', 'interview', 'job app', 'job request', 'job.doc', 'jobapp', 'resume']
+    keywords_list = css_arch.appraisal_keywords()['Job_Application']['keywords']
     df_job, df_unmatched = df_search(df, keywords_list, 'Job_Application')
 
     # Makes df with less certainty, only searching rows that are not in df_job, to look for new keywords.
-    check_list = ['application', 'hire', 'intern', 'job']
+    check_list = css_arch.appraisal_keywords()['Job_Application']['check']
     df_job_check, df_unmatched = df_search(df_unmatched, check_list, 'Job_Application')
 
     return df_job, df_job_check
@@ -362,11 +383,11 @@ def find_recommendation_rows(df):
     and return as two dfs, one with more certainty (df_recommendation) and one with less (df_recommendation_check)"""
 
     # Makes df with more certainty.
-    keywords_list = 'intern rec', 'page rec', 'rec for', 'recommendation'
+    keywords_list = css_arch.appraisal_keywords()['Recommendation']['keywords']
     df_rec, df_unmatched = df_search(df, keywords_list, 'Recommendation')
 
     # Makes df with less certainty, only searching rows that are not in df_recommendation, to look for new keywords.
-    check_list = ['rec']
+    check_list = css_arch.appraisal_keywords()['Recommendation']['check']
     df_rec_check, df_unmatched = df_search(df_unmatched, check_list, 'Recommendation')
 
     return df_rec, df_rec_check
@@ -404,15 +425,14 @@ def form_letter_metadata_read(table_id, input_dir):
 
     table_path = os.path.join(input_dir, f'out_{table_id}.dat')
     try:
-        df = pd.read_csv(table_path, delimiter='\t', dtype=str, on_bad_lines='warn', names=columns_dict[table_id])
+        df = css_arch.read_delimited(table_path, '\t', columns_dict[table_id])
     except FileNotFoundError:
         print(f"\n Could not locate file for table {table_id} in {input_dir}")
         return None
     except UnicodeDecodeError:
         print(f"\nUnicodeDecodeError when trying to read the file for table {table_id}.")
         print("The file will be read by ignoring encoding errors, skipping characters that cause an error.\n")
-        df = pd.read_csv(table_path, delimiter='\t', dtype=str, encoding_errors='ignore', on_bad_lines='warn',
-                         names=columns_dict[table_id])
+        df = css_arch.read_delimited(table_path, '\t', columns_dict[table_id], encoding_errors='ignore')
 
     # Remove the record_type column, which every dataframe has, because it isn't helpful
     # and prevents a more efficient way to merge all 5 at once.
@@ -440,49 +460,18 @@ def read_metadata(paths):
     columns_2d = ['record_type', 'person_id', 'communication_id', '2d_sequence_number',
                   'text', 'date', 'time', 'user_id']
 
-    try:
-        df_1b = pd.read_csv(paths['1B'], delimiter='\t', dtype=str, on_bad_lines='warn', names=columns_1b)
-    except UnicodeDecodeError:
-        print("\nUnicodeDecodeError when trying to read the metadata file 1B.")
-        print("The file will be read by ignoring encoding errors, skipping characters that cause an error.\n")
-        df_1b = pd.read_csv(paths['1B'], delimiter='\t', dtype=str, encoding_errors='ignore', on_bad_lines='warn',
-                            names=columns_1b)
-
-    try:
-        df_2a = pd.read_csv(paths['2A'], delimiter='\t', dtype=str, on_bad_lines='warn', names=columns_2a)
-    except UnicodeDecodeError:
-        print("\nUnicodeDecodeError when trying to read the metadata file 2A.")
-        print("The file will be read by ignoring encoding errors, skipping characters that cause an error.\n")
-        df_2a = pd.read_csv(paths['2A'], delimiter='\t', dtype=str, encoding_errors='ignore', on_bad_lines='warn',
-                            names=columns_2a)
-
-    try:
-        df_2c = pd.read_csv(paths['2C'], delimiter='\t', dtype=str, on_bad_lines='warn', names=columns_2c)
-    except UnicodeDecodeError:
-        print("\nUnicodeDecodeError when trying to read the metadata file 2C.")
-        print("The file will be read by ignoring encoding errors, skipping characters that cause an error.\n")
-        df_2c = pd.read_csv(paths['2C'], delimiter='\t', dtype=str, encoding_errors='ignore', on_bad_lines='warn',
-                            names=columns_2c)
-
-    try:
-        df_2d = pd.read_csv(paths['2D'], delimiter='\t', dtype=str, on_bad_lines='warn', names=columns_2d)
-    except UnicodeDecodeError:
-        print("\nUnicodeDecodeError when trying to read the metadata file 2D.")
-        print("The file will be read by ignoring encoding errors, skipping characters that cause an error.\n")
-        df_2d = pd.read_csv(paths['2D'], delimiter='\t', dtype=str, encoding_errors='ignore', on_bad_lines='warn',
-                            names=columns_2d)
-
-    # Removes unneeded columns from each dataframe, except for ID columns needed for merging.
-    # Otherwise, it would be too much data to merge.
-    df_1b = remove_pii(df_1b)
-    df_2a = remove_pii(df_2a)
-    df_2c = remove_pii(df_2c)
-
-    # Only using 2d for appraisal because of the free text field.
-    # Drop the rest of the columns now and text after appraisal rows are identified.
-    # Some columns overlap with columns kept in other tables, so not using remove_pii().
-    df_2d = df_2d.drop(['record_type', 'person_id', '2d_sequence_number', 'date', 'time', 'user_id'],
-                       axis=1, errors='ignore')
+    # Reads the files at the same time, since they are independent until they are merged,
+    # with only the columns that are needed from each file.
+    # The parser releases the GIL while reading, so threads can read files in parallel.
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        future_1b = executor.submit(read_metadata_table, '1B', paths['1B'], columns_1b)
+        future_2a = executor.submit(read_metadata_table, '2A', paths['2A'], columns_2a)
+        future_2c = executor.submit(read_metadata_table, '2C', paths['2C'], columns_2c)
+        future_2d = executor.submit(read_metadata_table, '2D', paths['2D'], columns_2d)
+    df_1b = future_1b.result()
+    df_2a = future_2a.result()
+    df_2c = future_2c.result()
+    df_2d = future_2d.result()
 
     # Combine the dataframes using ID columns. If the ID is not in 2A (which describes each letter)
     # it is not included in the merged dataframe, to reduce the number of very incomplete rows.
@@ -499,6 +488,30 @@ def read_metadata(paths):
     return df
 
 
+def read_metadata_table(table_id, path, columns):
+    """Read a single metadata file into a dataframe, adding column names, with only the columns that are needed"""
+
+    # Only reads the columns that are needed, so columns with PII are never in memory.
+    # These are the columns not removed by remove_pii(), except for ID columns needed for merging.
+    # Only using 2d for appraisal because of the free text field. The text is dropped after appraisal rows are identified.
+    # Some columns overlap with columns kept in other tables, so not using remove_pii().
+    if table_id == '2D':
+        usecols = ['communication_id', 'text']
+    else:
+        usecols = remove_pii(pd.DataFrame(columns=columns)).columns.tolist()
+
+    # Read into dataframe, with a warning if characters have to be skipped.
+    # The warning is printed at once, so it is not split by a warning from a file read at the same time.
+    try:
+        df = css_arch.read_delimited(path, '\t', columns, usecols=usecols)
+    except UnicodeDecodeError:
+        print(f"\nUnicodeDecodeError when trying to read the metadata file {table_id}.\n"
+              f"The file will be read by ignoring encoding errors, skipping characters that cause an error.\n")
+        df = css_arch.read_delimited(path, '\t', columns, encoding_errors='ignore', usecols=usecols)
+
+    return df
+
+
 def remove_pii(df):
     """Remove columns with personally identifiable information (name and address) if they are present"""
 
@@ -520,8 +533,7 @@ def remove_restricted_rows(df, df_restrict):
     """Remove metadata rows for restricted letters (in preservation but not access copy) and return the updated df"""
 
     # Makes an updated dataframe with just rows in df that are not in df_restrict.
-    df_merge = df.merge(df_restrict, how='left', indicator=True)
-    df_update = df_merge[df_merge['_merge'] == 'left_only'].drop(columns=['_merge'])
+    df_update = css_arch.remove_rows(df, df_restrict)
 
     return df_update
 
@@ -546,31 +558,17 @@ def split_year(df, output_dir):
     """Make one metadata CSV per calendar year for smaller amount of data to review"""
 
     # Makes a folder for all the CSVs.
+    # It already exists if the script is run again to resume a topic sort that was interrupted.
     year_dir = os.path.join(output_dir, 'correspondence_metadata_by_year')
-    os.mkdir(year_dir)
-
-    # Makes a column with the year, which uses each of the four date columns in order of priority and then "undated".
-    # If a column has date information, it is formatted YYYYMMDD.
-    df['use_in'] = pd.to_numeric(df['date_in'], errors='coerce').notna()
-    df['use_out'] = (df['use_in'] == False) & (pd.to_numeric(df['date_out'], errors='coerce').notna())
-    df['use_update'] = ((df['use_in'] == False) & (df['use_out'] == False) &
-                        (pd.to_numeric(df['update_date'], errors='coerce').notna()))
-    df['use_reminder'] = ((df['use_in'] == False) & (df['use_out'] == False) & (df['use_update'] == False) &
-                          (pd.to_numeric(df['reminder_date'], errors='coerce').notna()))
-    df['year'] = 'undated'
-    df.loc[df['use_in'] == True, 'year'] = df['date_in'].astype(str).str[:4]
-    df.loc[df['use_out'] == True, 'year'] = df['date_out'].astype(str).str[:4]
-    df.loc[df['use_update'] == True, 'year'] = df['update_date'].astype(str).str[:4]
-    df.loc[df['use_reminder'] == True, 'year'] = df['reminder_date'].astype(str).str[:4]
+    if not os.path.exists(year_dir):
+        os.mkdir(year_dir)
 
-    # Saves the rows for each year to a separate CSV.
-    # The columns used to calculate year are first removed, so the metadata CSVs only have the original columns.
-    for year, year_df in df.groupby('year'):
-        year_df = year_df.drop(['use_in', 'use_out', 'use_update', 'use_reminder', 'year'], axis=1)
-        year_df.to_csv(os.path.join(year_dir, f'{year}.csv'), index=False)
+    # Calculates the year of each row, which uses each of the four date columns in order of priority
+    # and then "undated". The year is not added to df, so the metadata CSVs only have the original columns.
+    years = css_arch.split_year_key(df, ['date_in', 'date_out', 'update_date', 'reminder_date'])
 
-    # Removes the year rows from the primary df, so it isn't present for the last step (sort by topic).
-    df.drop(['use_in', 'use_out', 'use_update', 'use_reminder', 'year'], axis=1, inplace=True)
+    # Saves the rows for each year to a separate CSV.
+    css_arch.split_year_save(df, years, year_dir)
 
 
 def topics_report(df, output_dir):
@@ -587,40 +585,61 @@ def topics_report(df, output_dir):
     topic_counts.to_csv(os.path.join(output_dir, 'topics_report.csv'), index=False)
 
 
-def topics_sort(df, input_dir, output_dir):
+def topics_sort(df, input_dir, output_dir, inventory=None):
     """Sort copy of incoming and outgoing correspondence into folders by topic
-    Letters to and from constituents with the same topic are in the same topic folder, but different subfolders."""
+    Letters to and from constituents with the same topic are in the same topic folder, but different subfolders.
+    Uses the inventory of the documents folder from css_arch.documents_inventory(), if provided, instead of scanning"""
 
     # New version of df with blanks removed from 'group_name' and 'communication_document_name'.
     df_topics = topics_sort_df(df)
 
-    # Sorts a copy of all correspondence by topic.
-    os.mkdir(os.path.join(output_dir, 'correspondence_by_topic'))
-    topic_list = df_topics['group_name'].unique().tolist()
-    for topic in topic_list:
+    # Makes the folder for all topics, or prepares to resume a sort that was interrupted.
+    journal_path = css_arch.topics_sort_folder(output_dir)
 
-        # Makes folder and metadata df for this topic.
-        # The metadata is updated with if the documents are found and eventually saved to the topic folder.
-        # The topic has to be normalized to be used for a folder and file name.
-        # Check if the topic path exists because there may be multiple variations that normalize to the same thing.
+    # Gets the positions of the rows for each topic, in the order the topics are first in the df.
+    topic_rows = css_arch.topics_sort_index(df_topics, ['group_name'])
+    topic_list = list(topic_rows)
+
+    # Updates the path of every unique document once, to use for every topic.
+    path_map = update_path_map(df_topics['communication_document_name'], input_dir)
+
+    # Makes the folders for each topic and plans where every document will be copied for every topic,
+    # so all the copies can be made at once with multiple threads.
+    # Check if the topic path exists because there may be multiple variations that normalize to the same thing.
+    copy_list = []
+    for topic in topic_list:
         topic_norm = css_arch.topics_sort_normalize(topic)
         topic_path = os.path.join(output_dir, 'correspondence_by_topic', topic_norm)
         if not os.path.exists(topic_path):
             os.mkdir(topic_path)
-        df_topic = df_topics[df_topics['group_name'] == topic].copy()
+        df_topic = df_topics.iloc[topic_rows[topic]]
 
-        # Sorts correspondence from constituents ("in" letters).
-        # Updates df_topic with if the letter was in the export and makes a log of missing letters.
-        from_path = os.path.join(topic_path, 'from_constituents')
-        if not os.path.exists(from_path):
-            os.mkdir(from_path)
-        df_topic = topics_sort_files(df_topic, 'IN', input_dir, output_dir, from_path)
+        # Plans correspondence from constituents ("in" letters) and to constituents ("out" letters).
+        for corr_type, folder in (('IN', 'from_constituents'), ('OUT', 'to_constituents')):
+            folder_path = os.path.join(topic_path, folder)
+            if not os.path.exists(folder_path):
+                os.mkdir(folder_path)
+            doc_plan = topics_sort_plan(df_topic, corr_type, input_dir, folder_path, path_map)
+            copy_list.extend([(doc_path, doc_new_path) for doc, doc_path, doc_new_path in doc_plan])
+
+    # Copies all the documents, using the inventory to skip documents that are not in the export.
+    if inventory is None:
+        inventory, empty_list = css_arch.documents_inventory(os.path.join(input_dir, 'documents'))
+    copy_results = css_arch.topics_sort_copy(copy_list, journal_path, inventory)
 
-        # Sorts correspondence to constituents ("out" letters).
+    for topic in topic_list:
+
+        # Makes metadata df for this topic.
+        # The metadata is updated with if the documents are found and eventually saved to the topic folder.
+        topic_norm = css_arch.topics_sort_normalize(topic)
+        topic_path = os.path.join(output_dir, 'correspondence_by_topic', topic_norm)
+        df_topic = df_topics.iloc[topic_rows[topic]].copy()
+
+        # Updates df_topic with if the letters were in the export and makes a log of missing letters.
+        from_path = os.path.join(topic_path, 'from_constituents')
+        df_topic = topics_sort_files(df_topic, 'IN', input_dir, output_dir, from_path, copy_results, path_map)
         to_path = os.path.join(topic_path, 'to_constituents')
-        if not os.path.exists(to_path):
-            os.mkdir(to_path)
-        df_topic = topics_sort_files(df_topic, 'OUT', input_dir, output_dir, to_path)
+        df_topic = topics_sort_files(df_topic, 'OUT', input_dir, output_dir, to_path, copy_results, path_map)
 
         # Deletes empty folders, which happens if all documents (in and/or out) for a topic are only in the metadata.
         css_arch.topics_sort_delete_empty(topic_path)
@@ -629,6 +648,9 @@ def topics_sort(df, input_dir, output_dir):
         if os.path.exists(topic_path):
             topics_sort_save_metadata(df_topic, topic_path, topic_norm)
 
+    # Deletes the journal, since the sort is complete and will not need to be resumed.
+    os.remove(journal_path)
+
 
 def topics_sort_df(df):
     """Update dataframe to remove rows missing group (topic) or document name and add column for missing docs"""
@@ -643,16 +665,50 @@ def topics_sort_df(df):
     return df
 
 
-def topics_sort_files(df, corr_type, input_dir, output_dir, folder_path):
-    """Copy all documents to a topic folder, update df for if each document was found and log if missing"""
+def topics_sort_files(df, corr_type, input_dir, output_dir, folder_path, copy_results=None, path_map=None):
+    """Copy all documents to a topic folder, update df for if each document was found and log if missing
+    If copy_results (from topics_sort_copy) is provided, the documents were already copied by topics_sort()
+    If path_map (from update_path_map) is provided, it is used instead of updating the document paths again"""
+
+    # Gets the current path and the path in the topic folder for each unique document of the type (in or out).
+    doc_plan = topics_sort_plan(df, corr_type, input_dir, folder_path, path_map)
+
+    # Copies the docs to the to_constituents or from_constituents folder, if not already copied.
+    if copy_results is None:
+        copy_results = css_arch.topics_sort_copy([(doc_path, doc_new_path) for doc, doc_path, doc_new_path in doc_plan])
+
+    # Updates the df with if each doc was found, for all rows at once.
+    # Rows with a blank or skipped doc are not in doc_found and keep the default value (TBD).
+    doc_found = {doc: copy_results[doc_new_path] for doc, doc_path, doc_new_path in doc_plan}
+    found = df['communication_document_name'].map(doc_found)
+    df['communication_document_name_present'] = found.where(found.notna(), df['communication_document_name_present'])
+
+    # If the doc is not in the expected location, logs it.
+    missing_list = [doc for doc, is_found in doc_found.items() if not is_found]
+    if missing_list:
+        with open(os.path.join(output_dir, 'topics_sort_file_not_found.csv'), 'a', newline='') as log:
+            log_writer = csv.writer(log)
+            topic = folder_path.split('\\')[-2]
+            log_writer.writerows([[topic, doc] for doc in missing_list])
+
+    return df
+
+
+def topics_sort_plan(df, corr_type, input_dir, folder_path, path_map=None):
+    """Return a list with each unique document of the type (in or out), its current path,
+    and its path in the topic folder
+    If path_map (from update_path_map) is provided, it is used instead of updating the document paths again"""
 
     # Gets a list of unique documents of the specified correspondence type (in or out), excluding blanks, to copy.
+    doc_plan = []
     df_type = df[df['document_type'].str.startswith((corr_type, f'AT_{corr_type}'), na=False)]
     doc_list = df_type['communication_document_name'].unique().tolist()
+    if path_map is None:
+        path_map = update_path_map(doc_list, input_dir)
     for doc in doc_list:
 
         # Gets the path for the current doc location by updating the path from the metadata.
-        doc_path = update_path(doc, input_dir)
+        doc_path = path_map[doc]
 
         # Skip any path that doesn't match a known pattern (error_new) or if the doc is a directory rather than a file.
         # error_new happens when there is data in the document column that cannot be mapped to a path in the export.
@@ -660,34 +716,14 @@ def topics_sort_files(df, corr_type, input_dir, output_dir, folder_path):
         if doc_path == 'error_new' or '.' not in doc_path:
             continue
 
-        # Gets the path for the subfolder for where the doc will be saved,
-        # which replicates all original subfolders within the to_constituents or from_constituents folder,
-        # and makes the folder if it doesn't exist.
+        # Gets the path for where the doc will be saved,
+        # which replicates all original subfolders within the to_constituents or from_constituents folder.
         doc_relative_path = Path(doc_path).relative_to(os.path.join(input_dir, 'documents'))
-        subfolder_path = os.path.join(folder_path, os.path.dirname(doc_relative_path))
-        subfolder_new = False
-        if not os.path.exists(subfolder_path):
-            subfolder_new = True
-            os.makedirs(subfolder_path)
-
-        # Copies the doc to the to_constituents or from_constituents folder and updates the df with if it was found.
-        # If the doc is not in the expected location, logs it instead.
-        # It is common to have docs in the metadata but not in the input directory.
         doc_name = doc.split('\\')[-1]
-        doc_new_path = os.path.join(subfolder_path, doc_name)
-        try:
-            shutil.copy2(doc_path, doc_new_path)
-            df.loc[df['communication_document_name'] == doc, 'communication_document_name_present'] = True
-        except FileNotFoundError:
-            df.loc[df['communication_document_name'] == doc, 'communication_document_name_present'] = False
-            with open(os.path.join(output_dir, 'topics_sort_file_not_found.csv'), 'a', newline='') as log:
-                log_writer = csv.writer(log)
-                topic = folder_path.split('\\')[-2]
-                log_writer.writerow([topic, doc])
-            if subfolder_new:
-                os.rmdir(subfolder_path)
+        doc_new_path = os.path.join(folder_path, os.path.dirname(doc_relative_path), doc_name)
+        doc_plan.append((doc, doc_path, doc_new_path))
 
-    return df
+    return doc_plan
 
 
 def topics_sort_save_metadata(df, topic_path, topic_norm):
@@ -724,6 +760,20 @@ def update_path(md_path, input_dir):
     return updated_path
 
 
+def update_path_map(md_paths, input_dir):
+    """Return a dict with each unique path found in the metadata and the path from update_path(),
+    updating all the paths at once with pandas string methods instead of one path at a time"""
+
+    # Each unique path is only updated once, even if it is in the metadata many times.
+    md_paths = pd.Series(pd.Series(md_paths, dtype=object).dropna().unique(), dtype=object)
+
+    # Same pattern as update_path().
+    updated_paths = md_paths.str.replace('..', input_dir, regex=False)
+    updated_paths = updated_paths.where(md_paths.str.startswith('..\\documents', na=False), 'error_new')
+
+    return dict(zip(md_paths, updated_paths))
+
+
 if __name__ == '__main__':
 
     # Validates the script argument values and calculates the paths to the metadata files.
@@ -739,9 +789,15 @@ if __name__ == '__main__':
 
     # Reads the metadata files, removes columns with PII, and combines into a pandas dataframe.
     # Columns with PII must be removed now to save memory, given the size of the data.
-    md_df = read_metadata(metadata_paths_dict)
-
-    # For accession, generates reports about the usability of the export and what might be deleted for appraisal.
+    # If the optional metadata cache is used, reads the df saved by an earlier run instead if the files are unchanged.
+    cache_key = css_arch.metadata_cache_key(list(metadata_paths_dict.values()))
+    md_df = css_arch.read_metadata_cache(cache_key, output_directory)
+    if md_df is None:
+        md_df = read_metadata(metadata_paths_dict)
+        css_arch.save_metadata_cache(md_df, cache_key, output_directory)
+
+    # For accession, generates reports about the usability of the export and what might be deleted for appraisal,
+    # and plans the deletion for appraisal mode if the environment variable CONSTITUENT_MAIL_DELETE_PLAN is 1.
     # The column 'text' is removed after appraisal_df is made because it has PII but is used to evaluate for appraisal.
     # The export is not changed in this mode.
     if script_mode == 'accession':
@@ -750,8 +806,11 @@ if __name__ == '__main__':
         appraisal_df = find_appraisal_rows(md_df, output_directory)
         md_df.drop(['text'], axis=1, inplace=True)
         check_metadata_usability(md_df, output_directory)
-        check_letter_matching(md_df, output_directory, input_directory)
+        documents, empty_list = css_arch.documents_inventory(os.path.join(input_directory, 'documents'))
+        check_letter_matching(md_df, output_directory, input_directory, documents)
         topics_report(md_df, output_directory)
+        if os.environ.get('CONSTITUENT_MAIL_DELETE_PLAN') == '1':
+            delete_appraisal_plan(input_directory, output_directory, appraisal_df, documents)
 
     # For appraisal, deletes letters due to appraisal and makes a report of letters that might be restricted.
     # Restricted letters would not be included in the access copy.
@@ -771,11 +830,13 @@ if __name__ == '__main__':
 
     # For access, removes rows for appraisal and restriction and columns with PII from the metadata,
     # makes a copy of the data split by calendar year, and makes a copy of the letters organized by topic.
+    # The metadata cache (if any) is deleted, since it has PII and access is the last mode run.
     elif script_mode == 'access':
         print("\nThe script is running in access mode.")
         print("It will remove rows for deleted or restricted letters and columns with PII, "
               "make copies of the metadata split by calendar year, "
               "and make a copy of the letters to and from constituents organized by topic")
+        css_arch.delete_metadata_cache(output_directory)
         try:
             appraisal_df = css_arch.read_csv(os.path.join(output_directory, 'appraisal_delete_log.csv'))
         except FileNotFoundError:
@@ -0,0 +1,40 @@
+import hashlib
+import os
+import shutil
+import unittest
+from aip_prep import fixity_copy, fixity_read
+from test_script import make_input_folder
+
+
+class MyTestCase(unittest.TestCase):
+
+    def setUp(self):
+        """Makes the file to copy and variables used by every test"""
+        self.input_dir = os.path.join(os.getcwd(), 'test_data', 'export')
+        make_input_folder(self.input_dir, 1)
+        self.file_path = os.path.join(self.input_dir, 'file_1.txt')
+        self.new_path = os.path.join(os.getcwd(), 'test_data', 'file_1.txt')
+        self.expected = (hashlib.md5(b'Test input').hexdigest(), hashlib.sha256(b'Test input').hexdigest())
+
+    def tearDown(self):
+        """Delete the test input and copy"""
+        shutil.rmtree(os.path.join(os.getcwd(), 'test_data'))
+
+    def test_copy(self):
+        """Test for copying a file, which must have the same contents and modification time"""
+        os.utime(self.file_path, ns=(1000000000, 1000000000))
+        result = fixity_copy(self.file_path, self.new_path)
+        self.assertEqual(self.expected, result, "Problem with test for copy, checksums")
+
+        with open(self.new_path, 'rb') as new_file:
+            result = [new_file.read(), os.stat(self.new_path).st_mtime_ns]
+        self.assertEqual([b'Test input', 1000000000], result, "Problem with test for copy, file")
+
+    def test_read(self):
+        """Test for reading the checksums of a file without copying it"""
+        result = fixity_read(self.file_path)
+        self.assertEqual(self.expected, result, "Problem with test for read")
+
+
+if __name__ == '__main__':
+    unittest.main()
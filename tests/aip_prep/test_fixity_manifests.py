@@ -0,0 +1,34 @@
+import os
+import shutil
+import unittest
+from aip_prep import fixity_manifests
+from test_script import text_to_list
+
+
+class MyTestCase(unittest.TestCase):
+
+    def tearDown(self):
+        """Delete the function output"""
+        shutil.rmtree(os.path.join(os.getcwd(), 'test_data'))
+
+    def test_function(self):
+        """Test for the manifests, with paths relative to the AIP folder and special characters encoded"""
+        fixity_dir = os.path.join(os.getcwd(), 'test_data', 'aip_fixity')
+        aip_folder_path = os.path.join(os.getcwd(), 'test_data', 'aips_dir', 'form_1')
+        new_paths = [os.path.join(aip_folder_path, 'a.txt'),
+                     os.path.join(aip_folder_path, 'sub', '100%.txt'),
+                     os.path.join(aip_folder_path, 'sub', 'line\nbreak.txt')]
+        fixity_list = [('md5a', 'sha256a'), ('md5b', 'sha256b'), ('md5c', 'sha256c')]
+        fixity_manifests(fixity_dir, aip_folder_path, new_paths, fixity_list)
+
+        result = text_to_list(os.path.join(fixity_dir, 'form_1', 'manifest-md5.txt'))
+        expected = ['md5a  a.txt\n', 'md5b  sub/100%25.txt\n', 'md5c  sub/line%0Abreak.txt\n']
+        self.assertEqual(expected, result, "Problem with test for function, manifest-md5.txt")
+
+        result = text_to_list(os.path.join(fixity_dir, 'form_1', 'manifest-sha256.txt'))
+        expected = ['sha256a  a.txt\n', 'sha256b  sub/100%25.txt\n', 'sha256c  sub/line%0Abreak.txt\n']
+        self.assertEqual(expected, result, "Problem with test for function, manifest-sha256.txt")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import hashlib
+import os
+import shutil
+import unittest
+from aip_prep import move_manifest
+from test_script import csv_to_list, make_input_folder
+
+
+class MyTestCase(unittest.TestCase):
+
+    def tearDown(self):
+        """Delete the test input and manifest"""
+        shutil.rmtree(os.path.join(os.getcwd(), 'test_data'))
+
+    def test_function(self):
+        """Test for making the manifest and adding files to it, which are not moved by this function"""
+        # Makes test data and runs the function.
+        input_dir = os.path.join(os.getcwd(), 'test_data', 'export')
+        make_input_folder(input_dir, 2)
+        csv_path = os.path.join(os.getcwd(), 'test_data', 'aip_move_manifest.csv')
+        aip_dir = os.path.join('aips_dir', 'metadata')
+        transfer_list = [(os.path.join(input_dir, 'file_1.txt'), os.path.join(aip_dir, 'file_1.txt')),
+                         (os.path.join(input_dir, 'file_2.txt'), os.path.join(aip_dir, 'file_2.txt'))]
+        move_manifest(csv_path, 'header')
+        fixity_list = move_manifest(csv_path, transfer_list)
+
+        # Tests the contents of the manifest.
+        result = csv_to_list(csv_path)
+        md5 = hashlib.md5(b'Test input').hexdigest()
+        sha256 = hashlib.sha256(b'Test input').hexdigest()
+        expected = [['Source', 'Destination', 'Size_Bytes', 'MD5', 'SHA256'],
+                    [os.path.join(input_dir, 'file_1.txt'), os.path.join(aip_dir, 'file_1.txt'), 10,
+                     md5.upper(), sha256.upper()],
+                    [os.path.join(input_dir, 'file_2.txt'), os.path.join(aip_dir, 'file_2.txt'), 10,
+                     md5.upper(), sha256.upper()]]
+        self.assertEqual(expected, result, "Problem with test for function, manifest")
+
+        # Tests the checksums returned by the function.
+        self.assertEqual([(md5, sha256), (md5, sha256)], fixity_list, "Problem with test for function, fixity_list")
+
+        # Tests the files were not moved.
+        result = sorted(os.listdir(input_dir))
+        self.assertEqual(['file_1.txt', 'file_2.txt'], result, "Problem with test for function, files")
+
+
+if __name__ == '__main__':
+    unittest.main()
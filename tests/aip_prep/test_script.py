@@ -48,6 +48,28 @@ class MyTestCase(unittest.TestCase):
         """Delete the script input and output"""
         shutil.rmtree(os.path.join(os.getcwd(), 'test_data'))
 
+    def test_max_gb_error(self):
+        """Test for when max_gb is not a number greater than 0, so the script prints an error and nothing is made"""
+        input_directory = os.path.join(os.getcwd(), 'test_data', 'export')
+        make_input_folder(os.path.join(input_directory, 'documents', 'CASE'), 2)
+
+        # Runs the script with each kind of max_gb that is not allowed.
+        script_path = os.path.join(os.getcwd(), '..', '..', 'aip_prep.py')
+        result = []
+        for max_gb in ('0', '-5', 'ten'):
+            output = subprocess.run(f"python {script_path} {input_directory} {max_gb}", shell=True,
+                                    capture_output=True, text=True)
+            result.append([output.returncode, output.stdout])
+        result.append(os.path.exists(os.path.join(os.getcwd(), 'test_data', 'aips_dir')))
+
+        # Tests the script printed the error, and did not make the aips_dir.
+        usage = "Script usage: python aip_prep.py input_directory [max_gb]\n"
+        expected = [[1, f"max_gb '0' is not a number greater than 0\n{usage}"],
+                    [1, f"max_gb '-5' is not a number greater than 0\n{usage}"],
+                    [1, f"max_gb 'ten' is not a number greater than 0\n{usage}"],
+                    False]
+        self.assertEqual(expected, result, "Problem with test for max_gb error")
+
     def test_no_subfolders(self):
         """Test for when the type folders have no subfolders, with a mix of 1 and multiple AIPs per type"""
         # Makes the input directory with test data.
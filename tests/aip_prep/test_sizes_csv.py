@@ -0,0 +1,32 @@
+import os
+import unittest
+from aip_prep import sizes_csv
+from test_script import csv_to_list
+
+
+class MyTestCase(unittest.TestCase):
+
+    def tearDown(self):
+        """Deletes the aip_sizes.csv, if made"""
+        csv_path = os.path.join(os.getcwd(), 'aip_sizes.csv')
+        if os.path.exists(csv_path):
+            os.remove(csv_path)
+
+    def test_addition(self):
+        """Test for making the aip_sizes.csv and adding rows to it"""
+        # Runs the function three times, the first time to make it and the other two to add to an existing csv.
+        csv_path = os.path.join(os.getcwd(), 'aip_sizes.csv')
+        sizes_csv(csv_path, 'header')
+        sizes_csv(csv_path, ['metadata', 3, 1200])
+        sizes_csv(csv_path, ['form_1', 10000, 5000000])
+
+        # Tests the contents of the aip_sizes.csv.
+        result = csv_to_list(csv_path)
+        expected = [['Folder', 'Files', 'Size_Bytes'],
+                    ['metadata', 3, 1200],
+                    ['form_1', 10000, 5000000]]
+        self.assertEqual(expected, result, "Problem with test for addition to aip_sizes.csv")
+
+
+if __name__ == '__main__':
+    unittest.main()
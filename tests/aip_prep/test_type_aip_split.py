@@ -0,0 +1,59 @@
+import os
+import unittest
+from aip_prep import type_aip_split
+
+
+def aips_to_list(aips):
+    """Convert the AIPs to a list with the file names and size of each AIP for easier comparison"""
+    return [[[os.path.basename(path) for path in aip_paths], aip_bytes] for aip_paths, aip_bytes in aips]
+
+
+class MyTestCase(unittest.TestCase):
+
+    def setUp(self):
+        """Variables used by every test: three subfolders with files of different sizes"""
+        self.paths_list = [os.path.join('type', 'a', 'a1'), os.path.join('type', 'a', 'a2'),
+                           os.path.join('type', 'a', 'a3'), os.path.join('type', 'b', 'b1'),
+                           os.path.join('type', 'b', 'b2'), os.path.join('type', 'c', 'c1')]
+        self.sizes_list = [10, 10, 10, 20, 20, 500]
+
+    def test_count(self):
+        """Test for splitting only by number of files, with more than 10,000 files"""
+        paths_list = [f'file_{i}.txt' for i in range(20001)]
+        result = [[len(aip_paths), aip_bytes] for aip_paths, aip_bytes in type_aip_split(paths_list, [1] * 20001)]
+        expected = [[10000, 10000], [10000, 10000], [1, 1]]
+        self.assertEqual(expected, result, "Problem with test for count")
+
+    def test_large_file(self):
+        """Test for a file larger than max_bytes, which is an AIP by itself"""
+        result = aips_to_list(type_aip_split(self.paths_list, self.sizes_list, 100))
+        expected = [[['a1', 'a2', 'a3', 'b1', 'b2'], 70], [['c1'], 500]]
+        self.assertEqual(expected, result, "Problem with test for large file")
+
+    def test_no_max(self):
+        """Test for when there is no max_bytes, so the files are one AIP"""
+        result = aips_to_list(type_aip_split(self.paths_list, self.sizes_list))
+        expected = [[['a1', 'a2', 'a3', 'b1', 'b2', 'c1'], 570]]
+        self.assertEqual(expected, result, "Problem with test for no max")
+
+    def test_zero(self):
+        """Test for when max_bytes is 0, which is a limit and not the same as no max_bytes, so each file is an AIP"""
+        result = aips_to_list(type_aip_split(self.paths_list, self.sizes_list, 0))
+        expected = [[['a1'], 10], [['a2'], 10], [['a3'], 10], [['b1'], 20], [['b2'], 20], [['c1'], 500]]
+        self.assertEqual(expected, result, "Problem with test for zero")
+
+    def test_subfolder_split(self):
+        """Test for a subfolder larger than max_bytes, which is split between AIPs"""
+        result = aips_to_list(type_aip_split(self.paths_list, self.sizes_list, 25))
+        expected = [[['a1', 'a2'], 20], [['a3'], 10], [['b1'], 20], [['b2'], 20], [['c1'], 500]]
+        self.assertEqual(expected, result, "Problem with test for subfolder split")
+
+    def test_subfolder_together(self):
+        """Test for a subfolder that fits in a new AIP but not the current one, so it starts a new AIP"""
+        result = aips_to_list(type_aip_split(self.paths_list, self.sizes_list, 50))
+        expected = [[['a1', 'a2', 'a3'], 30], [['b1', 'b2'], 40], [['c1'], 500]]
+        self.assertEqual(expected, result, "Problem with test for subfolder together")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+import os
+import shutil
+import unittest
+from aip_prep import metadata_csv, move_manifest, type_aips, type_files
+from test_script import csv_to_list, files_per_dir, make_input_folder, text_to_list
+
+
+class MyTestCase(unittest.TestCase):
+
+    def setUp(self):
+        """Makes test data, folders, and metadata.csv and variables used by every test"""
+        self.aips_dir = os.path.join(os.getcwd(), 'test_data', 'aips_dir')
+        self.input_dir = os.path.join(os.getcwd(), 'test_data', 'export')
+        self.metadata_path = os.path.join(self.aips_dir, 'metadata.csv')
+        self.output_dir = os.path.join(os.getcwd(), 'test_data')
+        make_input_folder(os.path.join(self.input_dir, 'documents', 'Objects', 'A'), 10000)
+        make_input_folder(os.path.join(self.input_dir, 'documents', 'Objects', 'B'), 2)
+        make_input_folder(os.path.join(self.input_dir, 'documents', 'Forms'), 3)
+        os.mkdir(self.aips_dir)
+        metadata_csv(self.metadata_path, 'header')
+
+    def tearDown(self):
+        """Delete the script input and output"""
+        shutil.rmtree(os.path.join(os.getcwd(), 'test_data'))
+
+    def types_list(self):
+        """Make the list of types for type_aips(), with the Objects type before the Forms type
+        The files are sorted, since the order from type_files() depends on the operating system."""
+        types_list = []
+        for type_folder in ('Objects', 'Forms'):
+            type_path = os.path.join(self.input_dir, 'documents', type_folder)
+            paths_list, sizes_list = type_files(self.output_dir, type_path, with_sizes=True)
+            paths_list, sizes_list = zip(*sorted(zip(paths_list, sizes_list)))
+            types_list.append((list(paths_list), type_path, list(sizes_list)))
+        return types_list
+
+    def test_multiple_types(self):
+        """Test for multiple types, where the AIPs are added to metadata.csv in order by type and AIP number"""
+        type_aips(self.aips_dir, self.metadata_path, self.types_list())
+
+        # Tests the aips_dir has the correct contents.
+        result = sorted(files_per_dir(self.aips_dir))
+        expected = [[self.aips_dir, 1],
+                    [os.path.join(self.aips_dir, 'forms_1'), 3],
+                    [os.path.join(self.aips_dir, 'objects_1'), 0],
+                    [os.path.join(self.aips_dir, 'objects_1', 'A'), 10000],
+                    [os.path.join(self.aips_dir, 'objects_2'), 0],
+                    [os.path.join(self.aips_dir, 'objects_2', 'B'), 2]]
+        self.assertEqual(expected, result, "Problem with test for multiple types, aips_dir")
+
+        # Tests the metadata.csv has the correct values.
+        result = csv_to_list(self.metadata_path)
+        expected = [['Department', 'Collection', 'Folder', 'AIP_ID', 'Title', 'Version'],
+                    ['BLANK', 'BLANK', 'objects_1', 'BLANK', 'Constituent Mail Objects 1', 1],
+                    ['BLANK', 'BLANK', 'objects_2', 'BLANK', 'Constituent Mail Objects 2', 1],
+                    ['BLANK', 'BLANK', 'forms_1', 'BLANK', 'Constituent Mail Forms 1', 1]]
+        self.assertEqual(expected, result, "Problem with test for multiple types, metadata.csv")
+
+    def test_move(self):
+        """Test for moving the files, which are first added to the move manifest, with bag-style manifests"""
+        manifest_path = os.path.join(self.output_dir, 'aip_move_manifest.csv')
+        fixity_dir = os.path.join(self.output_dir, 'aip_fixity')
+        move_manifest(manifest_path, 'header')
+        types_list = self.types_list()
+        type_aips(self.aips_dir, self.metadata_path, types_list, manifest_path=manifest_path, fixity_dir=fixity_dir)
+
+        # Tests the aips_dir has the correct contents.
+        result = sorted(files_per_dir(self.aips_dir))
+        expected = [[self.aips_dir, 1],
+                    [os.path.join(self.aips_dir, 'forms_1'), 3],
+                    [os.path.join(self.aips_dir, 'objects_1'), 0],
+                    [os.path.join(self.aips_dir, 'objects_1', 'A'), 10000],
+                    [os.path.join(self.aips_dir, 'objects_2'), 0],
+                    [os.path.join(self.aips_dir, 'objects_2', 'B'), 2]]
+        self.assertEqual(expected, result, "Problem with test for move, aips_dir")
+
+        # Tests the files are no longer in the export.
+        result = sorted(files_per_dir(os.path.join(self.input_dir, 'documents')))
+        expected = [[os.path.join(self.input_dir, 'documents'), 0],
+                    [os.path.join(self.input_dir, 'documents', 'Forms'), 0],
+                    [os.path.join(self.input_dir, 'documents', 'Objects'), 0],
+                    [os.path.join(self.input_dir, 'documents', 'Objects', 'A'), 0],
+                    [os.path.join(self.input_dir, 'documents', 'Objects', 'B'), 0]]
+        self.assertEqual(expected, result, "Problem with test for move, export")
+
+        # Tests the manifest has every file, in the same order as the AIPs, with the path in the AIP.
+        manifest = csv_to_list(manifest_path)
+        result = [len(manifest), manifest[1][:2], manifest[-1][:2]]
+        expected = [10006,
+                    [types_list[0][0][0], os.path.join(self.aips_dir, 'objects_1', 'A', 'file_1.txt')],
+                    [types_list[1][0][-1], os.path.join(self.aips_dir, 'forms_1', 'file_3.txt')]]
+        self.assertEqual(expected, result, "Problem with test for move, manifest")
+
+        # Tests the bag-style manifests have the checksums from the move manifest.
+        result = text_to_list(os.path.join(fixity_dir, 'forms_1', 'manifest-md5.txt'))
+        expected = [f'{row[3].lower()}  {os.path.basename(row[1])}\n' for row in manifest[-3:]]
+        self.assertEqual(expected, result, "Problem with test for move, manifest-md5.txt")
+
+    def test_one_worker(self):
+        """Test for when the environment variables set one thread, which must have the same metadata.csv"""
+        os.environ['CONSTITUENT_MAIL_AIP_WORKERS'] = '1'
+        os.environ['CONSTITUENT_MAIL_COPY_WORKERS'] = '1'
+        try:
+            type_aips(self.aips_dir, self.metadata_path, self.types_list())
+        finally:
+            del os.environ['CONSTITUENT_MAIL_AIP_WORKERS']
+            del os.environ['CONSTITUENT_MAIL_COPY_WORKERS']
+
+        # Tests the metadata.csv has the correct values.
+        result = csv_to_list(self.metadata_path)
+        expected = [['Department', 'Collection', 'Folder', 'AIP_ID', 'Title', 'Version'],
+                    ['BLANK', 'BLANK', 'objects_1', 'BLANK', 'Constituent Mail Objects 1', 1],
+                    ['BLANK', 'BLANK', 'objects_2', 'BLANK', 'Constituent Mail Objects 2', 1],
+                    ['BLANK', 'BLANK', 'forms_1', 'BLANK', 'Constituent Mail Forms 1', 1]]
+        self.assertEqual(expected, result, "Problem with test for one worker, metadata.csv")
+
+
+if __name__ == '__main__':
+    unittest.main()
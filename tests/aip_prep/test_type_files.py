@@ -45,6 +45,34 @@ class MyTestCase(unittest.TestCase):
                     os.path.join(type_path, 'Document2.txt')]
         self.assertEqual(expected, result, "Problem with test for files_only")
 
+    def test_sizes(self):
+        """Test for when the sizes of the files are also returned"""
+        # Runs the function.
+        output_dir = os.path.join(os.getcwd(), 'type_files')
+        type_path = os.path.join(output_dir, 'files_only')
+        result = type_files(output_dir, type_path, with_sizes=True)
+
+        # Tests the file_paths_list and sizes list returned by the function.
+        expected = ([os.path.join(type_path, 'Document.txt'), os.path.join(type_path, 'Document2.txt')],
+                    [os.path.getsize(os.path.join(type_path, 'Document.txt')),
+                     os.path.getsize(os.path.join(type_path, 'Document2.txt'))])
+        self.assertEqual(expected, result, "Problem with test for sizes")
+
+    def test_inventory(self):
+        """Test for when the inventory is provided without the list of empty folders,
+        and one file does not have a size in the inventory, so the size is read from the file"""
+        # Runs the function.
+        output_dir = os.path.join(os.getcwd(), 'type_files')
+        type_path = os.path.join(output_dir, 'files_only')
+        paths = [os.path.join(type_path, 'Document.txt'), os.path.join(type_path, 'Document2.txt')]
+        inventory = {path: (path, path.lower(), None if i == 0 else os.path.getsize(path), None)
+                     for i, path in enumerate(paths)}
+        result = type_files(output_dir, type_path, inventory, with_sizes=True)
+
+        # Tests the file_paths_list and sizes list returned by the function.
+        expected = (paths, [os.path.getsize(paths[0]), os.path.getsize(paths[1])])
+        self.assertEqual(expected, result, "Problem with test for inventory")
+
     def test_subfolders(self):
         """Test for when the type folder includes subfolders"""
         # Runs the function.
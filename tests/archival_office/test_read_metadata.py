@@ -1,5 +1,6 @@
 """
 Tests for the function read_metadata(), which reads the dat file into a dataframe.
+The test for line length makes its own dat file, which is deleted at the end of the test.
 """
 import os
 import unittest
@@ -24,6 +25,26 @@ class MyTestCase(unittest.TestCase):
                      'ISSUE', 'TR-RAL', '', '980104', 'NOP', '', '']]
         self.assertEqual(expected, result, "Problem with test for blank rows")
 
+    def test_line_length(self):
+        """Test for when lines are shorter or longer than the columns, which are blank or not included"""
+        # Makes a dat file with a line that ends in the city column and a line with extra text after comments.
+        dat_path = os.path.join('test_data', 'read_metadata', 'archive_length.dat')
+        with open(dat_path, 'w') as dat_file:
+            dat_file.write('LAST A, FIRST A'.ljust(159) + 'CITY A\n')
+            dat_file.write('LAST B, FIRST B'.ljust(371) + 'NOTE'.ljust(100) + 'EXTRA\n')
+
+        # Runs the function being tested.
+        try:
+            md_df = read_metadata(dat_path)
+        finally:
+            os.remove(dat_path)
+
+        # Tests the dataframe has the expected values.
+        result = md_df.values.tolist()
+        expected = [['LAST A, FIRST A', '', '', '', '', 'CITY A', '', '', '', '', '', '', '', '', ''],
+                    ['LAST B, FIRST B', '', '', '', '', '', '', '', '', '', '', '', '', '', 'NOTE']]
+        self.assertEqual(expected, result, "Problem with test for line length")
+
     def test_no_blank(self):
         """Test for when the metadata file has no blank rows"""
         # Runs the function being tested.
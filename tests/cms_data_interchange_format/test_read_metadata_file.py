@@ -29,6 +29,17 @@ class MyTestCase(unittest.TestCase):
                      'City Three', 'GA', '30003', 'C3', 'Clarke', 'USA', 'D3', 'P3', 'BLANK', 'BLANK']]
         self.assertEqual(expected, result, "Problem with test for 1B")
 
+    def test_1b_skip_pii(self):
+        """Test for the metadata file 1B.out when columns removed by remove_pii() are not read"""
+        df_1b = read_metadata_file('1B', os.path.join('test_data', 'read', 'match', '1B.out'), skip_pii=True)
+
+        result = df_to_list(df_1b)
+        expected = [['constituent_id', 'city', 'state', 'zip_code', 'country'],
+                    ['1', 'City One', 'GA', '30001', 'USA'],
+                    ['2', 'City Two', 'GA', '30002', 'USA'],
+                    ['3', 'City Three', 'GA', '30003', 'USA']]
+        self.assertEqual(expected, result, "Problem with test for 1B, skip_pii")
+
     def test_2a(self):
         """Test for the metadata file 2A.out"""
         df_2a = read_metadata_file('2A', os.path.join('test_data', 'read', 'match', '2A.out'))
@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import unittest
+from css_archiving_format import appraisal_logs_combine
+from test_read_metadata import df_to_list
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_duplicate(self):
+        """Test for rows with the same text, which are combined into one row with the categories of every row"""
+        df = pd.DataFrame([['b', 'casework'], ['a', 'job'], ['b', 'casework'], ['c', 'none']],
+                          columns=['in_id', 'in_text'])
+        df_tiers = pd.DataFrame({'Casework': ['sure', '', 'sure', ''],
+                                 'Job_Application': ['sure', 'sure', '', 'check']})
+        df_appraisal = appraisal_logs_combine(df, df_tiers)
+
+        result = df_to_list(df_appraisal)
+        expected = [['in_id', 'in_text', 'Appraisal_Category'],
+                    ['a', 'job', 'Job_Application'],
+                    ['b', 'casework', 'Casework|Casework|Job_Application']]
+        self.assertEqual(expected, result, "Problem with test for duplicate")
+
+    def test_none(self):
+        """Test for when no rows indicate appraisal"""
+        df = pd.DataFrame([['a', 'text']], columns=['in_id', 'in_text'])
+        df_tiers = pd.DataFrame({'Casework': ['check']})
+        df_appraisal = appraisal_logs_combine(df, df_tiers)
+
+        result = df_to_list(df_appraisal)
+        expected = [['in_id', 'in_text', 'Appraisal_Category']]
+        self.assertEqual(expected, result, "Problem with test for none")
+
+    def test_sort(self):
+        """Test for the row order, which is sorted by the text of the row, with blanks as the string nan"""
+        df = pd.DataFrame([['b', 2.0], ['a', np.nan], ['a', 1.0]], columns=['in_id', 'in_number'], index=[7, 3, 5])
+        df_tiers = pd.DataFrame({'Casework': ['sure', 'sure', 'sure']})
+        df_appraisal = appraisal_logs_combine(df, df_tiers)
+
+        result = df_to_list(df_appraisal)
+        expected = [['in_id', 'in_number', 'Appraisal_Category'],
+                    ['a', '1.0', 'Casework'],
+                    ['a', 'nan', 'Casework'],
+                    ['b', '2.0', 'Casework']]
+        self.assertEqual(expected, result, "Problem with test for sort")
+
+
+if __name__ == '__main__':
+    unittest.main()
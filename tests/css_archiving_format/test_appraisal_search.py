@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+import unittest
+from css_archiving_format import appraisal_search
+from test_read_metadata import df_to_list
+
+
+def make_df(rows):
+    """Make a df to use for test input"""
+    column_names = ['zip', 'in_type', 'in_topic', 'in_text', 'out_type', 'out_topic', 'out_text']
+    df = pd.DataFrame(rows, columns=column_names)
+    return df
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_check(self):
+        """Test for rows that only match the keywords with less certainty"""
+        # Makes a dataframe to use as test input and runs the function.
+        rows = [['30600', 'GEN', 'Acad', '', 'GEN', '', ''],
+                ['30601', 'GEN', 'Legal', 'Case against Napster', 'GEN', '', ''],
+                ['30602', 'GEN', '', '', 'GEN', 'Jobs', 'Rec center']]
+        df = make_df(rows)
+        df_tiers = appraisal_search(df, ['in_topic', 'in_text', 'out_topic', 'out_text'],
+                                    ['in_type', 'in_topic', 'in_text', 'out_type', 'out_topic', 'out_text'])
+
+        # Tests the values in df_tiers are correct.
+        result = df_to_list(df_tiers)
+        expected = [['Academy_Application', 'Casework', 'Job_Application', 'Recommendation'],
+                    ['check', '', '', ''],
+                    ['', 'check', '', ''],
+                    ['', '', 'check', 'check']]
+        self.assertEqual(expected, result, "Problem with test for check")
+
+    def test_none(self):
+        """Test for rows that do not match any keyword, including blanks"""
+        # Makes a dataframe to use as test input and runs the function.
+        rows = [['30600', 'GEN', 'Arts', 'Artist Union', 'GEN', '', ''],
+                ['30601', np.nan, np.nan, np.nan, np.nan, np.nan, np.nan]]
+        df = make_df(rows)
+        df_tiers = appraisal_search(df, ['in_topic', 'in_text', 'out_topic', 'out_text'],
+                                    ['in_type', 'in_topic', 'in_text', 'out_type', 'out_topic', 'out_text'])
+
+        # Tests the values in df_tiers are correct.
+        result = df_to_list(df_tiers)
+        expected = [['Academy_Application', 'Casework', 'Job_Application', 'Recommendation'],
+                    ['', '', '', ''],
+                    ['', '', '', '']]
+        self.assertEqual(expected, result, "Problem with test for none")
+
+    def test_overlap(self):
+        """Test for keywords from more than one category starting at the same place in the text"""
+        # Makes a dataframe to use as test input and runs the function.
+        rows = [['30600', 'GEN', 'Intern Rec', '', 'GEN', '', ''],
+                ['30601', 'GEN', 'INTERNSHIP', 'academy rec', 'GEN', '', ''],
+                ['30602', 'GEN', '', '', 'GEN', 'Case closed', 'job request']]
+        df = make_df(rows)
+        df_tiers = appraisal_search(df, ['in_topic', 'in_text', 'out_topic', 'out_text'],
+                                    ['in_type', 'in_topic', 'in_text', 'out_type', 'out_topic', 'out_text'])
+
+        # Tests the values in df_tiers are correct.
+        result = df_to_list(df_tiers)
+        expected = [['Academy_Application', 'Casework', 'Job_Application', 'Recommendation'],
+                    ['', '', 'sure', 'sure'],
+                    ['sure', '', 'sure', 'check'],
+                    ['', 'sure', 'sure', '']]
+        self.assertEqual(expected, result, "Problem with test for overlap")
+
+    def test_sure_exact(self):
+        """Test for rows that exactly match a keyword, including in a column that is only searched for exact matches"""
+        # Makes a dataframe to use as test input and runs the function.
+        rows = [['30600', 'Case', 'Admin', '', 'GEN', '', ''],
+                ['30601', 'GEN', '', '', 'GEN', 'CASE!', ''],
+                ['30602', 'GEN', 'Showcase', '', 'GEN', '', '']]
+        df = make_df(rows)
+        df_tiers = appraisal_search(df, ['in_topic', 'in_text', 'out_topic', 'out_text'],
+                                    ['in_type', 'in_topic', 'in_text', 'out_type', 'out_topic', 'out_text'])
+
+        # Tests the values in df_tiers are correct.
+        result = df_to_list(df_tiers)
+        expected = [['Academy_Application', 'Casework', 'Job_Application', 'Recommendation'],
+                    ['', 'sure', '', ''],
+                    ['', 'sure', '', ''],
+                    ['', 'check', '', '']]
+        self.assertEqual(expected, result, "Problem with test for sure_exact")
+
+
+if __name__ == '__main__':
+    unittest.main()
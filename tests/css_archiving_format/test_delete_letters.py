@@ -0,0 +1,197 @@
+"""
+The letters are made by the test in a folder (output_dir), which is deleted at the end of each test.
+"""
+from datetime import date
+import hashlib
+import os
+import shutil
+import time
+import unittest
+from unittest import mock
+import css_archiving_format
+from css_archiving_format import delete_letters
+from test_script import csv_to_list
+
+
+class MyTestCase(unittest.TestCase):
+
+    def setUp(self):
+        """Makes the letters to delete and variables used by every test"""
+        self.output_dir = os.path.join(os.getcwd(), 'test_data', 'delete_letters')
+        os.mkdir(self.output_dir)
+        self.log_path = os.path.join(self.output_dir, 'file_deletion_log.csv')
+        self.letters = []
+        for i in range(50):
+            letter_path = os.path.join(self.output_dir, f'{i}.txt')
+            with open(letter_path, 'wb') as letter:
+                letter.write(f'Letter {i}'.encode())
+            self.letters.append(letter_path)
+
+    def tearDown(self):
+        """Deletes the folder with the letters and log"""
+        shutil.rmtree(self.output_dir)
+
+    def test_errors(self):
+        """Test for letters that are logged but not deleted, and a letter that is not found"""
+        delete_list = [(self.letters[0], 'Casework'),
+                       ('new_path.txt', 'Cannot determine file path: new path pattern in metadata'),
+                       (self.letters[1], 'Cannot delete: FileNotFoundError'),
+                       (os.path.join(self.output_dir, 'missing.txt'), 'Casework')]
+        delete_letters(self.log_path, delete_list)
+
+        # Tests the contents of the file deletion log.
+        today = date.today().strftime('%Y-%m-%d')
+        result = csv_to_list(self.log_path)
+        expected = [['File', 'SizeKB', 'DateCreated', 'DateDeleted', 'MD5', 'Notes'],
+                    [self.letters[0], '0.0', today, today, hashlib.md5(b'Letter 0').hexdigest().upper(), 'Casework'],
+                    ['new_path.txt', 'BLANK', 'BLANK', 'BLANK', 'BLANK',
+                     'Cannot determine file path: new path pattern in metadata'],
+                    [self.letters[1], 'BLANK', 'BLANK', 'BLANK', 'BLANK', 'Cannot delete: FileNotFoundError'],
+                    [os.path.join(self.output_dir, 'missing.txt'), 'BLANK', 'BLANK', 'BLANK', 'BLANK',
+                     'Cannot delete: FileNotFoundError']]
+        self.assertEqual(expected, result, "Problem with test for errors, log")
+
+        # Tests only the letter with a note that is not an error was deleted.
+        result = [os.path.exists(self.letters[0]), os.path.exists(self.letters[1])]
+        expected = [False, True]
+        self.assertEqual(expected, result, "Problem with test for errors, letters")
+
+    def test_plan(self):
+        """Test for using a plan, where the MD5 in the plan is only used if the letter has not changed"""
+        # Makes a plan with a placeholder MD5, so the log shows if the MD5 from the plan was used.
+        # The second letter has a different modification time in the plan, like it was changed after planning.
+        plan = {}
+        for letter_path in self.letters[:2]:
+            stat = os.stat(letter_path)
+            plan[letter_path] = (stat.st_size, stat.st_mtime_ns, 'PLANNED')
+        plan[self.letters[1]] = (plan[self.letters[1]][0], plan[self.letters[1]][1] - 1, 'PLANNED')
+        delete_letters(self.log_path, [(self.letters[0], 'Casework'), (self.letters[1], 'Casework')], plan)
+
+        # Tests the contents of the file deletion log.
+        today = date.today().strftime('%Y-%m-%d')
+        result = csv_to_list(self.log_path)
+        expected = [['File', 'SizeKB', 'DateCreated', 'DateDeleted', 'MD5', 'Notes'],
+                    [self.letters[0], '0.0', today, today, 'PLANNED', 'Casework'],
+                    [self.letters[1], '0.0', today, today, hashlib.md5(b'Letter 1').hexdigest().upper(), 'Casework']]
+        self.assertEqual(expected, result, "Problem with test for plan")
+
+    def test_remove_error(self):
+        """Test for when a letter is removed by something else after the row is made, which is logged as not found
+        and does not stop the other letters from being deleted"""
+        os_remove = os.remove
+
+        def remove_error(path):
+            if path == self.letters[1]:
+                raise FileNotFoundError
+            os_remove(path)
+
+        with mock.patch('css_archiving_format.os.remove', side_effect=remove_error):
+            delete_letters(self.log_path, [(letter_path, 'Casework') for letter_path in self.letters[:3]])
+
+        # Tests the contents of the file deletion log.
+        today = date.today().strftime('%Y-%m-%d')
+        result = csv_to_list(self.log_path)
+        expected = [['File', 'SizeKB', 'DateCreated', 'DateDeleted', 'MD5', 'Notes'],
+                    [self.letters[0], '0.0', today, today, hashlib.md5(b'Letter 0').hexdigest().upper(), 'Casework'],
+                    [self.letters[1], 'BLANK', 'BLANK', 'BLANK', 'BLANK', 'Cannot delete: FileNotFoundError'],
+                    [self.letters[2], '0.0', today, today, hashlib.md5(b'Letter 2').hexdigest().upper(), 'Casework']]
+        self.assertEqual(expected, result, "Problem with test for remove error, log")
+
+        # Tests the other letters were deleted.
+        result = [os.path.exists(letter_path) for letter_path in self.letters[:3]]
+        expected = [False, True, False]
+        self.assertEqual(expected, result, "Problem with test for remove error, letters")
+
+    def test_stop(self):
+        """Test for when the script stops partway through, so every letter already deleted must be in the log"""
+        # Replaces os.remove() with a version that checks the row for the letter is already saved in the log
+        # and stops the script with an error after 20 letters are deleted.
+        os_remove = os.remove
+        logged_first = []
+
+        def remove_then_stop(path):
+            with open(self.log_path) as log_file:
+                logged_first.append(path in log_file.read())
+            if len(logged_first) > 20:
+                raise OSError('Stopped by test')
+            os_remove(path)
+
+        delete_list = [(letter_path, 'Casework') for letter_path in self.letters]
+        os.environ['CONSTITUENT_MAIL_DELETE_WORKERS'] = '2'
+        try:
+            with mock.patch('css_archiving_format.os.remove', side_effect=remove_then_stop):
+                with self.assertRaises(OSError):
+                    delete_letters(self.log_path, delete_list)
+        finally:
+            del os.environ['CONSTITUENT_MAIL_DELETE_WORKERS']
+
+        # Tests the row was in the log before each letter was deleted, and some letters were not deleted.
+        deleted = [letter_path for letter_path in self.letters if not os.path.exists(letter_path)]
+        result = [all(logged_first), len(deleted)]
+        expected = [True, 20]
+        self.assertEqual(expected, result, "Problem with test for stop, letters")
+
+        # Tests every deleted letter has a row in the file deletion log.
+        logged = [row[0] for row in csv_to_list(self.log_path)]
+        result = [letter_path for letter_path in deleted if letter_path not in logged]
+        self.assertEqual([], result, "Problem with test for stop, log")
+
+    def test_threads(self):
+        """Test for deleting with multiple threads when storage is slow, which must be faster than one thread,
+        so saving each row before the letter is deleted does not make the threads wait for each other"""
+        md5 = css_archiving_format.file_deletion_log_md5
+        fsync = os.fsync
+
+        def md5_latency(file_path):
+            time.sleep(0.01)
+            return md5(file_path)
+
+        def fsync_latency(fd):
+            time.sleep(0.01)
+            fsync(fd)
+
+        # Deletes half of the letters with one thread and half with eight threads, with a wait added to reading
+        # the letters and saving the log, like on a network drive.
+        seconds = []
+        for workers, letters in (('1', self.letters[:25]), ('8', self.letters[25:])):
+            os.environ['CONSTITUENT_MAIL_DELETE_WORKERS'] = workers
+            try:
+                with mock.patch('css_archiving_format.file_deletion_log_md5', side_effect=md5_latency), \
+                        mock.patch('css_archiving_format.os.fsync', side_effect=fsync_latency):
+                    start = time.perf_counter()
+                    delete_letters(self.log_path, [(letter_path, 'Casework') for letter_path in letters])
+                    seconds.append(time.perf_counter() - start)
+            finally:
+                del os.environ['CONSTITUENT_MAIL_DELETE_WORKERS']
+
+        # Tests eight threads took less than half the time of one thread, and every letter was deleted.
+        result = [seconds[1] < seconds[0] / 2, os.listdir(self.output_dir)]
+        expected = [True, ['file_deletion_log.csv']]
+        self.assertEqual(expected, result, "Problem with test for threads")
+
+    def test_order(self):
+        """Test for more letters than are deleted at once, where the log must be in the same order as the list"""
+        delete_list = [(letter_path, 'Academy_Application') for letter_path in reversed(self.letters)]
+        os.environ['CONSTITUENT_MAIL_DELETE_WORKERS'] = '3'
+        try:
+            delete_letters(self.log_path, delete_list)
+        finally:
+            del os.environ['CONSTITUENT_MAIL_DELETE_WORKERS']
+
+        # Tests the contents of the file deletion log.
+        today = date.today().strftime('%Y-%m-%d')
+        result = csv_to_list(self.log_path)
+        expected = [['File', 'SizeKB', 'DateCreated', 'DateDeleted', 'MD5', 'Notes']]
+        for i in reversed(range(50)):
+            md5 = hashlib.md5(f'Letter {i}'.encode()).hexdigest().upper()
+            expected.append([self.letters[i], '0.0', today, today, md5, 'Academy_Application'])
+        self.assertEqual(expected, result, "Problem with test for order, log")
+
+        # Tests all the letters were deleted.
+        result = os.listdir(self.output_dir)
+        expected = ['file_deletion_log.csv']
+        self.assertEqual(expected, result, "Problem with test for order, letters")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+"""
+The letters are made by the test in a folder (output_dir), which is deleted at the end of each test.
+"""
+import hashlib
+import os
+import shutil
+import unittest
+from css_archiving_format import delete_letters_plan, delete_letters_plan_read
+from test_script import csv_to_list
+
+
+class MyTestCase(unittest.TestCase):
+
+    def setUp(self):
+        """Makes the letters to plan and variables used by every test"""
+        self.output_dir = os.path.join(os.getcwd(), 'test_data', 'delete_letters_plan')
+        os.mkdir(self.output_dir)
+        self.plan_path = os.path.join(self.output_dir, 'appraisal_delete_plan.csv')
+        self.letters = []
+        for i in range(3):
+            letter_path = os.path.join(self.output_dir, f'{i}.txt')
+            with open(letter_path, 'wb') as letter:
+                letter.write(f'Letter {i}'.encode())
+            self.letters.append(letter_path)
+
+    def tearDown(self):
+        """Deletes the folder with the letters and plan"""
+        shutil.rmtree(self.output_dir)
+
+    def test_plan(self):
+        """Test for a plan, which skips duplicates, letters that will not be deleted, and letters not found"""
+        delete_list = [(self.letters[0], 'Casework'),
+                       (self.letters[1], 'Job_Application'),
+                       (self.letters[0], 'Casework'),
+                       (self.letters[2], 'Cannot delete: FileNotFoundError'),
+                       ('new_path.txt', 'Cannot determine file path: new path pattern in metadata'),
+                       (os.path.join(self.output_dir, 'missing.txt'), 'Casework')]
+        delete_letters_plan(self.plan_path, delete_list)
+
+        # Tests the contents of the plan.
+        result = csv_to_list(self.plan_path)
+        expected = [['File', 'SizeBytes', 'ModifiedNs', 'MD5']]
+        for letter_path in self.letters[:2]:
+            with open(letter_path, 'rb') as letter:
+                md5 = hashlib.md5(letter.read()).hexdigest().upper()
+            expected.append([letter_path, '8', str(os.stat(letter_path).st_mtime_ns), md5])
+        self.assertEqual(expected, result, "Problem with test for plan")
+
+        # Tests the plan is read the same as it was saved.
+        result = delete_letters_plan_read(self.plan_path)
+        expected = {row[0]: (int(row[1]), int(row[2]), row[3]) for row in expected[1:]}
+        self.assertEqual(expected, result, "Problem with test for plan, read")
+
+    def test_rerun(self):
+        """Test for making the plan again, where the MD5 is only calculated again for letters that changed"""
+        # Makes a plan with a placeholder MD5, so the plan shows if the MD5 was calculated again.
+        # The second letter has a different modification time in the plan, like it was changed after planning.
+        with open(self.plan_path, 'w', newline='') as plan:
+            plan.write('File,SizeBytes,ModifiedNs,MD5\n')
+            plan.write(f'{self.letters[0]},8,{os.stat(self.letters[0]).st_mtime_ns},OLD\n')
+            plan.write(f'{self.letters[1]},8,{os.stat(self.letters[1]).st_mtime_ns - 1},OLD\n')
+        delete_letters_plan(self.plan_path, [(self.letters[0], 'Casework'), (self.letters[1], 'Casework')])
+
+        # Tests the MD5 in the plan.
+        result = [md5 for size, modified, md5 in delete_letters_plan_read(self.plan_path).values()]
+        expected = ['OLD', hashlib.md5(b'Letter 1').hexdigest().upper()]
+        self.assertEqual(expected, result, "Problem with test for rerun")
+
+    def test_no_plan(self):
+        """Test for reading a plan that does not exist"""
+        result = delete_letters_plan_read(self.plan_path)
+        self.assertEqual({}, result, "Problem with test for no plan")
+
+
+if __name__ == '__main__':
+    unittest.main()
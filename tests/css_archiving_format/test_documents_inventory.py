@@ -0,0 +1,60 @@
+"""
+Uses the documents in the test data for topics_sort_files as the input,
+plus an empty folder made by the test (since git does not keep empty folders), which is deleted at the end of each test.
+"""
+import os
+import unittest
+from css_archiving_format import documents_inventory, documents_inventory_key
+
+
+class MyTestCase(unittest.TestCase):
+
+    def setUp(self):
+        """Variables used by every test"""
+        self.docs_dir = os.path.join(os.getcwd(), 'test_data', 'topics_sort_files', 'name_export', 'documents')
+        self.empty_dir = os.path.join(self.docs_dir, 'subfolder', 'B', 'empty')
+        os.mkdir(self.empty_dir)
+
+    def tearDown(self):
+        """Delete the empty folder"""
+        os.rmdir(self.empty_dir)
+
+    def test_empty(self):
+        """Test for the list of empty folders"""
+        inventory, empty_list = documents_inventory(self.docs_dir)
+        expected = [self.empty_dir]
+        self.assertEqual(expected, empty_list, "Problem with test for empty")
+
+    def test_inventory(self):
+        """Test for the inventory, which must be in the same order as os.walk() with the file size"""
+        inventory, empty_list = documents_inventory(self.docs_dir)
+        result = [(key, file_info[0], file_info[1], file_info[2]) for key, file_info in inventory.items()]
+
+        expected = []
+        for root, dirs, files in os.walk(self.docs_dir):
+            for file in files:
+                file_path = os.path.join(root, file)
+                expected.append((documents_inventory_key(file_path), file_path, file_path.lower(),
+                                 os.path.getsize(file_path)))
+        self.assertEqual(expected, result, "Problem with test for inventory")
+
+    def test_missing(self):
+        """Test for when the folder does not exist, so the inventory and list of empty folders are empty"""
+        inventory, empty_list = documents_inventory(os.path.join(self.docs_dir, 'missing'))
+        result = [inventory, empty_list]
+        expected = [{}, []]
+        self.assertEqual(expected, result, "Problem with test for missing")
+
+    def test_one_worker(self):
+        """Test for when the environment variable sets one thread, which must have the same results as the default"""
+        os.environ['CONSTITUENT_MAIL_SCAN_WORKERS'] = '1'
+        try:
+            result = documents_inventory(self.docs_dir)
+        finally:
+            del os.environ['CONSTITUENT_MAIL_SCAN_WORKERS']
+        expected = documents_inventory(self.docs_dir)
+        self.assertEqual(expected, result, "Problem with test for one worker")
+
+
+if __name__ == '__main__':
+    unittest.main()
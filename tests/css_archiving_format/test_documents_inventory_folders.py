@@ -0,0 +1,39 @@
+"""
+Uses absolute paths, which do not need to exist, so the folders that contain them go up to the root folder.
+"""
+import os
+from pathlib import Path
+import unittest
+from css_archiving_format import documents_inventory_folders, documents_inventory_key
+
+
+def folder_keys(folder):
+    """Return a set of the inventory key of a folder and every folder that contains it"""
+    return {documents_inventory_key(str(path)) for path in [Path(folder), *Path(folder).parents]}
+
+
+class MyTestCase(unittest.TestCase):
+
+    def setUp(self):
+        """Variables used by every test"""
+        self.docs_dir = os.path.join(os.path.abspath('test_data'), 'documents_inventory_folders', 'documents')
+
+    def test_empty(self):
+        """Test for an empty folder, which is included with the folders that contain it"""
+        empty_folder = os.path.join(self.docs_dir, 'forms', 'empty')
+        result = documents_inventory_folders({}, [empty_folder])
+        expected = folder_keys(empty_folder)
+        self.assertEqual(expected, result, "Problem with test for empty")
+
+    def test_files(self):
+        """Test for files in different folders, which includes each folder and the folders that contain them"""
+        paths = [os.path.join(self.docs_dir, 'a.txt'), os.path.join(self.docs_dir, 'letters', 'b.txt'),
+                 os.path.join(self.docs_dir, 'letters', '2000', 'c.txt')]
+        inventory = {documents_inventory_key(path): (path, path.lower(), 1, 1) for path in paths}
+        result = documents_inventory_folders(inventory)
+        expected = folder_keys(os.path.join(self.docs_dir, 'letters', '2000'))
+        self.assertEqual(expected, result, "Problem with test for files")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,35 @@
+import hashlib
+import os
+import unittest
+from css_archiving_format import file_deletion_log_md5
+
+
+class MyTestCase(unittest.TestCase):
+
+    def tearDown(self):
+        """Deletes the file made by the tests"""
+        file_path = os.path.join('test_data', 'file_deletion_log', 'letter.txt')
+        if os.path.exists(file_path):
+            os.remove(file_path)
+
+    def test_large(self):
+        """Test for a file larger than the amount read at a time, made by the test"""
+        file_path = os.path.join('test_data', 'file_deletion_log', 'letter.txt')
+        with open(file_path, 'wb') as f:
+            f.write(b'Letter text ' * 300000)
+        result = file_deletion_log_md5(file_path)
+        expected = hashlib.md5(b'Letter text ' * 300000).hexdigest().upper()
+        self.assertEqual(expected, result, "Problem with test for large")
+
+    def test_small(self):
+        """Test for a file smaller than the amount read at a time, made by the test"""
+        file_path = os.path.join('test_data', 'file_deletion_log', 'letter.txt')
+        with open(file_path, 'wb') as f:
+            f.write(b'Letter text')
+        result = file_deletion_log_md5(file_path)
+        expected = '23E5503F2A30DBFC7115032E93FA4ED9'
+        self.assertEqual(expected, result, "Problem with test for small")
+
+
+if __name__ == '__main__':
+    unittest.main()
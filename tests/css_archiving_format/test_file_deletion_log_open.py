@@ -0,0 +1,83 @@
+from datetime import date
+import os
+import unittest
+from unittest import mock
+from css_archiving_format import (file_deletion_log, file_deletion_log_open, file_deletion_log_row,
+                                  file_deletion_log_write)
+from test_script import csv_to_list
+
+
+class MyTestCase(unittest.TestCase):
+
+    def setUp(self):
+        """Variables used by every test"""
+        self.log_path = os.path.join(os.getcwd(), 'test_data', 'file_deletion_log', 'file_deletion_log_2025-02-15.csv')
+        self.file_path = os.path.join(os.getcwd(), 'test_data', 'file_deletion_log', 'to-delete-3.txt')
+        with open(self.file_path, 'wb') as f:
+            f.write(b'Letter text')
+
+    def tearDown(self):
+        """Deletes the log and the file made by the tests"""
+        for path in (self.log_path, self.file_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_batch(self):
+        """Test for rows that are not waiting to be saved, which are saved in batches instead of one at a time"""
+        row = file_deletion_log_row(self.file_path, 'Casework')
+        with mock.patch('css_archiving_format.os.fsync', wraps=os.fsync) as fsync:
+            with file_deletion_log_open(self.log_path) as log:
+                for i in range(250):
+                    file_deletion_log_write(log, row)
+
+        # Tests all the rows were saved, with fewer saves than rows.
+        result = [len(csv_to_list(self.log_path)), fsync.call_count < 10]
+        expected = [251, True]
+        self.assertEqual(expected, result, "Problem with test for batch")
+
+    def test_error(self):
+        """Test for when there is an error while the log is open, so the rows already added must be saved"""
+        with self.assertRaises(ZeroDivisionError):
+            with file_deletion_log_open(self.log_path) as log:
+                file_deletion_log(self.log_path, self.file_path, 'Casework', log)
+                1 / 0
+
+        # Tests the contents of the file deletion log.
+        today = date.today().strftime('%Y-%m-%d')
+        result = csv_to_list(self.log_path)
+        expected = [['File', 'SizeKB', 'DateCreated', 'DateDeleted', 'MD5', 'Notes'],
+                    [self.file_path, '0.0', today, today, '23E5503F2A30DBFC7115032E93FA4ED9', 'Casework']]
+        self.assertEqual(expected, result, "Problem with test for error")
+
+    def test_open(self):
+        """Test for a row added while the log is open, which must be saved before anything else is added"""
+        with file_deletion_log_open(self.log_path) as log:
+            file_deletion_log(self.log_path, self.file_path, 'Casework', log)
+            result = csv_to_list(self.log_path)
+
+        # Tests the contents of the file deletion log before the log was closed.
+        today = date.today().strftime('%Y-%m-%d')
+        expected = [['File', 'SizeKB', 'DateCreated', 'DateDeleted', 'MD5', 'Notes'],
+                    [self.file_path, '0.0', today, today, '23E5503F2A30DBFC7115032E93FA4ED9', 'Casework']]
+        self.assertEqual(expected, result, "Problem with test for open")
+
+    def test_rows(self):
+        """Test for adding many rows, including errors"""
+        with file_deletion_log_open(self.log_path) as log:
+            for i in range(150):
+                file_deletion_log(self.log_path, self.file_path, 'Casework', log)
+            file_deletion_log(self.log_path, 'new_path.txt', 'Cannot determine file path: new path pattern in metadata',
+                              log)
+
+        # Tests the contents of the file deletion log.
+        today = date.today().strftime('%Y-%m-%d')
+        result = csv_to_list(self.log_path)
+        expected = ([['File', 'SizeKB', 'DateCreated', 'DateDeleted', 'MD5', 'Notes']] +
+                    [[self.file_path, '0.0', today, today, '23E5503F2A30DBFC7115032E93FA4ED9', 'Casework']] * 150 +
+                    [['new_path.txt', 'BLANK', 'BLANK', 'BLANK', 'BLANK',
+                      'Cannot determine file path: new path pattern in metadata']])
+        self.assertEqual(expected, result, "Problem with test for rows")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+"""
+Tests the default parser and the pyarrow parser, which should give the same results.
+The pyarrow tests are skipped if pyarrow is not installed, since it is only required for that parser.
+"""
+import importlib.util
+import os
+import unittest
+from css_archiving_format import read_delimited
+from test_read_metadata import df_to_list
+
+
+def read_with_engine(engine, path, names=None, usecols=None):
+    """Read a file with read_delimited() using the parser set by CONSTITUENT_MAIL_ENGINE"""
+    os.environ['CONSTITUENT_MAIL_ENGINE'] = engine
+    try:
+        df = read_delimited(path, '\t', names, usecols=usecols)
+    finally:
+        del os.environ['CONSTITUENT_MAIL_ENGINE']
+    return df
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_c_long_row(self):
+        """Test for the default parser when a row has too many columns, which is skipped"""
+        df = read_with_engine('c', os.path.join('test_data', 'read_delimited', 'long_row.dat'))
+        result = df_to_list(df)
+        expected = [['zip', 'city', 'state'], ['01234', 'A city', 'AL'], ['BLANK', 'BLANK', 'WY']]
+        self.assertEqual(expected, result, "Problem with test for c, long row")
+
+    def test_c_short_row(self):
+        """Test for the default parser when a row has too few columns, which is filled with blanks"""
+        df = read_with_engine('c', os.path.join('test_data', 'read_delimited', 'short_row.dat'))
+        result = df_to_list(df)
+        expected = [['zip', 'city', 'state'], ['01234', 'A city', 'AL'], ['30602', 'B city', 'BLANK'],
+                    ['BLANK', 'BLANK', 'BLANK']]
+        self.assertEqual(expected, result, "Problem with test for c, short row")
+
+    def test_c_usecols(self):
+        """Test for the default parser when only some columns are read, and a row has too many columns"""
+        df = read_with_engine('c', os.path.join('test_data', 'read_delimited', 'long_row.dat'),
+                              ['zip', 'city', 'state'], ['state', 'zip'])
+        result = df_to_list(df)
+        expected = [['zip', 'state'], ['zip', 'state'], ['01234', 'AL'], ['BLANK', 'WY']]
+        self.assertEqual(expected, result, "Problem with test for c, usecols")
+
+    def test_error_engine(self):
+        """Test for when CONSTITUENT_MAIL_ENGINE is not an expected parser"""
+        with self.assertRaises(ValueError):
+            read_with_engine('python', os.path.join('test_data', 'read_delimited', 'short_row.dat'))
+
+    @unittest.skipUnless(importlib.util.find_spec('pyarrow'), 'pyarrow is not installed')
+    def test_pyarrow_long_row(self):
+        """Test for the pyarrow parser when a row has too many columns, which is skipped"""
+        df = read_with_engine('pyarrow', os.path.join('test_data', 'read_delimited', 'long_row.dat'))
+        result = df_to_list(df)
+        expected = [['zip', 'city', 'state'], ['01234', 'A city', 'AL'], ['BLANK', 'BLANK', 'WY']]
+        self.assertEqual(expected, result, "Problem with test for pyarrow, long row")
+
+    @unittest.skipUnless(importlib.util.find_spec('pyarrow'), 'pyarrow is not installed')
+    def test_pyarrow_names(self):
+        """Test for the pyarrow parser when column names are provided, so the first row is data"""
+        df = read_with_engine('pyarrow', os.path.join('test_data', 'read_delimited', 'long_row.dat'),
+                              ['a', 'b', 'c'])
+        result = df_to_list(df)
+        expected = [['a', 'b', 'c'], ['zip', 'city', 'state'], ['01234', 'A city', 'AL'], ['BLANK', 'BLANK', 'WY']]
+        self.assertEqual(expected, result, "Problem with test for pyarrow, names")
+
+    @unittest.skipUnless(importlib.util.find_spec('pyarrow'), 'pyarrow is not installed')
+    def test_pyarrow_usecols(self):
+        """Test for the pyarrow parser when only some columns are read, and a row has too many columns"""
+        df = read_with_engine('pyarrow', os.path.join('test_data', 'read_delimited', 'long_row.dat'),
+                              ['zip', 'city', 'state'], ['state', 'zip'])
+        result = df_to_list(df)
+        expected = [['zip', 'state'], ['zip', 'state'], ['01234', 'AL'], ['BLANK', 'WY']]
+        self.assertEqual(expected, result, "Problem with test for pyarrow, usecols")
+
+    @unittest.skipUnless(importlib.util.find_spec('pyarrow'), 'pyarrow is not installed')
+    def test_pyarrow_short_row(self):
+        """Test for the pyarrow parser when a row has too few columns, which is filled with blanks"""
+        df = read_with_engine('pyarrow', os.path.join('test_data', 'read_delimited', 'short_row.dat'))
+        result = df_to_list(df)
+        expected = [['zip', 'city', 'state'], ['01234', 'A city', 'AL'], ['30602', 'B city', 'BLANK'],
+                    ['BLANK', 'BLANK', 'BLANK']]
+        self.assertEqual(expected, result, "Problem with test for pyarrow, short row")
+
+
+if __name__ == '__main__':
+    unittest.main()
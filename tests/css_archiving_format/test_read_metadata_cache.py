@@ -0,0 +1,103 @@
+"""
+Uses the same test inputs as test_read_metadata.py, and the df read from the cache should match read_metadata()
+The cache is for a folder made by the test (output_dir), and both are deleted at the end of each test.
+The tests that save the cache are skipped if pyarrow is not installed, since it is only required for the cache.
+"""
+import importlib.util
+import os
+import shutil
+import unittest
+from css_archiving_format import (delete_metadata_cache, metadata_cache_dir, metadata_cache_key, read_metadata,
+                                  read_metadata_cache, save_metadata_cache)
+from test_read_metadata import df_to_list
+
+
+def cache_round_trip(path, output_dir):
+    """Save the metadata from path to the cache, and return the df read from the cache"""
+    key = metadata_cache_key([path])
+    save_metadata_cache(read_metadata(path), key, output_dir)
+    df = read_metadata_cache(key, output_dir)
+    return df
+
+
+class MyTestCase(unittest.TestCase):
+
+    def setUp(self):
+        """Turns on the cache and makes the output directory"""
+        os.environ['CONSTITUENT_MAIL_CACHE'] = '1'
+        self.output_dir = os.path.join('test_data', 'read_metadata_cache')
+        os.mkdir(self.output_dir)
+
+    def tearDown(self):
+        """Turns off the cache and deletes the cache and the output directory"""
+        del os.environ['CONSTITUENT_MAIL_CACHE']
+        delete_metadata_cache(self.output_dir)
+        shutil.rmtree(self.output_dir)
+
+    @unittest.skipUnless(importlib.util.find_spec('pyarrow'), 'pyarrow is not installed')
+    def test_blanks(self):
+        """Test for when the DAT file has blanks, which must be NaN in the df read from the cache"""
+        path = os.path.join('test_data', 'read_metadata', 'correct_blank_rows.dat')
+        df = cache_round_trip(path, self.output_dir)
+
+        # Tests the df read from the cache is the same as reading the DAT file, including blanks being NaN not None.
+        result = df.equals(read_metadata(path))
+        self.assertEqual(True, result, "Problem with test for blanks")
+
+    @unittest.skipUnless(importlib.util.find_spec('pyarrow'), 'pyarrow is not installed')
+    def test_changed(self):
+        """Test for when the DAT file changed after the cache was saved, so the cache is not used"""
+        path = os.path.join(self.output_dir, 'archiving_correspondence.dat')
+        shutil.copy2(os.path.join('test_data', 'read_metadata', 'correct.dat'), path)
+        key = metadata_cache_key([path])
+        save_metadata_cache(read_metadata(path), key, self.output_dir)
+        with open(path, 'a') as dat_file:
+            dat_file.write('\n')
+
+        # Tests the key changed and there is no df in the cache for the new key.
+        new_key = metadata_cache_key([path])
+        result = [new_key == key, read_metadata_cache(new_key, self.output_dir)]
+        expected = [False, None]
+        self.assertEqual(expected, result, "Problem with test for changed")
+
+    @unittest.skipUnless(importlib.util.find_spec('pyarrow'), 'pyarrow is not installed')
+    def test_delete(self):
+        """Test for deleting the cache, which is not in the output directory since it has PII"""
+        path = os.path.join('test_data', 'read_metadata', 'correct.dat')
+        key = metadata_cache_key([path])
+        save_metadata_cache(read_metadata(path), key, self.output_dir)
+
+        # Tests the cache was saved outside the output directory, and is not there after it is deleted.
+        result = [os.listdir(self.output_dir), os.path.exists(metadata_cache_dir(self.output_dir))]
+        delete_metadata_cache(self.output_dir)
+        result.extend([os.path.exists(metadata_cache_dir(self.output_dir)), read_metadata_cache(key, self.output_dir)])
+        expected = [[], True, False, None]
+        self.assertEqual(expected, result, "Problem with test for delete")
+
+    @unittest.skipUnless(importlib.util.find_spec('pyarrow'), 'pyarrow is not installed')
+    def test_multiple_in_out(self):
+        """Test for when the DAT file has rows with multiple in and out documents, so the index has duplicates"""
+        path = os.path.join('test_data', 'read_metadata', 'correct_multiple_in_out.dat')
+        df = cache_round_trip(path, self.output_dir)
+
+        # Tests the df read from the cache is the same as reading the DAT file, including the index.
+        result = [df.index.tolist()] + df_to_list(df)
+        md_df = read_metadata(path)
+        expected = [md_df.index.tolist()] + df_to_list(md_df)
+        self.assertEqual(expected, result, "Problem with test for multiple in out")
+
+    def test_not_used(self):
+        """Test for when the environment variable is not 1, so there is no key and nothing is saved or read"""
+        os.environ['CONSTITUENT_MAIL_CACHE'] = '0'
+        path = os.path.join('test_data', 'read_metadata', 'correct.dat')
+        key = metadata_cache_key([path])
+        save_metadata_cache(read_metadata(path), key, self.output_dir)
+
+        # Tests there is no key, no df is read, and the cache folder was not made.
+        result = [key, read_metadata_cache(key, self.output_dir), os.path.exists(metadata_cache_dir(self.output_dir))]
+        expected = [None, None, False]
+        self.assertEqual(expected, result, "Problem with test for not used")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+"""
+To keep the inputs organized, the DAT file is named with the test condition rather than archiving_correspondence.dat
+Uses the same test inputs as test_read_metadata.py, and the chunks combined should match read_metadata()
+"""
+import os
+import pandas as pd
+import unittest
+from css_archiving_format import read_metadata, read_metadata_chunks
+from test_read_metadata import df_to_list
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_blank_rows(self):
+        """Test for when the DAT file has blank rows to skip, which are not counted as rows in a chunk"""
+        path = os.path.join('test_data', 'read_metadata', 'correct_blank_rows.dat')
+        chunks = list(read_metadata_chunks(path, 1))
+
+        # Tests the number of rows in each chunk is correct.
+        result = [len(chunk.index) for chunk in chunks]
+        expected = [1, 1]
+        self.assertEqual(expected, result, "Problem with test for blank rows, chunk rows")
+
+        # Tests the chunks combined are the same as reading the whole DAT file.
+        result = df_to_list(pd.concat(chunks))
+        expected = df_to_list(read_metadata(path))
+        self.assertEqual(expected, result, "Problem with test for blank rows, combined chunks")
+
+    def test_engine_error(self):
+        """Test for when the parser environment variable is not a supported parser, so no chunks are read"""
+        path = os.path.join('test_data', 'read_metadata', 'correct_blank_rows.dat')
+        os.environ['CONSTITUENT_MAIL_ENGINE'] = 'python'
+        try:
+            with self.assertRaises(ValueError):
+                list(read_metadata_chunks(path, 1))
+        finally:
+            del os.environ['CONSTITUENT_MAIL_ENGINE']
+
+    def test_engine_pyarrow(self):
+        """Test for when the parser environment variable is pyarrow, which warns the c parser is used instead"""
+        path = os.path.join('test_data', 'read_metadata', 'correct_blank_rows.dat')
+        os.environ['CONSTITUENT_MAIL_ENGINE'] = 'pyarrow'
+        try:
+            with self.assertWarns(UserWarning):
+                chunks = list(read_metadata_chunks(path, 1))
+        finally:
+            del os.environ['CONSTITUENT_MAIL_ENGINE']
+
+        # Tests the chunks combined are the same as reading the whole DAT file.
+        result = df_to_list(pd.concat(chunks))
+        expected = df_to_list(read_metadata(path))
+        self.assertEqual(expected, result, "Problem with test for engine pyarrow")
+
+    def test_multiple_in_out(self):
+        """Test for when the DAT file has rows with multiple in and out documents, which are split within the chunk"""
+        path = os.path.join('test_data', 'read_metadata', 'correct_multiple_in_out.dat')
+        chunks = list(read_metadata_chunks(path, 1))
+
+        # Tests the number of rows in each chunk is correct.
+        result = [len(chunk.index) for chunk in chunks]
+        expected = [1, 4, 6]
+        self.assertEqual(expected, result, "Problem with test for multiple in out, chunk rows")
+
+        # Tests the chunks combined are the same as reading the whole DAT file.
+        result = df_to_list(pd.concat(chunks))
+        expected = df_to_list(read_metadata(path))
+        self.assertEqual(expected, result, "Problem with test for multiple in out, combined chunks")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import unittest
+from unittest import mock
+from css_archiving_format import remove_rows
+from test_read_metadata import df_to_list
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_blank(self):
+        """Test for blanks, which match blanks or the text nan but not empty strings"""
+        df = pd.DataFrame([['a', np.nan], ['b', 'nan'], ['c', ''], ['d', np.nan]], columns=['last', 'title'])
+        df_remove = pd.DataFrame([['a', 'nan'], ['b', np.nan], ['c', np.nan]], columns=['last', 'title'])
+        df = remove_rows(df, df_remove)
+
+        result = df_to_list(df)
+        expected = [['last', 'title'], ['c', ''], ['d', 'BLANK']]
+        self.assertEqual(expected, result, "Problem with test for blank")
+
+    def test_collision(self):
+        """Test for when different rows have the same fingerprint, so only rows with the same text are removed"""
+        df = pd.DataFrame([['a', '1'], ['b', '2'], ['c', np.nan]], columns=['last', 'zip'])
+        df_remove = pd.DataFrame([['a', '1'], ['c', 'nan']], columns=['last', 'zip'])
+        with mock.patch('css_archiving_format.row_fingerprint', lambda df, columns: np.zeros(len(df.index), np.uint64)):
+            df = remove_rows(df, df_remove)
+
+        result = df_to_list(df)
+        expected = [['last', 'zip'], ['b', '2']]
+        self.assertEqual(expected, result, "Problem with test for collision")
+
+    def test_columns(self):
+        """Test for when the dataframes have different columns, so only the columns in both are compared"""
+        df = pd.DataFrame([['a', '1', 'text'], ['a', '2', 'text'], ['b', '1', 'text']],
+                          columns=['last', 'zip', 'in_text'])
+        df_remove = pd.DataFrame([['a', '1', 'Casework'], ['b', '1', 'Casework']],
+                                 columns=['last', 'zip', 'Appraisal_Category'])
+        df = remove_rows(df, df_remove)
+
+        result = df_to_list(df)
+        expected = [['last', 'zip', 'in_text'], ['a', '2', 'text']]
+        self.assertEqual(expected, result, "Problem with test for columns")
+
+    def test_none(self):
+        """Test for when there are no rows to remove"""
+        df = pd.DataFrame([['a', '1'], ['b', '2']], columns=['last', 'zip'])
+        df_remove = pd.DataFrame(columns=['last', 'zip'])
+        df = remove_rows(df, df_remove)
+
+        result = df_to_list(df)
+        expected = [['last', 'zip'], ['a', '1'], ['b', '2']]
+        self.assertEqual(expected, result, "Problem with test for none")
+
+
+if __name__ == '__main__':
+    unittest.main()
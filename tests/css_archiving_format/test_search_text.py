@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+import unittest
+from css_archiving_format import search_text
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_blank(self):
+        """Test for rows with blanks, which become the text nan"""
+        # Makes a dataframe to use as test input and runs the function.
+        df = pd.DataFrame([['Admin', np.nan, 'Thank you'], [np.nan, np.nan, np.nan]],
+                          columns=['in_topic', 'in_text', 'out_text'])
+        text = search_text(df, ['in_topic', 'in_text', 'out_text'])
+
+        # Tests the values in text are correct.
+        result = text.tolist()
+        expected = ['Admin|nan|Thank you', 'nan|nan|nan']
+        self.assertEqual(expected, result, "Problem with test for blank")
+
+    def test_one_column(self):
+        """Test for searching a single column"""
+        # Makes a dataframe to use as test input and runs the function.
+        df = pd.DataFrame([['Admin', 'Case'], ['Jobs', 'Legal']], columns=['in_topic', 'out_topic'])
+        text = search_text(df, ['out_topic'])
+
+        # Tests the values in text are correct.
+        result = text.tolist()
+        expected = ['Case', 'Legal']
+        self.assertEqual(expected, result, "Problem with test for one column")
+
+
+if __name__ == '__main__':
+    unittest.main()
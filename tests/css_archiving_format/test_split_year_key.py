@@ -0,0 +1,26 @@
+import numpy as np
+import pandas as pd
+import unittest
+from css_archiving_format import split_year_key
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_function(self):
+        """Test for the year from the first date column with date information, in order of priority"""
+        df = pd.DataFrame([['20200105', '19991231'],
+                           [np.nan, '19991231'],
+                           ['2001-01-05', '20110704'],
+                           ['', 'undated'],
+                           [np.nan, np.nan]],
+                          columns=['in_date', 'out_date'])
+        result = split_year_key(df, ['in_date', 'out_date']).tolist()
+        expected = ['2020', '1999', '2011', 'undated', 'undated']
+        self.assertEqual(expected, result, "Problem with test for function")
+
+        # Tests the df was not changed.
+        self.assertEqual(['in_date', 'out_date'], df.columns.tolist(), "Problem with test for function, df columns")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,187 @@
+"""
+Uses the documents in the test data for topics_sort_files as the input.
+"""
+import os
+import shutil
+import unittest
+from unittest import mock
+from css_archiving_format import documents_inventory, topics_sort_copy
+from test_script import make_dir_list
+
+
+class MyTestCase(unittest.TestCase):
+
+    def setUp(self):
+        """Variables used by every test"""
+        self.docs_dir = os.path.join(os.getcwd(), 'test_data', 'topics_sort_files', 'name_export', 'documents')
+        self.output_dir = os.path.join(os.getcwd(), 'test_data', 'topics_sort_copy')
+        self.folder_path = os.path.join(self.output_dir, 'ag', 'to_constituents')
+        os.makedirs(self.folder_path)
+
+    def tearDown(self):
+        """Delete the function outputs"""
+        shutil.rmtree(self.output_dir)
+
+    def test_duplicate(self):
+        """Test for when the same copy is in the list more than once, from topics that normalize to the same folder"""
+        copy_list = [(os.path.join(self.docs_dir, 'forms', 'ag.txt'),
+                      os.path.join(self.folder_path, 'forms', 'ag.txt')),
+                     (os.path.join(self.docs_dir, 'forms', 'ag.txt'),
+                      os.path.join(self.folder_path, 'forms', 'ag.txt'))]
+        copy_results = topics_sort_copy(copy_list)
+
+        # Verifies the copy results are correct.
+        expected = {os.path.join(self.folder_path, 'forms', 'ag.txt'): True}
+        self.assertEqual(expected, copy_results, "Problem with test for duplicate, copy_results")
+
+        # Verifies the expected folders and files were made.
+        result = make_dir_list(self.folder_path)
+        expected = [os.path.join(self.folder_path, 'forms'),
+                    os.path.join(self.folder_path, 'forms', 'ag.txt')]
+        self.assertEqual(expected, result, "Problem with test for duplicate, folder_path contents")
+
+    def test_inventory(self):
+        """Test for when the inventory is provided, so documents are found without checking the folder again"""
+        copy_list = [(os.path.join(self.docs_dir, 'forms', 'ag.txt'),
+                      os.path.join(self.folder_path, 'forms', 'ag.txt')),
+                     (os.path.join(self.docs_dir, 'forms', 'missing.txt'),
+                      os.path.join(self.folder_path, 'forms', 'missing.txt'))]
+        inventory, empty_list = documents_inventory(self.docs_dir)
+        with mock.patch('os.path.exists', wraps=os.path.exists) as exists:
+            copy_results = topics_sort_copy(copy_list, inventory=inventory)
+
+        # Verifies the copy results are correct.
+        expected = {os.path.join(self.folder_path, 'forms', 'ag.txt'): True,
+                    os.path.join(self.folder_path, 'forms', 'missing.txt'): False}
+        self.assertEqual(expected, copy_results, "Problem with test for inventory, copy_results")
+
+        # Verifies the documents were not checked in the folder.
+        result = [call.args[0] for call in exists.call_args_list if call.args[0].startswith(self.docs_dir)]
+        self.assertEqual([], result, "Problem with test for inventory, documents checked")
+
+        # Verifies the expected folders and files were made.
+        result = make_dir_list(self.folder_path)
+        expected = [os.path.join(self.folder_path, 'forms'),
+                    os.path.join(self.folder_path, 'forms', 'ag.txt')]
+        self.assertEqual(expected, result, "Problem with test for inventory, folder_path contents")
+
+    def test_journal(self):
+        """Test for resuming with a journal, where copies in the journal are not made again but new copies are added"""
+        # Makes a journal with one copy already made, which is an empty file so it can be distinguished from the doc.
+        journal_path = os.path.join(self.output_dir, 'topics_sort_journal.txt')
+        os.mkdir(os.path.join(self.folder_path, 'forms'))
+        open(os.path.join(self.folder_path, 'forms', 'ag.txt'), 'w').close()
+        with open(journal_path, 'w') as journal:
+            journal.write(os.path.join(self.folder_path, 'forms', 'ag.txt') + '\n')
+
+        copy_list = [(os.path.join(self.docs_dir, 'forms', 'ag.txt'),
+                      os.path.join(self.folder_path, 'forms', 'ag.txt')),
+                     (os.path.join(self.docs_dir, 'forms', 'bees.txt'),
+                      os.path.join(self.folder_path, 'forms', 'bees.txt')),
+                     (os.path.join(self.docs_dir, 'forms', 'missing.txt'),
+                      os.path.join(self.folder_path, 'forms', 'missing.txt'))]
+        copy_results = topics_sort_copy(copy_list, journal_path)
+
+        # Verifies the copy results are correct.
+        expected = {os.path.join(self.folder_path, 'forms', 'ag.txt'): True,
+                    os.path.join(self.folder_path, 'forms', 'bees.txt'): True,
+                    os.path.join(self.folder_path, 'forms', 'missing.txt'): False}
+        self.assertEqual(expected, copy_results, "Problem with test for journal, copy_results")
+
+        # Verifies the doc in the journal was not copied again (is still empty).
+        result = os.path.getsize(os.path.join(self.folder_path, 'forms', 'ag.txt'))
+        self.assertEqual(0, result, "Problem with test for journal, doc not copied again")
+
+        # Verifies the journal has the new copy and not the missing doc.
+        with open(journal_path) as journal:
+            result = journal.read().splitlines()
+        expected = [os.path.join(self.folder_path, 'forms', 'ag.txt'),
+                    os.path.join(self.folder_path, 'forms', 'bees.txt')]
+        self.assertEqual(expected, result, "Problem with test for journal, journal contents")
+
+    def test_link_mode_error(self):
+        """Test for when the link mode environment variable is not a supported mode, so nothing is copied"""
+        copy_list = [(os.path.join(self.docs_dir, 'forms', 'ag.txt'),
+                      os.path.join(self.folder_path, 'forms', 'ag.txt'))]
+        os.environ['CONSTITUENT_MAIL_LINK_MODE'] = 'shortcut'
+        try:
+            with self.assertRaises(ValueError):
+                topics_sort_copy(copy_list)
+        finally:
+            del os.environ['CONSTITUENT_MAIL_LINK_MODE']
+
+        # Verifies nothing was copied.
+        result = make_dir_list(self.folder_path)
+        self.assertEqual([], result, "Problem with test for link mode error, folder_path contents")
+
+    def test_link_mode_hardlink(self):
+        """Test for when the link mode environment variable is hardlink, so the new paths are the same files"""
+        copy_list = [(os.path.join(self.docs_dir, 'forms', 'ag.txt'),
+                      os.path.join(self.folder_path, 'forms', 'ag.txt')),
+                     (os.path.join(self.docs_dir, 'forms', 'missing.txt'),
+                      os.path.join(self.folder_path, 'forms', 'missing.txt'))]
+        os.environ['CONSTITUENT_MAIL_LINK_MODE'] = 'hardlink'
+        try:
+            copy_results = topics_sort_copy(copy_list)
+        finally:
+            del os.environ['CONSTITUENT_MAIL_LINK_MODE']
+
+        # Verifies the copy results are correct.
+        expected = {os.path.join(self.folder_path, 'forms', 'ag.txt'): True,
+                    os.path.join(self.folder_path, 'forms', 'missing.txt'): False}
+        self.assertEqual(expected, copy_results, "Problem with test for link mode hardlink, copy_results")
+
+        # Verifies the new path is the same file as the document.
+        result = os.path.samefile(os.path.join(self.docs_dir, 'forms', 'ag.txt'),
+                                  os.path.join(self.folder_path, 'forms', 'ag.txt'))
+        self.assertEqual(True, result, "Problem with test for link mode hardlink, same file")
+
+    def test_missing(self):
+        """Test for when a doc is not in the export, so no copy or folder is made"""
+        copy_list = [(os.path.join(self.docs_dir, 'objects', '001.txt'),
+                      os.path.join(self.folder_path, 'objects', '001.txt')),
+                     (os.path.join(self.docs_dir, 'missing', '003.txt'),
+                      os.path.join(self.folder_path, 'missing', '003.txt'))]
+        copy_results = topics_sort_copy(copy_list)
+
+        # Verifies the copy results are correct.
+        expected = {os.path.join(self.folder_path, 'objects', '001.txt'): True,
+                    os.path.join(self.folder_path, 'missing', '003.txt'): False}
+        self.assertEqual(expected, copy_results, "Problem with test for missing, copy_results")
+
+        # Verifies the expected folders and files were made.
+        result = make_dir_list(self.folder_path)
+        expected = [os.path.join(self.folder_path, 'objects'),
+                    os.path.join(self.folder_path, 'objects', '001.txt')]
+        self.assertEqual(expected, result, "Problem with test for missing, folder_path contents")
+
+    def test_subfolders(self):
+        """Test for when docs are in subfolders, which are made in the new location"""
+        copy_list = [(os.path.join(self.docs_dir, 'subfolder', 'A', '2.txt'),
+                      os.path.join(self.folder_path, 'subfolder', 'A', '2.txt')),
+                     (os.path.join(self.docs_dir, 'subfolder', 'B', 'BB', '3.txt'),
+                      os.path.join(self.folder_path, 'subfolder', 'B', 'BB', '3.txt')),
+                     (os.path.join(self.docs_dir, 'subfolder', 'B', 'BB', '4.txt'),
+                      os.path.join(self.folder_path, 'subfolder', 'B', 'BB', '4.txt'))]
+        copy_results = topics_sort_copy(copy_list)
+
+        # Verifies the copy results are correct.
+        expected = {os.path.join(self.folder_path, 'subfolder', 'A', '2.txt'): True,
+                    os.path.join(self.folder_path, 'subfolder', 'B', 'BB', '3.txt'): True,
+                    os.path.join(self.folder_path, 'subfolder', 'B', 'BB', '4.txt'): True}
+        self.assertEqual(expected, copy_results, "Problem with test for subfolders, copy_results")
+
+        # Verifies the expected folders and files were made.
+        result = sorted(make_dir_list(self.folder_path))
+        expected = [os.path.join(self.folder_path, 'subfolder'),
+                    os.path.join(self.folder_path, 'subfolder', 'A'),
+                    os.path.join(self.folder_path, 'subfolder', 'A', '2.txt'),
+                    os.path.join(self.folder_path, 'subfolder', 'B'),
+                    os.path.join(self.folder_path, 'subfolder', 'B', 'BB'),
+                    os.path.join(self.folder_path, 'subfolder', 'B', 'BB', '3.txt'),
+                    os.path.join(self.folder_path, 'subfolder', 'B', 'BB', '4.txt')]
+        self.assertEqual(expected, result, "Problem with test for subfolders, folder_path contents")
+
+
+if __name__ == '__main__':
+    unittest.main()
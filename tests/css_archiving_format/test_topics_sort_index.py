@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+import unittest
+from css_archiving_format import topics_sort_index
+
+
+def index_to_dict(topic_rows):
+    """Convert the arrays of row positions to lists for easier comparison"""
+    return {topic: positions.tolist() for topic, positions in topic_rows.items()}
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_one_column(self):
+        """Test for one topic column, including a blank which is not included"""
+        df = pd.DataFrame([['Ag', 'a.txt'], ['Tax', 'b.txt'], [np.nan, 'c.txt'], ['Ag', 'd.txt']],
+                          columns=['group_name', 'communication_document_name'])
+        result = index_to_dict(topics_sort_index(df, ['group_name']))
+        expected = {'Ag': [0, 3], 'Tax': [1]}
+        self.assertEqual(expected, result, "Problem with test for one column")
+
+    def test_two_columns(self):
+        """Test for two topic columns, where the same topic can be in either or both columns for a row"""
+        df = pd.DataFrame([['Ag', 'Tax'], ['Tax', 'Tax'], ['nan', 'Ag'], ['Arts', 'nan']],
+                          columns=['in_topic_split', 'out_topic_split'], index=[0, 0, 1, 1])
+        result = index_to_dict(topics_sort_index(df, ['in_topic_split', 'out_topic_split']))
+        expected = {'Ag': [0, 2], 'Tax': [0, 1], 'nan': [2, 3], 'Arts': [3]}
+        self.assertEqual(expected, result, "Problem with test for two columns")
+
+
+if __name__ == '__main__':
+    unittest.main()
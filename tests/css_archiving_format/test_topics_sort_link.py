@@ -0,0 +1,59 @@
+"""
+Uses the documents in the test data for topics_sort_files as the input.
+Reflinks are only supported by some file systems, so the reflink test accepts either result.
+"""
+import os
+import shutil
+import unittest
+from css_archiving_format import topics_sort_link
+
+
+class MyTestCase(unittest.TestCase):
+
+    def setUp(self):
+        """Variables used by every test"""
+        self.doc_path = os.path.join(os.getcwd(), 'test_data', 'topics_sort_files', 'name_export', 'documents',
+                                     'forms', 'ag.txt')
+        self.output_dir = os.path.join(os.getcwd(), 'test_data', 'topics_sort_link')
+        self.doc_new_path = os.path.join(self.output_dir, 'ag.txt')
+        os.mkdir(self.output_dir)
+
+    def tearDown(self):
+        """Delete the function outputs"""
+        shutil.rmtree(self.output_dir)
+
+    def test_hardlink(self):
+        """Test for making a hardlink, which is the same file as the document"""
+        linked = topics_sort_link(self.doc_path, self.doc_new_path, 'hardlink')
+
+        # Verifies the link was made and is the same file as the document.
+        result = [linked, os.path.samefile(self.doc_path, self.doc_new_path), os.path.islink(self.doc_new_path)]
+        expected = [True, True, False]
+        self.assertEqual(expected, result, "Problem with test for hardlink")
+
+    def test_reflink(self):
+        """Test for making a reflink, which is a separate file with the same contents if the file system supports it"""
+        linked = topics_sort_link(self.doc_path, self.doc_new_path, 'reflink')
+
+        # Verifies either the reflink was made with the same contents, or nothing was made so it can be copied.
+        if linked:
+            with open(self.doc_path, 'rb') as doc, open(self.doc_new_path, 'rb') as doc_new:
+                result = [doc_new.read() == doc.read(), os.path.samefile(self.doc_path, self.doc_new_path)]
+            expected = [True, False]
+        else:
+            result = os.path.exists(self.doc_new_path)
+            expected = False
+        self.assertEqual(expected, result, "Problem with test for reflink")
+
+    def test_symlink(self):
+        """Test for making a symlink, which points to the absolute path of the document"""
+        linked = topics_sort_link(self.doc_path, self.doc_new_path, 'symlink')
+
+        # Verifies the link was made and points to the document.
+        result = [linked, os.path.islink(self.doc_new_path), os.readlink(self.doc_new_path)]
+        expected = [True, True, self.doc_path]
+        self.assertEqual(expected, result, "Problem with test for symlink")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import os
+import unittest
+from css_data_interchange_format import read_metadata_table
+from test_read_metadata import df_to_list
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_2c(self):
+        """Test for a table where columns are removed with remove_pii()"""
+        # Makes variables for the function and runs the function.
+        columns = ['record_type', 'person_id', 'communication_id', 'document_type', 'communication_document_name',
+                   'communication_document_id', 'file_location', 'file_name']
+        df = read_metadata_table('2C', os.path.join('test_data', 'read', 'match', '2C.dat'), columns)
+
+        # Tests the value of df.
+        result = df_to_list(df)
+        expected = [['person_id', 'communication_id', 'document_type', 'communication_document_name',
+                     'communication_document_id', 'file_location', 'file_name'],
+                    ['1000001', '1100001', 'OUTGOING', r'..\documents\formletters\taxes.doc', 'BLANK', 'BLANK',
+                     'taxes.doc'],
+                    ['1000001', '1200002', 'OUTGOING', r'..\documents\formletters\insurance.doc', 'BLANK', 'BLANK',
+                     'insurance.doc'],
+                    ['1000003', '1300003', 'OUTGOING', r'..\documents\formletters\taxes.doc', 'BLANK', 'BLANK',
+                     'taxes.doc'],
+                    ['1000005', '1400004', 'OUTGOING', r'..\documents\indivletters\12345.doc', 'BLANK', 'BLANK',
+                     '12345.doc']]
+        self.assertEqual(expected, result, "Problem with test for 2C")
+
+    def test_2d(self):
+        """Test for table 2D, where only the ID for merging and text are kept"""
+        # Makes variables for the function and runs the function.
+        columns = ['record_type', 'person_id', 'communication_id', '2d_sequence_number',
+                   'text', 'date', 'time', 'user_id']
+        df = read_metadata_table('2D', os.path.join('test_data', 'read', 'match', '2D.dat'), columns)
+
+        # Tests the value of df.
+        result = df_to_list(df)
+        expected = [['communication_id', 'text'],
+                    ['1100001', 'Support for 1'],
+                    ['1200002', 'Against 2'],
+                    ['1300003', 'Support for 3'],
+                    ['1400004', 'Neutral re 4']]
+        self.assertEqual(expected, result, "Problem with test for 2D")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+import unittest
+from css_data_interchange_format import update_path, update_path_map
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_blank(self):
+        """Test for when the paths are blank, which are not included"""
+        path_map = update_path_map(pd.Series([np.nan, None]), 'input_dir')
+        self.assertEqual({}, path_map, "Problem with test for blank")
+
+    def test_patterns(self):
+        """Test for the pattern, including duplicates and new patterns, which must match update_path()"""
+        md_paths = pd.Series([r'..\documents\formletters\form_a.txt',
+                              r'\folder\folder\letter\111111.txt',
+                              r'..\folder\111111.txt',
+                              np.nan,
+                              r'..\documents\formletters\form_a.txt'])
+        path_map = update_path_map(md_paths, 'input_dir')
+        expected = {md_path: update_path(md_path, 'input_dir') for md_path in md_paths.dropna()}
+        self.assertEqual(expected, path_map, "Problem with test for patterns")
+
+
+if __name__ == '__main__':
+    unittest.main()